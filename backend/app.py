@@ -1,40 +1,87 @@
 from flask import Flask, jsonify
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 from config import Config
+from utils.hashing_pool import HashingPool
+from utils.ownership_cache import OwnershipCache
+from utils.image_variants import ImagePipeline
+from utils.json_provider import FastJSONProvider
+from utils.engine_profiles import configure_engine, install_pragmas
+from utils.replica import ReplicaRouter, RoutingSession
+from utils.sql_profiler import SQLProfiler
+from utils.metrics import RequestMetrics
+from utils.startup import FirstRequestSetup, check_schema, flask_command
 
-db = SQLAlchemy()
-migrate = Migrate()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 bcrypt = Bcrypt()
 jwt = JWTManager()
+hashing_pool = HashingPool()
+ownership_cache = OwnershipCache()
+image_pipeline = ImagePipeline()
+replica_router = ReplicaRouter()
+sql_profiler = SQLProfiler()
+request_metrics = RequestMetrics()
+
+# flask CLI commands that run without the migrations head check
+SCHEMA_COMMANDS = {'db', 'seed'}
 
 def create_app(config_class=Config):
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
     app.config.from_object(config_class)
     
     # Initialize CORS
-    CORS(app, resources={r"/api/*": {"origins": "http://localhost:5173"}})
+    CORS(app, resources={r"/api/*": {"origins": "http://localhost:5173"}}, expose_headers=['X-Last-Write'])
     
+    # Engine profile: pool options before the engines are created, pragmas right after
+    _, pragmas = configure_engine(app)
     db.init_app(app)
-    migrate.init_app(app, db)
+    with app.app_context():
+        for engine in db.engines.values():
+            install_pragmas(engine, pragmas)
+    replica_router.init_app(app)
+    with app.app_context():
+        engines = {key or 'primary': engine for key, engine in db.engines.items()}
+    if replica_router.engine is not None:
+        engines['replica'] = replica_router.engine
+    # Metrics first, so their timing wraps the other extensions' request hooks
+    request_metrics.init_app(app, engines)
+    sql_profiler.init_app(app, engines.values())
     bcrypt.init_app(app)
     jwt.init_app(app)
+    hashing_pool.init_app(app)
+    ownership_cache.init_app(app)
+    image_pipeline.init_app(app)
     
+    # Schema: created on boot, or managed by migrations and only checked against their head
+    # (not for `flask db` and `flask seed`, which bring the schema there or rebuild it)
+    command = flask_command()
     with app.app_context():
-        # Import routes
-        from routes import auth, pets, schedules, visits
-        
-        # Register blueprints
-        app.register_blueprint(auth.bp)
-        app.register_blueprint(pets.bp)
-        app.register_blueprint(schedules.bp)
-        app.register_blueprint(visits.bp)
+        if app.config['DB_SCHEMA'] == 'migrations':
+            if command not in SCHEMA_COMMANDS:
+                check_schema(db.engine, app.config['MIGRATIONS_DIR'])
+        elif app.config['DB_SCHEMA'] == 'create_all':
+            import models
+            db.create_all()
+        else:
+            raise ValueError(f"Unknown DB_SCHEMA {app.config['DB_SCHEMA']!r}, expected create_all or migrations")
+    
+    # LAZY_INIT: route modules (with the services and schemas they import) load on the
+    # first request; Flask-Migrate (alembic) and CLI commands only for flask CLI commands
+    # other than `flask run`, which serves requests like any other worker
+    if command not in (None, 'run') or not app.config['LAZY_INIT']:
+        register_blueprints(app)
         
-        # Create database tables
-        db.create_all()
+        from flask_migrate import Migrate
+        from commands.seed import seed_command
+        from commands.photos import backfill_photos_command
+        Migrate(app, db, directory=app.config['MIGRATIONS_DIR'])
+        app.cli.add_command(seed_command)
+        app.cli.add_command(backfill_photos_command)
+    else:
+        app.wsgi_app = FirstRequestSetup(app.wsgi_app, lambda: register_blueprints(app))
     
     # Error handlers
     @app.errorhandler(400)
@@ -58,6 +105,20 @@ def create_app(config_class=Config):
     
     return app
 
+def register_blueprints(app):
+    """Import the route modules and register their blueprints"""
+    with app.app_context():
+        from routes import auth, pets, schedules, visits, export, uploads, metrics
+        
+        app.register_blueprint(auth.bp)
+        app.register_blueprint(pets.bp)
+        app.register_blueprint(schedules.bp)
+        app.register_blueprint(visits.bp)
+        app.register_blueprint(export.bp)
+        app.register_blueprint(uploads.bp)
+        if app.config['METRICS_ENABLED']:
+            app.register_blueprint(metrics.bp)
+
 if __name__ == '__main__':
     app = create_app()
     app.run(debug=True)
@@ -0,0 +1,357 @@
+"""
+Load test for every auth, pets, schedules and visits route
+Seeds users x pets x schedules x visits, then drives each endpoint in turn
+with concurrent requests, in process (Flask test client) or over a local
+threaded HTTP server, and reports throughput and p50/p95/p99 latency per
+endpoint. --save-baseline stores the results as JSON; later runs with the
+same dataset compare against it and exit with status 1 when an endpoint's
+p95 latency rises, or its throughput falls, by more than --threshold
+
+Usage: python benchmarks/bench_api_load.py [--mode inprocess|http] [--users 20] [--pets 5] [--schedules 4]
+       [--visits 20] [--requests 200] [--concurrency 8] [--rounds 4] [--save-baseline] [--baseline PATH]
+"""
+import argparse
+import http.client
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import text
+from werkzeug.serving import make_server
+from app import create_app, db, bcrypt
+from config import Config
+from models.user import User
+from models.pet import Pet
+from models.feeding_schedule import FeedingSchedule
+from models.vet_visit import VetVisit
+
+PASSWORD = 'BenchPass123!'
+BLUEPRINTS = ('auth', 'pets', 'schedules', 'visits')
+BASELINE_DIR = Path(__file__).parent / 'baselines'
+
+REASONS = ['Kontrola', 'Szczepienie', 'Kaszel', 'Biegunka', 'Kulawizna']
+MEDICATIONS = ['amoksycylina', 'antybiotyk', 'meloksykam', 'probiotyk']
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a sorted list of numbers"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+class Dataset:
+    """Seeded rows with predictable ids, so request i can address its own user, pet and records"""
+    
+    def __init__(self, users, pets, schedules, visits):
+        self.users = users
+        self.pets = pets
+        self.schedules = schedules
+        self.visits = visits
+    
+    def as_dict(self):
+        return {'users': self.users, 'pets': self.pets, 'schedules': self.schedules, 'visits': self.visits}
+    
+    def seed(self, password_hash):
+        """Insert every row with core executemany, then build the visit search index"""
+        now = datetime(2026, 1, 1)
+        pets = self.users * self.pets
+        db.session.execute(User.__table__.insert(), [
+            {'id': u, 'username': f'user{u}', 'email': f'user{u}@example.com',
+             'password_hash': password_hash, 'created_at': now}
+            for u in range(1, self.users + 1)
+        ])
+        db.session.execute(Pet.__table__.insert(), [
+            {'id': p, 'name': f'Pet {p}', 'species': 'Dog', 'age': p % 15, 'weight': 5 + p % 30,
+             'user_id': (p - 1) // self.pets + 1, 'created_at': now}
+            for p in range(1, pets + 1)
+        ])
+        if self.schedules:
+            db.session.execute(FeedingSchedule.__table__.insert(), [
+                {'id': s, 'pet_id': (s - 1) // self.schedules + 1, 'food_type': 'Karma sucha', 'amount': '200g',
+                 'time': datetime(2026, 1, 1, 6 + s % 14).time(), 'frequency': 'daily', 'created_at': now}
+                for s in range(1, pets * self.schedules + 1)
+            ])
+        if self.visits:
+            db.session.execute(VetVisit.__table__.insert(), [
+                {'id': v, 'pet_id': (v - 1) // self.visits + 1, 'visit_date': now - timedelta(days=v % 900),
+                 'reason': REASONS[v % len(REASONS)], 'medications': MEDICATIONS[v % len(MEDICATIONS)],
+                 'created_at': now}
+                for v in range(1, pets * self.visits + 1)
+            ])
+            if db.engine.dialect.name == 'sqlite':
+                db.session.execute(text(
+                    "INSERT INTO vet_visits_fts (vet_visits_fts) VALUES ('rebuild')"
+                ))
+        db.session.commit()
+    
+    def user(self, i):
+        return i % self.users + 1
+    
+    def pet(self, i):
+        """A pet of user(i)"""
+        return (self.user(i) - 1) * self.pets + (i // self.users) % self.pets + 1
+    
+    def schedule(self, i):
+        """A schedule of pet(i)"""
+        return (self.pet(i) - 1) * self.schedules + i % self.schedules + 1
+    
+    def visit(self, i):
+        """A visit of pet(i)"""
+        return (self.pet(i) - 1) * self.visits + i % self.visits + 1
+
+def scenarios(data, run_id):
+    """
+    (endpoint, request builder) pairs in the order they run
+    A builder takes the request number and returns (user, method, path,
+    json body, on_response). Deletes consume the records the matching
+    create scenario made, so the seeded dataset stays the same size; when
+    those creates failed there is nothing to delete and the builder
+    returns None, which counts as a failed request.
+    """
+    created = {'pets': [], 'schedules': [], 'visits': []}
+    
+    def keep(kind, key):
+        return lambda i, body: created[kind].append((data.user(i), body[key]['id']))
+    
+    def take(kind, path):
+        def build(i):
+            try:
+                user, record_id = created[kind].pop()
+            except IndexError:
+                return None
+            return user, 'DELETE', path.format(record_id), None, None
+        return build
+    
+    day = datetime(2026, 1, 15)
+    return [
+        ('auth.register', lambda i: (None, 'POST', '/api/auth/register', {
+            'username': f'load{run_id}x{i}', 'email': f'load{run_id}x{i}@example.com', 'password': PASSWORD
+        }, None)),
+        ('auth.login', lambda i: (None, 'POST', '/api/auth/login', {
+            'username': f'user{data.user(i)}', 'password': PASSWORD
+        }, None)),
+        ('auth.get_current_user', lambda i: (data.user(i), 'GET', '/api/auth/me', None, None)),
+        
+        ('pets.get_pets', lambda i: (data.user(i), 'GET', '/api/pets/', None, None)),
+        ('pets.get_pet', lambda i: (data.user(i), 'GET', f'/api/pets/{data.pet(i)}', None, None)),
+        ('pets.create_pet', lambda i: (data.user(i), 'POST', '/api/pets/', {
+            'name': f'Load {i}', 'species': 'Cat', 'age': 2, 'weight': 4.5
+        }, keep('pets', 'pet'))),
+        ('pets.update_pet', lambda i: (data.user(i), 'PUT', f'/api/pets/{data.pet(i)}', {
+            'weight': 5 + i % 30
+        }, None)),
+        ('pets.delete_pet', take('pets', '/api/pets/{}')),
+        
+        ('schedules.get_pet_schedule', lambda i: (data.user(i), 'GET', f'/api/pets/{data.pet(i)}/schedule', None, None)),
+        ('schedules.get_schedules_by_day', lambda i: (
+            data.user(i), 'GET', f'/api/schedule/day/{(day + timedelta(days=i % 28)).date().isoformat()}', None, None
+        )),
+        ('schedules.get_schedules_by_month', lambda i: (
+            data.user(i), 'GET', f'/api/schedule/month/2026/{i % 12 + 1}', None, None
+        )),
+        ('schedules.create_schedule', lambda i: (data.user(i), 'POST', f'/api/pets/{data.pet(i)}/schedule', {
+            'food_type': 'Karma mokra', 'amount': '100g', 'time': f'{i % 24:02d}:30', 'frequency': 'daily'
+        }, keep('schedules', 'schedule'))),
+        ('schedules.create_schedules_bulk', lambda i: (data.user(i), 'POST', f'/api/pets/{data.pet(i)}/schedule/bulk', {
+            'schedules': [{'food_type': 'Przysmak', 'amount': '10g', 'time': f'{hour:02d}:00'} for hour in range(10)]
+        }, None)),
+        ('schedules.update_schedule', lambda i: (data.user(i), 'PUT', f'/api/schedule/{data.schedule(i)}', {
+            'amount': f'{150 + i % 100}g'
+        }, None)),
+        ('schedules.delete_schedule', take('schedules', '/api/schedule/{}')),
+        
+        ('visits.get_pet_visits', lambda i: (data.user(i), 'GET', f'/api/pets/{data.pet(i)}/visits', None, None)),
+        ('visits.get_visit', lambda i: (data.user(i), 'GET', f'/api/visits/{data.visit(i)}', None, None)),
+        ('visits.search_visits', lambda i: (
+            data.user(i), 'GET', f'/api/visits/search?q={MEDICATIONS[i % len(MEDICATIONS)]}', None, None
+        )),
+        ('visits.create_visit', lambda i: (data.user(i), 'POST', f'/api/pets/{data.pet(i)}/visits', {
+            'visit_date': '2025-06-01T10:00:00', 'reason': 'Kontrola', 'notes': 'Bez uwag'
+        }, keep('visits', 'visit'))),
+        ('visits.create_visits_bulk', lambda i: (data.user(i), 'POST', f'/api/pets/{data.pet(i)}/visits/bulk', {
+            'visits': [{'visit_date': f'2025-05-{day:02d}T09:00:00', 'reason': 'Szczepienie'} for day in range(1, 11)]
+        }, None)),
+        ('visits.update_visit', lambda i: (data.user(i), 'PUT', f'/api/visits/{data.visit(i)}', {
+            'diagnosis': f'Kontrola {i}'
+        }, None)),
+        ('visits.delete_visit', take('visits', '/api/visits/{}')),
+    ]
+
+class InProcessClient:
+    """Requests through the Flask test client, one client per thread"""
+    
+    def __init__(self, app):
+        self.app = app
+        self.local = threading.local()
+    
+    def request(self, method, path, headers, body):
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            client = self.local.client = self.app.test_client()
+        response = client.open(path, method=method, headers=headers, json=body)
+        return response.status_code, response.get_json(silent=True)
+
+class HTTPClient:
+    """Requests over a local threaded werkzeug server, a new connection each"""
+    
+    def __init__(self, app):
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+        self.server = make_server('127.0.0.1', 0, app, threaded=True)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+    
+    def request(self, method, path, headers, body):
+        connection = http.client.HTTPConnection('127.0.0.1', self.server.port)
+        try:
+            if body is not None:
+                headers = {**headers, 'Content-Type': 'application/json'}
+                body = json.dumps(body)
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            payload = response.read()
+        finally:
+            connection.close()
+        try:
+            return response.status, json.loads(payload)
+        except ValueError:
+            return response.status, None
+    
+    def close(self):
+        self.server.shutdown()
+
+def drive(client, build, requests, concurrency, tokens):
+    """Send `requests` requests built by build(i); returns the endpoint's result row"""
+    latencies = []
+    errors = []
+    
+    def send(i):
+        request = build(i)
+        if request is None:
+            errors.append(None)
+            return
+        user, method, path, body, on_response = request
+        headers = {'Authorization': f'Bearer {tokens[user]}'} if user else {}
+        began = time.perf_counter()
+        status, payload = client.request(method, path, headers, body)
+        latencies.append(time.perf_counter() - began)
+        if status >= 400:
+            errors.append(status)
+        elif on_response is not None:
+            on_response(i, payload)
+    
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(send, range(requests)))
+    elapsed = time.perf_counter() - started
+    
+    latencies.sort()
+    return {
+        'throughput': round(requests / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+        'errors': len(errors),
+    }
+
+def compare(results, baseline, threshold):
+    """Endpoints whose p95 or throughput regressed past threshold, as printable lines"""
+    regressions = []
+    for endpoint, current in results.items():
+        before = baseline.get(endpoint)
+        if before is None:
+            continue
+        if current['p95_ms'] > before['p95_ms'] * (1 + threshold):
+            regressions.append(f'{endpoint}: p95 {before["p95_ms"]:.2f} -> {current["p95_ms"]:.2f} ms')
+        if current['throughput'] < before['throughput'] * (1 - threshold):
+            regressions.append(f'{endpoint}: throughput {before["throughput"]:.1f} -> {current["throughput"]:.1f} req/s')
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mode', choices=('inprocess', 'http'), default='inprocess')
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--pets', type=int, default=5, help='pets per user')
+    parser.add_argument('--schedules', type=int, default=4, help='feeding schedules per pet')
+    parser.add_argument('--visits', type=int, default=20, help='vet visits per pet')
+    parser.add_argument('--requests', type=int, default=200, help='requests per endpoint')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--rounds', type=int, default=4, help=f'bcrypt cost (production: {Config.BCRYPT_LOG_ROUNDS})')
+    parser.add_argument('--baseline', type=Path, help='baseline file (default: benchmarks/baselines/api_load_<mode>.json)')
+    parser.add_argument('--save-baseline', action='store_true', help='store this run as the baseline')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed regression, as a fraction')
+    args = parser.parse_args()
+    if min(args.users, args.pets, args.schedules, args.visits) < 1:
+        parser.error('--users, --pets, --schedules and --visits must be at least 1')
+    
+    data = Dataset(args.users, args.pets, args.schedules, args.visits)
+    settings = {'mode': args.mode, 'dataset': data.as_dict(), 'requests': args.requests,
+                'concurrency': args.concurrency, 'rounds': args.rounds}
+    baseline_path = args.baseline or BASELINE_DIR / f'api_load_{args.mode}.json'
+    
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        BCRYPT_LOG_ROUNDS = args.rounds
+        IMAGE_WORKERS = 0
+    
+    client = None
+    try:
+        app = create_app(BenchConfig)
+        with app.app_context():
+            data.seed(bcrypt.generate_password_hash(PASSWORD).decode('utf-8'))
+            tokens = {user: create_access_token(identity=str(user)) for user in range(1, args.users + 1)}
+        
+        plan = scenarios(data, int(time.time()))
+        covered = {endpoint for endpoint, _ in plan}
+        routes = {rule.endpoint for rule in app.url_map.iter_rules() if rule.endpoint.split('.')[0] in BLUEPRINTS}
+        if routes - covered:
+            parser.error(f'no scenario for {", ".join(sorted(routes - covered))}')
+        
+        client = InProcessClient(app) if args.mode == 'inprocess' else HTTPClient(app)
+        print(f'{args.mode}: {args.users} users x {args.pets} pets x {args.schedules} schedules / '
+              f'{args.visits} visits per pet, {args.requests} requests per endpoint, concurrency {args.concurrency}')
+        print(f'{"endpoint":36} {"req/s":>9} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9} {"errors":>7}')
+        results = {}
+        for endpoint, build in plan:
+            row = results[endpoint] = drive(client, build, args.requests, args.concurrency, tokens)
+            print(f'{endpoint:36} {row["throughput"]:9.1f} {row["p50_ms"]:9.2f} {row["p95_ms"]:9.2f} '
+                  f'{row["p99_ms"]:9.2f} {row["errors"]:7d}')
+    finally:
+        if isinstance(client, HTTPClient):
+            client.close()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    
+    failed = [f'{endpoint}: {row["errors"]} failed requests' for endpoint, row in results.items() if row['errors']]
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps({**settings, 'endpoints': results}, indent=2) + '\n')
+        print(f'Baseline saved to {baseline_path}')
+    elif baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text())
+        if {key: baseline.get(key) for key in settings} != settings:
+            print(f'Baseline {baseline_path} was recorded with other settings; re-record it with --save-baseline')
+            sys.exit(2)
+        failed += compare(results, baseline['endpoints'], args.threshold)
+        print(f'Compared with {baseline_path} (threshold {args.threshold:.0%})')
+    else:
+        print(f'No baseline at {baseline_path}; record one with --save-baseline')
+    
+    if failed:
+        print('FAILED:\n' + '\n'.join(f'    {line}' for line in failed))
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
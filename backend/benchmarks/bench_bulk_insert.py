@@ -0,0 +1,84 @@
+"""
+Benchmark for bulk schedule and visit creation
+Compares per-record create_* calls (one commit each) with the bulk
+service methods (one pass of validation, batched executemany, one commit)
+
+Usage: python benchmarks/bench_bulk_insert.py [--records 10000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import create_app, db
+from config import Config
+from models.user import User
+from models.pet import Pet
+from services.schedule_service import ScheduleService
+from services.visit_service import VisitService
+
+def schedule_records(count):
+    return [
+        {'food_type': 'Kibble', 'amount': '200g', 'time': f'{i % 24:02d}:{i % 60:02d}', 'frequency': 'Codziennie'}
+        for i in range(count)
+    ]
+
+def visit_records(count):
+    start = datetime(2020, 1, 1)
+    return [
+        {'visit_date': (start + timedelta(hours=i)).isoformat(), 'reason': 'Checkup',
+         'diagnosis': 'Healthy', 'vet_name': 'Dr. Nowak'}
+        for i in range(count)
+    ]
+
+def rate(count, seconds):
+    return f'{count / seconds:10.0f} records/s ({seconds * 1000:.0f} ms for {count})'
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--records', type=int, default=10000)
+    parser.add_argument('--single', type=int, default=500, help='records for the per-record baseline')
+    args = parser.parse_args()
+    
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+    
+    try:
+        app = create_app(BenchConfig)
+        with app.app_context():
+            user = User(username='bench', email='bench@example.com', password_hash='x')
+            db.session.add(user)
+            db.session.commit()
+            pet = Pet(name='Bench', species='Dog', user_id=user.id)
+            db.session.add(pet)
+            db.session.commit()
+            
+            for name, single, bulk, records in [
+                ('schedules', ScheduleService.create_schedule, ScheduleService.create_schedules_bulk, schedule_records),
+                ('visits', VisitService.create_visit, VisitService.create_visits_bulk, visit_records),
+            ]:
+                items = records(args.single)
+                started = time.perf_counter()
+                for item in items:
+                    single(pet.id, item)
+                print(f'{name} one by one: {rate(args.single, time.perf_counter() - started)}')
+                
+                items = records(args.records)
+                started = time.perf_counter()
+                created_ids, errors = bulk(pet.id, items)
+                assert len(created_ids) == args.records and not errors
+                print(f'{name} bulk:       {rate(args.records, time.perf_counter() - started)}')
+    finally:
+        os.remove(path)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark for concurrent writes under each database engine profile
+Starts several worker processes (like gunicorn workers) that create vet
+visits through VisitService at the same time, and reports write throughput,
+latency and "database is locked" failures for the default and the tuned
+profile. SQLite runs on a throwaway file; Postgres runs only when a URL is
+given
+
+Usage: python benchmarks/bench_db_concurrency.py [--workers 8] [--writes 300] [--postgres-url URL]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app import create_app, db
+from config import Config
+from models.user import User
+from models.pet import Pet
+from services.visit_service import VisitService
+
+def make_config(url, profile):
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = url
+        DB_PROFILE = profile
+        IMAGE_WORKERS = 0
+    return BenchConfig
+
+def seed(url, profile, workers):
+    """Fresh schema with one user and one pet per worker"""
+    app = create_app(make_config(url, profile))
+    with app.app_context():
+        db.drop_all()
+        if db.engine.dialect.name == 'sqlite':
+            db.session.execute(text('DROP TABLE IF EXISTS vet_visits_fts'))
+        db.create_all()
+        db.session.add(User(id=1, username='bench', email='bench@example.com', password_hash='x'))
+        db.session.add_all([Pet(id=i, name=f'Pet {i}', species='Dog', user_id=1) for i in range(1, workers + 1)])
+        db.session.commit()
+        db.engine.dispose()
+
+def worker(url, profile, pet_id, writes, start, results):
+    """Create visits as fast as possible once every worker is ready"""
+    app = create_app(make_config(url, profile))
+    latencies = []
+    locked = 0
+    with app.app_context():
+        start.wait()
+        for i in range(writes):
+            began = time.perf_counter()
+            try:
+                VisitService.create_visit(pet_id, {
+                    'visit_date': '2025-06-01T10:00:00', 'reason': f'Kontrola {i}',
+                    'notes': 'Bez uwag, kolejna wizyta za rok'
+                })
+            except OperationalError as error:
+                db.session.rollback()
+                if 'locked' not in str(error):
+                    raise
+                locked += 1
+                continue
+            latencies.append(time.perf_counter() - began)
+    results.put((latencies, locked))
+
+def run(url, profile, workers, writes):
+    seed(url, profile, workers)
+    context = multiprocessing.get_context('fork')
+    start = context.Barrier(workers + 1)
+    results = context.Queue()
+    processes = [
+        context.Process(target=worker, args=(url, profile, pet_id, writes, start, results))
+        for pet_id in range(1, workers + 1)
+    ]
+    for process in processes:
+        process.start()
+    start.wait()
+    began = time.perf_counter()
+    outcomes = [results.get() for _ in processes]
+    elapsed = time.perf_counter() - began
+    for process in processes:
+        process.join()
+    
+    latencies = sorted(latency for done, _ in outcomes for latency in done)
+    locked = sum(failed for _, failed in outcomes)
+    p50 = latencies[len(latencies) // 2] * 1000 if latencies else 0
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0
+    print(f'    {profile:<9} {len(latencies) / elapsed:8.0f} writes/s   p50 {p50:7.2f} ms   '
+          f'p99 {p99:8.2f} ms   locked {locked}')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--writes', type=int, default=300, help='visits created by each worker')
+    parser.add_argument('--postgres-url', default=os.environ.get('BENCH_POSTGRES_URL'))
+    args = parser.parse_args()
+    
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    try:
+        print(f'SQLite, {args.workers} workers x {args.writes} visits:')
+        for profile in ('default', 'sqlite'):
+            for suffix in ('-wal', '-shm'):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+            os.remove(path)
+            run(f'sqlite:///{path}', profile, args.workers, args.writes)
+    finally:
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    
+    if not args.postgres_url:
+        print('Postgres: skipped (pass --postgres-url or set BENCH_POSTGRES_URL)')
+        return
+    print(f'Postgres, {args.workers} workers x {args.writes} visits:')
+    for profile in ('default', 'postgres'):
+        run(args.postgres_url, profile, args.workers, args.writes)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""
+Benchmark for hot lookup paths at scale
+Seeds a throwaway SQLite database, then prints EXPLAIN QUERY PLAN and
+latency for every service query, with and without the lookup indexes
+
+Usage: python benchmarks/bench_indexes.py [--visits 1000000] [--repeat N]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import timeit
+from datetime import datetime, time, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import event, text
+from app import create_app, db
+from config import Config
+from models.user import User
+from models.pet import Pet
+from models.feeding_schedule import FeedingSchedule
+from models.vet_visit import VetVisit
+from models.pet_tag import PetTag
+from services.pet_service import PetService
+from services.schedule_service import ScheduleService
+from services.visit_service import VisitService
+
+LOOKUP_INDEXES = {
+    'ix_pets_user_id_created_at': 'pets (user_id, created_at)',
+    'ix_feeding_schedules_pet_id_time': 'feeding_schedules (pet_id, time)',
+    'ix_vet_visits_pet_id_visit_date': 'vet_visits (pet_id, visit_date)',
+    'ix_pet_tags_user_id_tag_pet_id': 'pet_tags (user_id, tag, pet_id)',
+}
+
+TAGS = ['senior', 'diabetic', 'young', 'blind', 'adopted', 'vaccinated', 'allergic', 'quiet']
+
+BATCH_SIZE = 50_000
+
+def seed(users, pets_per_user, schedules_per_pet, visits, seed=42):
+    """Insert synthetic rows with core-level executemany batches"""
+    rng = random.Random(seed)
+    now = datetime(2026, 1, 1)
+    pets = users * pets_per_user
+    
+    db.session.execute(User.__table__.insert(), [
+        {'id': i, 'username': f'user{i}', 'email': f'user{i}@example.com',
+         'password_hash': 'x', 'created_at': now}
+        for i in range(1, users + 1)
+    ])
+    pet_tags = {i: rng.sample(TAGS, rng.randrange(4)) for i in range(1, pets + 1)}
+    db.session.execute(Pet.__table__.insert(), [
+        {'id': i, 'name': f'Pet {i}', 'species': 'Dog', 'user_id': (i - 1) // pets_per_user + 1,
+         'tags': ','.join(pet_tags[i]), 'created_at': now + timedelta(minutes=i)}
+        for i in range(1, pets + 1)
+    ])
+    db.session.execute(PetTag.__table__.insert(), [
+        {'pet_id': i, 'tag': tag, 'user_id': (i - 1) // pets_per_user + 1}
+        for i, tags in pet_tags.items() for tag in tags
+    ])
+    db.session.execute(FeedingSchedule.__table__.insert(), [
+        {'pet_id': (i - 1) // schedules_per_pet + 1, 'food_type': 'Kibble',
+         'time': time(rng.randrange(24), 0), 'frequency': 'Codziennie', 'created_at': now}
+        for i in range(1, pets * schedules_per_pet + 1)
+    ])
+    for start in range(0, visits, BATCH_SIZE):
+        db.session.execute(VetVisit.__table__.insert(), [
+            {'pet_id': rng.randrange(1, pets + 1), 'reason': 'Checkup',
+             'visit_date': now - timedelta(minutes=rng.randrange(5_000_000)), 'created_at': now}
+            for _ in range(start, min(start + BATCH_SIZE, visits))
+        ])
+    db.session.commit()
+    db.session.execute(text('ANALYZE'))
+
+def service_queries(user_id, pet_id, schedule_id, visit_id):
+    """Service calls exercised by list endpoints and ownership checks"""
+    return [
+        ('PetService.get_user_pets', lambda: PetService.get_user_pets(user_id)),
+        ('PetService.get_user_pets_page', lambda: PetService.get_user_pets_page(user_id, 50)),
+        ('PetService.get_user_pet_rows (tag=senior&tag=diabetic)',
+         lambda: PetService.get_user_pet_rows(user_id, [Pet.id, Pet.name], ['senior', 'diabetic'])),
+        ('PetService.count_user_tags', lambda: PetService.count_user_tags(user_id, ['senior', 'diabetic'])),
+        ('PetService.get_pet_by_id', lambda: PetService.get_pet_by_id(pet_id, user_id)),
+        ('ScheduleService.get_pet_schedules', lambda: ScheduleService.get_pet_schedules(pet_id)),
+        ('ScheduleService.get_user_schedules_with_pets',
+         lambda: ScheduleService.get_user_schedules_with_pets(user_id)),
+        ('FeedingSchedule.query.get', lambda: db.session.get(FeedingSchedule, schedule_id)),
+        ('VisitService.get_pet_visits', lambda: VisitService.get_pet_visits(pet_id)),
+        ('VisitService.get_pet_visits_page', lambda: VisitService.get_pet_visits_page(pet_id, 50)),
+        ('VetVisit.query.get', lambda: db.session.get(VetVisit, visit_id)),
+    ]
+
+def capture_statements(func):
+    """Run func and return the SQL statements it executed"""
+    statements = []
+    
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+    
+    event.listen(db.engine, 'before_cursor_execute', before_execute)
+    try:
+        func()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_execute)
+        db.session.expunge_all()
+    return statements
+
+def report(queries, repeat):
+    """Print the query plan and best-of-N latency for each service query"""
+    for name, func in queries:
+        print(f'\n{name}')
+        for statement, parameters in capture_statements(func):
+            plan = db.session.connection().exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters)
+            for row in plan:
+                print(f'    {row[-1]}')
+        
+        def run():
+            func()
+            db.session.expunge_all()
+        
+        best = min(timeit.repeat(run, number=1, repeat=repeat))
+        print(f'    latency: {best * 1000:.3f} ms')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=1_000)
+    # e.g. --users 3 --pets-per-user 30000 for shelter-sized accounts
+    parser.add_argument('--pets-per-user', type=int, default=10)
+    parser.add_argument('--schedules-per-pet', type=int, default=3)
+    parser.add_argument('--visits', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+    
+    try:
+        app = create_app(BenchConfig)
+        with app.app_context():
+            seed(args.users, args.pets_per_user, args.schedules_per_pet, args.visits)
+            
+            user_id = args.users // 2
+            pet_id = Pet.query.filter_by(user_id=user_id).first().id
+            schedule_id = FeedingSchedule.query.filter_by(pet_id=pet_id).first().id
+            visit_id = VetVisit.query.filter_by(pet_id=pet_id).first().id
+            queries = service_queries(user_id, pet_id, schedule_id, visit_id)
+            
+            print('=== with lookup indexes ===')
+            report(queries, args.repeat)
+            
+            for name in LOOKUP_INDEXES:
+                db.session.execute(text(f'DROP INDEX {name}'))
+            db.session.commit()
+            db.session.execute(text('ANALYZE'))
+            
+            print('\n=== without lookup indexes ===')
+            report(queries, max(1, args.repeat // 10))
+    finally:
+        os.remove(path)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark for list endpoint read paths
+Compares ORM hydration + to_dict() + json.dumps against column projections +
+the orjson provider for a pet list and a visit history, checks that both
+paths produce identical response bytes for the full field set, and reports
+the default list projection that leaves heavy Text columns out
+
+Usage: python benchmarks/bench_list_serialization.py [--pets 2000] [--visits 5000] [--repeat N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import timeit
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from flask.json.provider import DefaultJSONProvider
+from app import create_app, db
+from config import Config
+from models.user import User
+from models.pet import Pet
+from models.vet_visit import VetVisit
+from services.pet_service import PetService
+from services.visit_service import VisitService
+from utils import json_provider
+from utils.fields import Projection, list_fields
+
+def seed(pets, visits):
+    """Insert one user with many pets, and many visits for the first pet"""
+    now = datetime(2026, 1, 1)
+    db.session.execute(User.__table__.insert(), [
+        {'id': 1, 'username': 'bench', 'email': 'bench@example.com', 'password_hash': 'x', 'created_at': now}
+    ])
+    db.session.execute(Pet.__table__.insert(), [
+        {'id': i, 'name': f'Reksio {i}', 'species': 'Pies', 'breed': 'Kundel', 'age': i % 15,
+         'weight': 4.5 + i % 30, 'tags': 'przyjazny,aktywny', 'notes': 'Lubi spacery',
+         'user_id': 1, 'created_at': now + timedelta(minutes=i)}
+        for i in range(1, pets + 1)
+    ])
+    db.session.execute(VetVisit.__table__.insert(), [
+        {'pet_id': 1, 'visit_date': now - timedelta(days=i), 'vet_name': 'Dr Nowak',
+         'clinic_name': 'Klinika', 'reason': 'Kontrola', 'diagnosis': 'Zdrowy',
+         'treatment': 'Brak', 'medications': None, 'notes': 'Kolejna wizyta za rok', 'created_at': now}
+        for i in range(visits)
+    ])
+    db.session.commit()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pets', type=int, default=2_000)
+    parser.add_argument('--visits', type=int, default=5_000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+    
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+    
+    try:
+        app = create_app(BenchConfig)
+        default_provider = DefaultJSONProvider(app)
+        with app.app_context():
+            seed(args.pets, args.visits)
+            
+            def pet_list(projection):
+                rows = PetService.get_user_pet_rows(1, projection.columns)
+                return app.json.response({'pets': projection.serialize(rows)})
+            
+            def visit_history(projection):
+                rows = VisitService.get_pet_visit_rows(1, projection.columns)
+                return app.json.response({'visits': projection.serialize(rows)})
+            
+            paths = [
+                ('pet list', Pet, pet_list,
+                 lambda: default_provider.response({'pets': [p.to_dict() for p in PetService.get_user_pets(1)]})),
+                ('visit history', VetVisit, visit_history,
+                 lambda: default_provider.response({'visits': [v.to_dict() for v in VisitService.get_pet_visits(1)]})),
+            ]
+            
+            def run(func):
+                response = func()
+                db.session.expunge_all()
+                return response
+            
+            print(f'orjson installed: {json_provider.orjson is not None}')
+            for name, model, projection_path, orm_path in paths:
+                full = Projection(model, model.FIELDS)
+                default = Projection(model, list_fields(model))
+                assert run(orm_path).get_data() == run(lambda: projection_path(full)).get_data()
+                
+                orm = min(timeit.repeat(lambda: run(orm_path), number=1, repeat=args.repeat))
+                fast = min(timeit.repeat(lambda: run(lambda: projection_path(full)), number=1, repeat=args.repeat))
+                lean = min(timeit.repeat(lambda: run(lambda: projection_path(default)), number=1, repeat=args.repeat))
+                print(f'{name}:')
+                print(f'    ORM + to_dict + json:     {orm * 1000:8.2f} ms, '
+                      f'{len(run(orm_path).get_data()) / 1024:8.1f} KiB')
+                print(f'    projection + orjson:      {fast * 1000:8.2f} ms ({orm / fast:.1f}x)')
+                print(f'    default list fields:      {lean * 1000:8.2f} ms ({orm / lean:.1f}x), '
+                      f'{len(run(lambda: projection_path(default)).get_data()) / 1024:8.1f} KiB')
+    finally:
+        os.remove(path)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark for login throughput under concurrency
+Fires concurrent POST /api/auth/login requests through the bounded hashing
+pool while probing GET /api/auth/me, and reports throughput, rejected
+(503) logins and latency of the cheap endpoint during the burst
+
+Usage: python benchmarks/bench_login_throughput.py [--concurrency 32] [--requests 200]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import create_app, db, bcrypt
+from config import Config
+from models.user import User
+
+PASSWORD = 'BenchPass123!'
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--rounds', type=int, default=Config.BCRYPT_LOG_ROUNDS)
+    parser.add_argument('--pool-size', type=int, default=Config.HASHING_POOL_SIZE)
+    parser.add_argument('--queue-size', type=int, default=Config.HASHING_QUEUE_SIZE)
+    args = parser.parse_args()
+    
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        BCRYPT_LOG_ROUNDS = args.rounds
+        HASHING_POOL_SIZE = args.pool_size
+        HASHING_QUEUE_SIZE = args.queue_size
+    
+    try:
+        app = create_app(BenchConfig)
+        with app.app_context():
+            user = User(
+                username='bench',
+                email='bench@example.com',
+                password_hash=bcrypt.generate_password_hash(PASSWORD).decode('utf-8')
+            )
+            db.session.add(user)
+            db.session.commit()
+        
+        token = app.test_client().post('/api/auth/login', json={
+            'username': 'bench', 'password': PASSWORD
+        }).get_json()['access_token']
+        
+        login_latencies = []
+        statuses = {}
+        lock = threading.Lock()
+        
+        def login(_):
+            client = app.test_client()
+            start = time.perf_counter()
+            response = client.post('/api/auth/login', json={'username': 'bench', 'password': PASSWORD})
+            elapsed = time.perf_counter() - start
+            with lock:
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                if response.status_code == 200:
+                    login_latencies.append(elapsed)
+        
+        probe_latencies = []
+        done = threading.Event()
+        
+        def probe():
+            client = app.test_client()
+            headers = {'Authorization': f'Bearer {token}'}
+            while not done.is_set():
+                start = time.perf_counter()
+                client.get('/api/auth/me', headers=headers)
+                probe_latencies.append(time.perf_counter() - start)
+                time.sleep(0.01)
+        
+        prober = threading.Thread(target=probe)
+        prober.start()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            list(executor.map(login, range(args.requests)))
+        wall = time.perf_counter() - started
+        done.set()
+        prober.join()
+        
+        ok = statuses.get(200, 0)
+        print(f'rounds={args.rounds} pool={args.pool_size} queue={args.queue_size} '
+              f'concurrency={args.concurrency}')
+        print(f'logins: {ok} ok, {statuses.get(503, 0)} rejected (503) in {wall:.2f}s '
+              f'-> {ok / wall:.1f} logins/s')
+        if login_latencies:
+            print(f'login latency: p50 {statistics.median(login_latencies) * 1000:.1f} ms, '
+                  f'p99 {percentile(login_latencies, 99) * 1000:.1f} ms')
+        if probe_latencies:
+            print(f'/api/auth/me during burst: p50 {statistics.median(probe_latencies) * 1000:.1f} ms, '
+                  f'p99 {percentile(probe_latencies, 99) * 1000:.1f} ms')
+    finally:
+        os.remove(path)
+
+if __name__ == '__main__':
+    main()
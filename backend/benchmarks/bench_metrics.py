@@ -0,0 +1,103 @@
+"""
+Benchmark for the per-request cost of the Prometheus request metrics
+Times GET /api/pets/ through the test client with METRICS_ENABLED off and
+on. With PROMETHEUS_MULTIPROC_DIR set (an empty directory), it also runs
+forked workers, like gunicorn's, and checks that /metrics in the parent
+sums their request counts
+
+Usage: PROMETHEUS_MULTIPROC_DIR=$(mktemp -d) python benchmarks/bench_metrics.py [--requests 5000] [--workers 4]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from flask_jwt_extended import create_access_token
+from prometheus_client.parser import text_string_to_metric_families
+from app import create_app, db
+from config import Config
+from models.user import User
+from models.pet import Pet
+from utils.metrics import render
+
+def make_config(path, enabled):
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        METRICS_ENABLED = enabled
+        IMAGE_WORKERS = 0
+    return BenchConfig
+
+def serve(path, enabled, requests):
+    """Seconds for `requests` authenticated pet list requests"""
+    app = create_app(make_config(path, enabled))
+    with app.app_context():
+        headers = {'Authorization': f'Bearer {create_access_token(identity="1")}'}
+    client = app.test_client()
+    client.get('/api/pets/', headers=headers)
+    began = time.perf_counter()
+    for _ in range(requests):
+        client.get('/api/pets/', headers=headers)
+    return time.perf_counter() - began
+
+def served_count():
+    """Successful pet list requests recorded across every process"""
+    for family in text_string_to_metric_families(render().decode()):
+        for sample in family.samples:
+            if (sample.name == 'petcare_http_requests_total' and sample.labels['endpoint'] == 'pets.get_pets'
+                    and sample.labels['status'] == '2xx'):
+                return sample.value
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+    
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    try:
+        app = create_app(make_config(path, False))
+        with app.app_context():
+            db.session.add(User(id=1, username='bench', email='bench@example.com', password_hash='x'))
+            db.session.add_all([Pet(name=f'Pet {i}', species='Dog', user_id=1) for i in range(20)])
+            db.session.commit()
+        
+        multiprocess = 'PROMETHEUS_MULTIPROC_DIR' in os.environ
+        print(f'{args.requests} x GET /api/pets/ ({"multiprocess" if multiprocess else "single process"} mode):')
+        timings = {}
+        for enabled in (False, True):
+            timings[enabled] = min(serve(path, enabled, args.requests) for _ in range(3))
+            print(f'    metrics {"on " if enabled else "off"}  {timings[enabled] / args.requests * 1e6:8.1f} us/request')
+        print(f'    overhead    {(timings[True] - timings[False]) / args.requests * 1e6:8.1f} us/request')
+        
+        if not multiprocess:
+            print('Worker aggregation: skipped (set PROMETHEUS_MULTIPROC_DIR to an empty directory)')
+            return
+        before = served_count()
+        context = multiprocessing.get_context('fork')
+        processes = [
+            context.Process(target=serve, args=(path, True, args.requests))
+            for _ in range(args.workers)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        counted = served_count() - before
+        # Each worker also sends one warm-up request
+        expected = args.workers * (args.requests + 1)
+        print(f'Worker aggregation: {args.workers} workers served {expected}, /metrics counts {counted:.0f}')
+    finally:
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark for month occurrence expansion
+100 pets x 10 schedules x 31 days, naive per-day checks vs expand_month
+
+Usage: python benchmarks/bench_month_expansion.py [--repeat N]
+"""
+import argparse
+import calendar
+import random
+import sys
+import timeit
+from datetime import date, time, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.recurrence import expand_month, is_due_on
+
+FREQUENCIES = ['Codziennie', 'Co drugi dzień', 'Raz w tygodniu', 'Weekendy', 'Dni robocze']
+
+def build_entries(pets=100, schedules_per_pet=10, seed=42):
+    """Build synthetic (schedule_id, time, frequency, anchor) entries"""
+    rng = random.Random(seed)
+    entries = []
+    for schedule_id in range(1, pets * schedules_per_pet + 1):
+        entries.append((
+            schedule_id,
+            time(rng.randrange(24), rng.choice([0, 15, 30, 45])),
+            rng.choice(FREQUENCIES),
+            date(2026, 1, 1) + timedelta(days=rng.randrange(365))
+        ))
+    return entries
+
+def naive_expand(entries, year, month):
+    """Reference implementation: check every schedule against every day"""
+    days_in_month = calendar.monthrange(year, month)[1]
+    result = {}
+    for day in range(1, days_in_month + 1):
+        current = date(year, month, day)
+        due = sorted((t, sid) for sid, t, freq, anchor in entries if is_due_on(freq, anchor, current))
+        if due:
+            result[current.isoformat()] = [sid for _, sid in due]
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    
+    entries = build_entries()
+    year, month = 2026, 10
+    
+    assert naive_expand(entries, year, month) == expand_month(entries, year, month)
+    
+    naive = min(timeit.repeat(lambda: naive_expand(entries, year, month), number=1, repeat=args.repeat))
+    engine = min(timeit.repeat(lambda: expand_month(entries, year, month), number=1, repeat=args.repeat))
+    occurrences = sum(len(ids) for ids in expand_month(entries, year, month).values())
+    
+    print(f'schedules: {len(entries)}, occurrences: {occurrences}')
+    print(f'naive:        {naive * 1000:8.2f} ms')
+    print(f'expand_month: {engine * 1000:8.2f} ms ({naive / engine:.1f}x)')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark for worker startup: import + app factory time and first-request latency
+Every run is a fresh interpreter, like a newly forked or spawned worker,
+against a database migrated with `flask db upgrade`. Compares the default
+startup (create_all, eager blueprints and Flask-Migrate) with DB_SCHEMA=
+migrations alone and with LAZY_INIT on top
+
+Usage: python benchmarks/bench_startup.py [--runs 7]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND = Path(__file__).parent.parent
+
+# Runs in the child interpreter; prints its timings as JSON
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, {backend!r})
+import app as application
+imported = time.perf_counter()
+app = application.create_app()
+created = time.perf_counter()
+with app.app_context():
+    from flask_jwt_extended import create_access_token
+    headers = {{'Authorization': 'Bearer ' + create_access_token(identity='1')}}
+client = app.test_client()
+began = time.perf_counter()
+first = client.get('/api/pets/', headers=headers)
+first_done = time.perf_counter()
+client.get('/api/pets/', headers=headers)
+second_done = time.perf_counter()
+assert first.status_code == 200, first.status_code
+print(json.dumps({{
+    'import': imported - started, 'factory': created - imported,
+    'first': first_done - began, 'second': second_done - first_done,
+}}))
+"""
+
+MODES = [
+    ('create_all, eager', {'DB_SCHEMA': 'create_all', 'LAZY_INIT': ''}),
+    ('migrations, eager', {'DB_SCHEMA': 'migrations', 'LAZY_INIT': ''}),
+    ('migrations, lazy', {'DB_SCHEMA': 'migrations', 'LAZY_INIT': '1'}),
+]
+
+def flask(env, *args):
+    subprocess.run([sys.executable, '-m', 'flask', '--app', str(BACKEND / 'app.py'), *args],
+                   env=env, check=True, stdout=subprocess.DEVNULL)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=7)
+    args = parser.parse_args()
+    
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    os.remove(path)
+    env = {**os.environ, 'DATABASE_URL': f'sqlite:///{path}', 'DB_SCHEMA': 'migrations', 'IMAGE_WORKERS': '0'}
+    env.pop('FLASK_RUN_FROM_CLI', None)
+    try:
+        flask(env, 'db', 'upgrade')
+        flask(env, 'seed', '--users', '10', '--visits', '1000', '--passwords', '1')
+        
+        print(f'median of {args.runs} fresh interpreters (ms)')
+        print(f'{"mode":20} {"import":>8} {"factory":>8} {"1st req":>8} {"2nd req":>8} {"to 1st":>8} {"process":>8}')
+        for label, overrides in MODES:
+            code = CHILD.format(backend=str(BACKEND))
+            samples = []
+            for _ in range(args.runs):
+                began = time.perf_counter()
+                output = subprocess.run([sys.executable, '-c', code], env={**env, **overrides},
+                                        check=True, capture_output=True, text=True).stdout
+                sample = json.loads(output.strip().splitlines()[-1])
+                sample['process'] = time.perf_counter() - began
+                samples.append(sample)
+            median = {key: statistics.median(sample[key] for sample in samples) * 1000 for key in samples[0]}
+            ready = median['import'] + median['factory'] + median['first']
+            print(f'{label:20} {median["import"]:8.1f} {median["factory"]:8.1f} {median["first"]:8.1f} '
+                  f'{median["second"]:8.1f} {ready:8.1f} {median["process"]:8.1f}')
+    finally:
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark for serving uploaded photos
+Compares the /uploads route (send_file + wsgi.file_wrapper, conditional GET)
+with a naive handler that reads the whole file and returns it, over a local
+threaded HTTP server, reporting throughput and peak Python memory
+
+Usage: python benchmarks/bench_uploads.py [--size-mb 5] [--requests 200] [--concurrency 8]
+"""
+import argparse
+import hashlib
+import http.client
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from flask import Response
+from werkzeug.serving import make_server
+from app import create_app
+from config import Config
+
+def run(port, path, requests, concurrency, headers=None):
+    """Issue GET requests and return (seconds, bytes received, status codes)"""
+    statuses = {}
+    received = [0]
+    lock = threading.Lock()
+    
+    def fetch(_):
+        connection = http.client.HTTPConnection('127.0.0.1', port)
+        connection.request('GET', path, headers=headers or {})
+        response = connection.getresponse()
+        body = response.read()
+        connection.close()
+        with lock:
+            statuses[response.status] = statuses.get(response.status, 0) + 1
+            received[0] += len(body)
+    
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(fetch, range(requests)))
+    return time.perf_counter() - started, received[0], statuses
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size-mb', type=int, default=5)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+    
+    upload_folder = tempfile.mkdtemp()
+    fd, db_path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{db_path}'
+        UPLOAD_FOLDER = upload_folder
+    
+    try:
+        content = os.urandom(args.size_mb * 1024 * 1024)
+        content_hash = hashlib.sha256(content).hexdigest()
+        relative = f'{content_hash[:2]}/{content_hash}.jpg'
+        os.makedirs(os.path.join(upload_folder, content_hash[:2]))
+        with open(os.path.join(upload_folder, relative), 'wb') as f:
+            f.write(content)
+        
+        app = create_app(BenchConfig)
+        
+        @app.route('/naive/<path:filename>')
+        def naive(filename):
+            with open(os.path.join(upload_folder, filename), 'rb') as f:
+                return Response(f.read(), mimetype='image/jpeg')
+        
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+        server = make_server('127.0.0.1', 0, app, threaded=True)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        
+        print(f'{args.requests} requests of {args.size_mb}MB, concurrency {args.concurrency}')
+        for name, path, headers in [
+            ('naive read+return', f'/naive/{relative}', None),
+            ('send_file route', f'/uploads/{relative}', None),
+            ('send_file 304', f'/uploads/{relative}', {'If-None-Match': f'"{content_hash}.jpg"'}),
+        ]:
+            tracemalloc.start()
+            seconds, received, statuses = run(server.port, path, args.requests, args.concurrency, headers)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f'{name:18} {args.requests / seconds:8.1f} req/s  {received / seconds / 2**20:8.1f} MB/s  '
+                  f'peak {peak / 2**20:7.1f} MB  {statuses}')
+        
+        server.shutdown()
+    finally:
+        shutil.rmtree(upload_folder)
+        os.remove(db_path)
+
+if __name__ == '__main__':
+    main()
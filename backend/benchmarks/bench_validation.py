@@ -0,0 +1,252 @@
+"""
+Benchmark for record validation
+Compares the compiled schemas of the services with what the services did
+before: calling the validator functions one at a time (copied below, as
+they were in utils.validators), then parsing the time or normalizing the
+tags again to get the values to store. Measured for
+single records of every schema and for an array of visits as sent to the
+bulk endpoint
+
+Usage: python benchmarks/bench_validation.py [--records 10000] [--repeat N]
+"""
+import argparse
+import re
+import sys
+import timeit
+from datetime import datetime, time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.validators import validate_date, validate_tags
+from services.auth_service import REGISTRATION_SCHEMA
+from services.pet_service import PET_SCHEMA
+from services.schedule_service import SCHEDULE_SCHEMA
+from services.visit_service import VISIT_SCHEMA
+
+# Baseline: the per-field validators the services called before the schemas
+
+def validate_age(age):
+    if age is None:
+        return True, None
+    
+    try:
+        age = int(age)
+        if age < 0:
+            return False, "Age cannot be negative"
+        if age > 50:
+            return False, "Age seems unrealistic (max 50 years)"
+        return True, None
+    except (ValueError, TypeError):
+        return False, "Age must be a number"
+
+def validate_weight(weight):
+    if weight is None:
+        return True, None
+    
+    try:
+        weight = float(weight)
+        if weight <= 0:
+            return False, "Weight must be positive"
+        if weight > 500:
+            return False, "Weight seems unrealistic (max 500kg)"
+        return True, None
+    except (ValueError, TypeError):
+        return False, "Weight must be a number"
+
+def validate_email(email):
+    if not email:
+        return False, "Email is required"
+    
+    # Simple email regex
+    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+    if not re.match(pattern, email):
+        return False, "Invalid email format"
+    
+    return True, None
+
+def validate_username(username):
+    if not username:
+        return False, "Username is required"
+    
+    if len(username) < 3:
+        return False, "Username must be at least 3 characters"
+    
+    if len(username) > 50:
+        return False, "Username must be at most 50 characters"
+    
+    # Allow alphanumeric, underscore, dash
+    if not re.match(r'^[a-zA-Z0-9_-]+$', username):
+        return False, "Username can only contain letters, numbers, underscore and dash"
+    
+    return True, None
+
+def validate_password(password):
+    if not password:
+        return False, "Password is required"
+    
+    if len(password) < 8:
+        return False, "Password must be at least 8 characters"
+    
+    if len(password) > 100:
+        return False, "Password is too long (max 100 characters)"
+    
+    # Check for uppercase letter
+    if not re.search(r'[A-Z]', password):
+        return False, "Password must contain at least one uppercase letter"
+    
+    # Check for lowercase letter
+    if not re.search(r'[a-z]', password):
+        return False, "Password must contain at least one lowercase letter"
+    
+    # Check for digit
+    if not re.search(r'\d', password):
+        return False, "Password must contain at least one number"
+    
+    # Check for special character
+    if not re.search(r'[!@#$%^&*(),.?":{}|<>_\-+=\[\]\\\/~`]', password):
+        return False, "Password must contain at least one special character (!@#$%^&*...)"
+    
+    return True, None
+
+def validate_future_date(date_obj, field_name="Date"):
+    if date_obj and date_obj > datetime.now():
+        return False, f"{field_name} cannot be in the future"
+    return True, None
+
+def validate_time(time_str):
+    if not time_str:
+        return False, "Time is required"
+    
+    try:
+        hour, minute = map(int, time_str.split(':'))
+        if hour < 0 or hour > 23:
+            return False, "Hour must be between 0 and 23"
+        if minute < 0 or minute > 59:
+            return False, "Minute must be between 0 and 59"
+        return True, None
+    except (ValueError, AttributeError):
+        return False, "Invalid time format. Use HH:MM"
+
+def validate_string_length(value, field_name, min_length=None, max_length=None):
+    if value is None:
+        return True, None
+    
+    length = len(str(value))
+    
+    if min_length and length < min_length:
+        return False, f"{field_name} must be at least {min_length} characters"
+    
+    if max_length and length > max_length:
+        return False, f"{field_name} must be at most {max_length} characters"
+    
+    return True, None
+
+def legacy_registration(data):
+    """Checks as the service made them before, stopping at the first error (but for pets)"""
+    if not data or not data.get('username') or not data.get('email') or not data.get('password'):
+        return 'Username, email and password are required'
+    for is_valid, error in (validate_username(data['username']), validate_email(data['email']),
+                            validate_password(data['password'])):
+        if not is_valid:
+            return error
+    return None
+
+def legacy_pet(data):
+    errors = []
+    if not data.get('name') or not data.get('species'):
+        return ['Name and species are required']
+    for is_valid, error in (validate_string_length(data['name'], 'Name', 1, 100),
+                            validate_string_length(data['species'], 'Species', 1, 50),
+                            validate_age(data.get('age') or None), validate_weight(data.get('weight') or None)):
+        if not is_valid:
+            errors.append(error)
+    is_valid, _, error = validate_tags(data.get('tags'))
+    if not is_valid:
+        errors.append(error)
+    if errors:
+        return errors
+    _, tags, _ = validate_tags(data.get('tags'))
+    return None
+
+def legacy_schedule(data):
+    if not data.get('food_type') or not data.get('time'):
+        return 'food_type and time are required'
+    for is_valid, error in (validate_string_length(data['food_type'], 'Food type', 1, 100),
+                            validate_time(data['time'])):
+        if not is_valid:
+            return error
+    hour, minute = map(int, data['time'].split(':'))
+    feeding_time = time(hour, minute)
+    return None
+
+def legacy_visit(data):
+    if not data.get('visit_date') or not data.get('reason'):
+        return 'visit_date and reason are required'
+    is_valid, error = validate_string_length(data['reason'], 'Reason', 1, 200)
+    if not is_valid:
+        return error
+    is_valid, visit_date, error = validate_date(data['visit_date'], 'Visit date')
+    if not is_valid:
+        return error
+    is_valid, error = validate_future_date(visit_date, 'Visit date')
+    return error
+
+def legacy_visits_bulk(items):
+    valid = []
+    errors = []
+    for index, data in enumerate(items):
+        if not isinstance(data, dict):
+            errors.append({'index': index, 'error': 'Each visit must be an object'})
+            continue
+        error = legacy_visit(data)
+        if error:
+            errors.append({'index': index, 'error': error})
+            continue
+        valid.append(index)
+    return valid, errors
+
+RECORDS = [
+    ('registration', REGISTRATION_SCHEMA, legacy_registration,
+     {'username': 'anna_kowalska', 'email': 'anna@example.com', 'password': 'Tajne!Haslo123'}),
+    ('pet', PET_SCHEMA, legacy_pet,
+     {'name': 'Reksio', 'species': 'Pies', 'breed': 'Kundel', 'age': '4', 'weight': '12.5',
+      'tags': 'przyjazny,aktywny'}),
+    ('schedule', SCHEDULE_SCHEMA, legacy_schedule,
+     {'food_type': 'Karma sucha', 'amount': '200g', 'time': '08:30', 'frequency': 'daily'}),
+    ('visit', VISIT_SCHEMA, legacy_visit,
+     {'visit_date': '2024-03-05T10:00:00', 'reason': 'Kontrola', 'diagnosis': 'Zdrowy'}),
+]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--records', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    
+    def best(func, number):
+        return min(timeit.repeat(func, number=number, repeat=args.repeat)) / number
+    
+    for name, schema, legacy, record in RECORDS:
+        _, errors = schema.validate(record)
+        assert not errors and not legacy(record), name
+        old = best(lambda: legacy(record), args.records)
+        new = best(lambda: schema.validate(record), args.records)
+        print(f'{name} record:')
+        print(f'    validator functions: {old * 1e6:8.2f} us')
+        print(f'    compiled schema:     {new * 1e6:8.2f} us ({old / new:.1f}x)')
+    
+    visits = [
+        {'visit_date': f'2024-{month:02d}-{day:02d}T10:00:00', 'reason': 'Kontrola', 'notes': 'Bez uwag'}
+        for month in range(1, 13) for day in range(1, 29)
+    ]
+    items = (visits * (args.records // len(visits) + 1))[:args.records]
+    old = best(lambda: legacy_visits_bulk(items), 1)
+    new = best(lambda: VISIT_SCHEMA.validate_many(items, 'Each visit must be an object'), 1)
+    print(f'{len(items)} visits (bulk):')
+    print(f'    validator functions: {old * 1000:8.2f} ms')
+    print(f'    compiled schema:     {new * 1000:8.2f} ms ({old / new:.1f}x)')
+
+if __name__ == '__main__':
+    main()
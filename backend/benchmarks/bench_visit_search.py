@@ -0,0 +1,128 @@
+"""
+Benchmark for vet visit full-text search
+Seeds a throwaway SQLite database with synthetic visits, fills the FTS5
+index, then times SearchService.search_visits (which picks a path by owner
+size) against both of its paths, the FTS5 query and the scoped LIKE scan,
+for a typical owner and for one with a large share of the visits (e.g. a
+shelter account). The last query matches nothing, the worst case of a scan
+
+Usage: python benchmarks/bench_visit_search.py [--visits 1000000] [--repeat N]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import timeit
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from flask import current_app
+from sqlalchemy import text
+from app import create_app, db
+from config import Config
+from models.user import User
+from models.pet import Pet
+from models.vet_visit import VetVisit
+from services.search_service import SearchService
+
+BATCH_SIZE = 50_000
+
+REASONS = ['Kontrola', 'Szczepienie', 'Kaszel', 'Biegunka', 'Kulawizna', 'Zapalenie ucha', 'Odrobaczanie']
+DIAGNOSES = ['zapalenie oskrzeli', 'alergia pokarmowa', 'zapalenie skóry', 'zdrowy', 'infekcja dróg moczowych']
+TREATMENTS = ['dieta eliminacyjna', 'opatrunek', 'płukanie ucha', 'obserwacja', 'kroplówka']
+MEDICATIONS = ['amoksycylina', 'antybiotyk', 'meloksykam', 'prednizolon', 'probiotyk', None]
+NOTES = ['Kontrola za tydzień', 'Właściciel zgłasza poprawę', 'Podawać z jedzeniem', None]
+
+QUERIES = ['antybiotyk', 'zapalenie ucha', 'amoks', 'alergia pokarmowa dieta', 'nosówka']
+
+def seed(users, pets_per_user, heavy_pets, visits, seed=42):
+    """
+    Insert synthetic users, pets and visits, then build the search index in one statement
+    User 1 owns heavy_pets extra pets on top of the usual pets_per_user
+    """
+    rng = random.Random(seed)
+    now = datetime(2026, 1, 1)
+    pets = users * pets_per_user + heavy_pets
+    
+    db.session.execute(User.__table__.insert(), [
+        {'id': i, 'username': f'user{i}', 'email': f'user{i}@example.com',
+         'password_hash': 'x', 'created_at': now}
+        for i in range(1, users + 1)
+    ])
+    db.session.execute(Pet.__table__.insert(), [
+        {'id': i, 'name': f'Pet {i}', 'species': 'Dog', 'created_at': now,
+         'user_id': 1 if i <= heavy_pets else (i - heavy_pets - 1) // pets_per_user + 1}
+        for i in range(1, pets + 1)
+    ])
+    for start in range(0, visits, BATCH_SIZE):
+        db.session.execute(VetVisit.__table__.insert(), [
+            {'pet_id': rng.randrange(1, pets + 1), 'reason': rng.choice(REASONS),
+             'diagnosis': rng.choice(DIAGNOSES), 'treatment': rng.choice(TREATMENTS),
+             'medications': rng.choice(MEDICATIONS), 'notes': rng.choice(NOTES),
+             'visit_date': now - timedelta(minutes=rng.randrange(5_000_000)), 'created_at': now}
+            for _ in range(start, min(start + BATCH_SIZE, visits))
+        ])
+    db.session.execute(text(
+        "INSERT INTO vet_visits_fts (vet_visits_fts) VALUES ('rebuild')"
+    ))
+    db.session.commit()
+
+def scan_search(user_id, query, limit):
+    """Substring scan of the user's visits, used for small owners and without FTS5"""
+    return SearchService._search_scan(user_id, query, limit)
+
+def index_search(user_id, query, limit):
+    """Full-text index query, whatever the owner's size"""
+    maximum = current_app.config['SEARCH_SCAN_MAX_VISITS']
+    current_app.config['SEARCH_SCAN_MAX_VISITS'] = -1
+    try:
+        return SearchService.search_visits(user_id, query, limit)
+    finally:
+        current_app.config['SEARCH_SCAN_MAX_VISITS'] = maximum
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=1_000)
+    parser.add_argument('--pets-per-user', type=int, default=5)
+    parser.add_argument('--heavy-pets', type=int, default=1_000)
+    parser.add_argument('--visits', type=int, default=1_000_000)
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+    
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+    
+    try:
+        app = create_app(BenchConfig)
+        with app.app_context():
+            started = timeit.default_timer()
+            seed(args.users, args.pets_per_user, args.heavy_pets, args.visits)
+            print(f'seeded {args.visits} visits and built the index in {timeit.default_timer() - started:.1f}s')
+            
+            for label, user_id in (('typical owner', args.users // 2), ('heavy owner', 1)):
+                visits = db.session.execute(text(
+                    'SELECT count(*) FROM vet_visits v JOIN pets p ON p.id = v.pet_id WHERE p.user_id = :user_id'
+                ), {'user_id': user_id}).scalar()
+                route = 'scan' if SearchService._has_few_visits(user_id) else 'FTS5'
+                print(f'{label} ({visits} visits, search_visits uses the {route} path):')
+                for query in QUERIES:
+                    results = SearchService.search_visits(user_id, query, args.limit)
+                    print(f'    {query!r}: {len(results)} results')
+                    for name, search in (('search_visits', SearchService.search_visits),
+                                         ('FTS5 query', index_search), ('LIKE scan', scan_search)):
+                        best = min(timeit.repeat(lambda: search(user_id, query, args.limit),
+                                                 number=1, repeat=args.repeat))
+                        print(f'        {name:14} {best * 1000:8.2f} ms')
+    finally:
+        os.remove(path)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,30 @@
+"""
+`flask backfill-photos`: record the variant state of stored photos
+"""
+import click
+from sqlalchemy import or_, select
+from app import db, image_pipeline
+from models.pet import Pet
+from services.pet_service import PetService
+from utils.file_helper import FileUploadHelper
+
+@click.command('backfill-photos')
+@click.option('--all', 'everything', is_flag=True,
+              help='Recheck every photo, not only never queued and pending ones')
+def backfill_photos_command(everything):
+    """Generate missing photo variants in this process and store each photo's state."""
+    query = select(Pet.photo_url).where(Pet.photo_url.isnot(None)).distinct()
+    if not everything:
+        # NULL: stored before states were recorded; pending: its worker may have died
+        query = query.where(or_(Pet.photo_status.is_(None), Pet.photo_status == 'pending'))
+    photo_urls = db.session.execute(query).scalars().all()
+    
+    counts = {}
+    for photo_url in photo_urls:
+        photo_path = FileUploadHelper.photo_path(photo_url)
+        state = image_pipeline.generate(photo_path) if photo_path else 'missing'
+        PetService.set_photo_status(photo_url, state)
+        counts[state] = counts.get(state, 0) + 1
+    
+    summary = ', '.join(f'{count} {state}' for state, count in sorted(counts.items()))
+    click.echo(f'Checked {len(photo_urls)} photos{": " + summary if summary else ""}')
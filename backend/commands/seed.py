@@ -0,0 +1,206 @@
+"""
+`flask seed`: deterministic synthetic data for scale testing
+"""
+import random
+import time
+from datetime import datetime, time as clock, timedelta
+from itertools import islice
+import click
+from flask import current_app
+from sqlalchemy import func, select, text
+from app import db, bcrypt
+from models.user import User
+from models.pet import Pet
+from models.pet_tag import PetTag
+from models.feeding_schedule import FeedingSchedule
+from models.vet_visit import VetVisit, VISIT_SEARCH_TABLE, VISIT_SEARCH_COLUMNS
+from services.search_service import SearchService
+
+# Seeded users log in as seed_user<id> with PASSWORD.format(id % passwords)
+PASSWORD = 'SeedPass{}!'
+
+SPECIES = {
+    'Dog': ['Labrador', 'Owczarek niemiecki', 'Golden Retriever', 'Beagle', 'Jamnik', None],
+    'Cat': ['Europejski', 'Maine Coon', 'Brytyjski', 'Syberyjski', None],
+    'Rabbit': ['Baranek', 'Karzełek', None],
+    'Bird': ['Papuga falista', 'Nimfa', 'Kanarek'],
+    'Hamster': ['Syryjski', 'Dżungarski'],
+}
+PET_NAMES = ['Burek', 'Azor', 'Luna', 'Max', 'Mruczek', 'Kitka', 'Reksio', 'Bella', 'Fafik', 'Tosia',
+             'Rocky', 'Nala', 'Pusia', 'Szarik', 'Maja', 'Bobik', 'Kropka', 'Leo', 'Misia', 'Figa']
+TAGS = ['senior', 'puppy', 'allergies', 'diabetic', 'indoor', 'outdoor', 'rescue', 'overweight',
+        'medication', 'anxious', 'neutered', 'show']
+FOODS = ['Karma sucha', 'Karma mokra', 'Mięso gotowane', 'Warzywa', 'Siano', 'Ziarno', 'Przysmak']
+AMOUNTS = ['50g', '100g', '150g', '200g', '1 puszka', '1/2 szklanki', '1 szklanka']
+FREQUENCIES = ['daily', 'daily', 'daily', 'twice a day', 'weekly', 'weekdays', 'every 2 days']
+REASONS = ['Kontrola', 'Szczepienie', 'Kaszel', 'Biegunka', 'Kulawizna', 'Zapalenie ucha', 'Odrobaczanie',
+           'Wymioty', 'Świąd skóry', 'Badanie krwi', 'Usunięcie kamienia', 'Kastracja']
+DIAGNOSES = ['zapalenie oskrzeli', 'alergia pokarmowa', 'zapalenie skóry', 'zdrowy', 'infekcja dróg moczowych',
+             'nieżyt żołądka', 'zwichnięcie', 'pasożyty', None]
+TREATMENTS = ['dieta eliminacyjna', 'opatrunek', 'płukanie ucha', 'obserwacja', 'kroplówka', 'zabieg', None]
+MEDICATIONS = ['amoksycylina', 'antybiotyk', 'meloksykam', 'prednizolon', 'probiotyk', 'krople do uszu', None, None]
+NOTES = ['Kontrola za tydzień', 'Właściciel zgłasza poprawę', 'Podawać z jedzeniem', 'Bez uwag', None, None]
+VETS = ['Dr. Nowak', 'Dr. Kowalska', 'Dr. Wiśniewski', 'Dr. Wójcik', 'Dr. Kamińska', 'Dr. Lewandowski']
+CLINICS = ['Vet Centrum', 'Klinika Azor', 'Przychodnia Pod Lipami', 'Całodobowa Lecznica', None]
+
+def batched(rows, size):
+    """Lists of up to size rows from an iterator"""
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+class SeedGenerator:
+    """
+    Synthetic rows from one random seed; the same seed and counts give the same data
+    
+    Ids are assigned here, continuing after the highest existing ones, so
+    the inserts need no RETURNING and every generator can derive foreign
+    keys without reading them back.
+    """
+    
+    def __init__(self, seed, users, pets_per_user, schedules_per_pet, visits, start_ids, password_hashes):
+        self.rng = random.Random(seed)
+        self.users = users
+        self.pets = users * pets_per_user
+        self.pets_per_user = pets_per_user
+        self.schedules_per_pet = schedules_per_pet
+        self.visits = visits
+        self.start_ids = start_ids
+        self.password_hashes = password_hashes
+        self.now = datetime(2026, 1, 1)
+        self.pet_tags = []
+        self.pet_owners = []
+    
+    def user_rows(self):
+        first = self.start_ids['users']
+        for n in range(self.users):
+            user_id = first + n
+            yield {
+                'id': user_id, 'username': f'seed_user{user_id}', 'email': f'seed_user{user_id}@example.com',
+                'password_hash': self.password_hashes[user_id % len(self.password_hashes)],
+                'created_at': self.now - timedelta(minutes=self.rng.randrange(3 * 365 * 24 * 60)),
+            }
+    
+    def pet_rows(self):
+        """Pets of every seeded user; remembers owners and tags for the rows that depend on them"""
+        rng = self.rng
+        species_names = list(SPECIES)
+        for n in range(self.pets):
+            user_id = self.start_ids['users'] + n // self.pets_per_user
+            species = rng.choice(species_names)
+            tags = rng.sample(TAGS, rng.choice((0, 0, 1, 1, 2, 3)))
+            self.pet_owners.append(user_id)
+            self.pet_tags.append(tags)
+            yield {
+                'id': self.start_ids['pets'] + n, 'name': rng.choice(PET_NAMES), 'species': species,
+                'breed': rng.choice(SPECIES[species]), 'age': rng.randrange(16),
+                'weight': round(rng.uniform(0.1, 45), 1), 'tags': ','.join(tags), 'user_id': user_id,
+                'created_at': self.now - timedelta(minutes=rng.randrange(2 * 365 * 24 * 60)),
+            }
+    
+    def pet_tag_rows(self):
+        for n, tags in enumerate(self.pet_tags):
+            for tag in tags:
+                yield {'pet_id': self.start_ids['pets'] + n, 'tag': tag, 'user_id': self.pet_owners[n]}
+    
+    def schedule_rows(self):
+        rng = self.rng
+        for n in range(self.pets * self.schedules_per_pet):
+            yield {
+                'id': self.start_ids['schedules'] + n,
+                'pet_id': self.start_ids['pets'] + n // self.schedules_per_pet,
+                'food_type': rng.choice(FOODS), 'amount': rng.choice(AMOUNTS),
+                'time': clock(rng.randrange(6, 22), rng.choice((0, 15, 30, 45))),
+                'frequency': rng.choice(FREQUENCIES), 'created_at': self.now,
+            }
+    
+    def visit_rows(self):
+        rng = self.rng
+        first_pet = self.start_ids['pets']
+        for n in range(self.visits):
+            visit_date = self.now - timedelta(minutes=rng.randrange(5 * 365 * 24 * 60))
+            yield {
+                'id': self.start_ids['visits'] + n, 'pet_id': first_pet + rng.randrange(self.pets),
+                'visit_date': visit_date, 'vet_name': rng.choice(VETS), 'clinic_name': rng.choice(CLINICS),
+                'reason': rng.choice(REASONS), 'diagnosis': rng.choice(DIAGNOSES),
+                'treatment': rng.choice(TREATMENTS), 'medications': rng.choice(MEDICATIONS),
+                'notes': rng.choice(NOTES), 'created_at': visit_date,
+            }
+
+def next_ids():
+    """First free id of every seeded table"""
+    return {
+        name: (db.session.execute(select(func.max(model.id))).scalar() or 0) + 1
+        for name, model in (('users', User), ('pets', Pet), ('schedules', FeedingSchedule), ('visits', VetVisit))
+    }
+
+def insert_rows(table, rows, batch_size):
+    """
+    Core executemany inserts of an iterator of rows, batch by batch
+    Returns: number of rows inserted
+    """
+    count = 0
+    statement = table.insert()
+    for batch in batched(rows, batch_size):
+        db.session.execute(statement, batch)
+        count += len(batch)
+    return count
+
+def index_seeded_visits(first_visit_id):
+    """Add the new visits to the search index with one INSERT ... SELECT"""
+    columns = ', '.join(VISIT_SEARCH_COLUMNS)
+    db.session.execute(text(
+        f"INSERT INTO {VISIT_SEARCH_TABLE} (rowid, {columns}) "
+        f"SELECT id, {columns} FROM vet_visits WHERE id >= :first"
+    ), {'first': first_visit_id})
+
+@click.command('seed')
+@click.option('--users', default=10_000, show_default=True)
+@click.option('--pets-per-user', default=3, show_default=True)
+@click.option('--schedules-per-pet', default=2, show_default=True)
+@click.option('--visits', default=1_000_000, show_default=True, help='Vet visits, spread over all seeded pets')
+@click.option('--seed', default=42, show_default=True, help='Random seed; the same seed gives the same data')
+@click.option('--passwords', default=4, show_default=True, help='Distinct bcrypt hashes shared by the users')
+@click.option('--batch-size', default=50_000, show_default=True, help='Rows per executemany')
+@click.option('--reset', is_flag=True, help='Drop and recreate every table first')
+def seed_command(users, pets_per_user, schedules_per_pet, visits, seed, passwords, batch_size, reset):
+    """Fill the database with synthetic users, pets, tags, schedules and visits."""
+    if users < 1 or pets_per_user < 1 or passwords < 1:
+        raise click.BadParameter('--users, --pets-per-user and --passwords must be at least 1')
+    
+    if reset:
+        db.drop_all()
+        db.create_all()
+    
+    # Hashing is the slow part of creating a user, so a few hashes are shared by everyone
+    rounds = current_app.config['BCRYPT_LOG_ROUNDS']
+    password_hashes = [
+        bcrypt.generate_password_hash(PASSWORD.format(n), rounds).decode('utf-8') for n in range(passwords)
+    ]
+    generator = SeedGenerator(
+        seed, users, pets_per_user, schedules_per_pet, visits, next_ids(), password_hashes
+    )
+    
+    started = time.perf_counter()
+    for label, table, rows in (
+        ('users', User.__table__, generator.user_rows()),
+        ('pets', Pet.__table__, generator.pet_rows()),
+        ('pet tags', PetTag.__table__, generator.pet_tag_rows()),
+        ('feeding schedules', FeedingSchedule.__table__, generator.schedule_rows()),
+        ('vet visits', VetVisit.__table__, generator.visit_rows()),
+    ):
+        began = time.perf_counter()
+        count = insert_rows(table, rows, batch_size)
+        click.echo(f'{label:18} {count:>10} rows in {time.perf_counter() - began:6.1f}s')
+    
+    if visits and SearchService.enabled():
+        began = time.perf_counter()
+        index_seeded_visits(generator.start_ids['visits'])
+        click.echo(f'{"search index":18} {visits:>10} rows in {time.perf_counter() - began:6.1f}s')
+    
+    db.session.commit()
+    first_user = generator.start_ids['users']
+    click.echo(f'Seeded in {time.perf_counter() - started:.1f}s. Users seed_user{first_user}..'
+               f'seed_user{first_user + users - 1} log in with {PASSWORD.format("<id % " + str(passwords) + ">")}')
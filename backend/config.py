@@ -16,11 +16,73 @@ class Config:
         'sqlite:///' + os.path.join(basedir, 'petcare.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Optional read replica: GET requests read from it, outside the read-your-writes window
+    SQLALCHEMY_REPLICA_URI = os.environ.get('DATABASE_REPLICA_URL')
+    REPLICA_LAG_WINDOW = int(os.environ.get('REPLICA_LAG_WINDOW', 5))  # seconds reads stay on the primary after a write
+    
+    # Schema on startup: create_all (create missing tables, for development and tests) or
+    # migrations (managed by `flask db upgrade`; startup only checks the alembic_version row)
+    DB_SCHEMA = os.environ.get('DB_SCHEMA', 'create_all')
+    MIGRATIONS_DIR = os.path.join(basedir, 'migrations')
+    # Defer blueprint imports to the first request and Flask-Migrate to the flask CLI
+    LAZY_INIT = os.environ.get('LAZY_INIT', '').lower() in ('1', 'true', 'yes')
+    
+    # Engine profile: auto (from the URI scheme), sqlite, postgres or default (no tuning)
+    DB_PROFILE = os.environ.get('DB_PROFILE', 'auto')
+    # sqlite profile: WAL journal plus these per-connection pragmas
+    SQLITE_BUSY_TIMEOUT = int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000))  # ms
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))  # bytes
+    SQLITE_CACHE_SIZE = int(os.environ.get('SQLITE_CACHE_SIZE', -64000))  # pages, or KiB if negative
+    # postgres profile: connection pool per worker process
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 20))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 30))  # seconds to wait for a free connection
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))  # seconds before a connection is replaced
+    
     # JWT configuration
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-key-change-in-production'
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
     
+    # Password hashing: bcrypt cost factor and bounded worker pool
+    BCRYPT_LOG_ROUNDS = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))
+    HASHING_POOL_SIZE = int(os.environ.get('HASHING_POOL_SIZE', 2))
+    HASHING_QUEUE_SIZE = int(os.environ.get('HASHING_QUEUE_SIZE', 32))
+    HASHING_TIMEOUT = 10  # seconds a request waits for its hashing job
+    
+    # Ownership cache (per process): max entries and seconds before re-checking
+    OWNERSHIP_CACHE_SIZE = int(os.environ.get('OWNERSHIP_CACHE_SIZE', 10000))
+    OWNERSHIP_CACHE_TTL = int(os.environ.get('OWNERSHIP_CACHE_TTL', 30))
+    
+    # Visit search: owners with at most this many visits are scanned instead of
+    # queried through the full-text index (whose cost follows the whole index's matches)
+    SEARCH_SCAN_MAX_VISITS = int(os.environ.get('SEARCH_SCAN_MAX_VISITS', 5000))
+    
+    # Per-request SQL profiling (Server-Timing header, slow request and N+1 logs); off by default
+    SQL_PROFILING = os.environ.get('SQL_PROFILING', '').lower() in ('1', 'true', 'yes')
+    SLOW_REQUEST_MS = int(os.environ.get('SLOW_REQUEST_MS', 500))
+    N_PLUS_ONE_THRESHOLD = int(os.environ.get('N_PLUS_ONE_THRESHOLD', 5))  # same-shape statements per request
+    
+    # Prometheus /metrics endpoint; off by default, since it exposes route names and traffic.
+    # When enabled, set METRICS_TOKEN so scrapes need `Authorization: Bearer <token>`, or keep
+    # /metrics off the public proxy. For several workers also set PROMETHEUS_MULTIPROC_DIR (see utils/metrics.py)
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '').lower() in ('1', 'true', 'yes')
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN') or None
+    
+    # Maximum number of records accepted by a single bulk create request
+    BULK_MAX_ITEMS = int(os.environ.get('BULK_MAX_ITEMS', 10000))
+    
     # Upload folder for pet photos
     UPLOAD_FOLDER = os.path.join(basedir, 'uploads')
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
+    
+    # Browser caching of /uploads: content-addressed names never change, other files may
+    UPLOADS_IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+    UPLOADS_MAX_AGE = 3600
+    USE_X_SENDFILE = os.environ.get('USE_X_SENDFILE', '').lower() in ('1', 'true', 'yes')
+    
+    # Photo variants generated in the background: name -> (size in px, crop to square)
+    # Variants are served as immutable, so rename a variant when changing its size
+    PHOTO_VARIANTS = {'thumb': (160, True), 'web': (1280, False)}
+    PHOTO_VARIANT_QUALITY = 80
+    IMAGE_WORKERS = int(os.environ.get('IMAGE_WORKERS', 2))  # 0 = generate inline
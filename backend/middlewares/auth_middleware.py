@@ -4,6 +4,7 @@ Authentication middleware and decorators
 from functools import wraps
 from flask import jsonify
 from flask_jwt_extended import get_jwt_identity
+from werkzeug.local import LocalProxy
 
 def verify_pet_owner(get_pet_func):
     """
@@ -13,10 +14,10 @@ def verify_pet_owner(get_pet_func):
     def decorator(f):
         @wraps(f)
         def decorated_function(pet_id, *args, **kwargs):
-            from models.pet import Pet
+            from services.pet_service import PetService
             
             current_user_id = int(get_jwt_identity())
-            pet = Pet.query.filter_by(id=pet_id, user_id=current_user_id).first()
+            pet = PetService.get_pet_by_id(pet_id, current_user_id)
             
             if not pet:
                 return jsonify({'error': 'Pet not found'}), 404
@@ -33,20 +34,40 @@ def verify_schedule_owner(f):
     """
     @wraps(f)
     def decorated_function(schedule_id, *args, **kwargs):
+        from app import db, ownership_cache
+        from sqlalchemy import select
         from models.pet import Pet
         from models.feeding_schedule import FeedingSchedule
+        from services.schedule_service import ScheduleService
         
         current_user_id = int(get_jwt_identity())
-        schedule = FeedingSchedule.query.get(schedule_id)
+        
+        # Cached ownership: load only the schedule, still joined to its pet's owner since the
+        # cache may be stale; the pet is loaded if the handler uses it
+        cached_pet_id = ownership_cache.schedule_pet(schedule_id)
+        if cached_pet_id is not None and ownership_cache.owns_pet(current_user_id, cached_pet_id):
+            schedule = db.session.execute(
+                select(FeedingSchedule).join(Pet, Pet.id == FeedingSchedule.pet_id)
+                .where(FeedingSchedule.id == schedule_id, Pet.user_id == current_user_id)
+            ).scalar()
+            if schedule is not None:
+                return f(schedule_id, schedule=schedule, pet=LocalProxy(lambda: schedule.pet), *args, **kwargs)
+            ownership_cache.forget_schedule(schedule_id)
+        
+        # Schedule and its pet in a single statement
+        schedule = ScheduleService.get_schedule_with_pet(schedule_id)
         
         if not schedule:
             return jsonify({'error': 'Schedule not found'}), 404
         
-        pet = Pet.query.filter_by(id=schedule.pet_id, user_id=current_user_id).first()
+        pet = schedule.pet
         
-        if not pet:
+        if pet.user_id != current_user_id:
             return jsonify({'error': 'Unauthorized'}), 403
         
+        ownership_cache.remember_schedule(schedule_id, pet.id)
+        ownership_cache.remember_pet(current_user_id, pet.id)
+        
         # Pass schedule and pet to the function
         return f(schedule_id, schedule=schedule, pet=pet, *args, **kwargs)
     
@@ -58,20 +79,40 @@ def verify_visit_owner(f):
     """
     @wraps(f)
     def decorated_function(visit_id, *args, **kwargs):
+        from app import db, ownership_cache
+        from sqlalchemy import select
         from models.pet import Pet
         from models.vet_visit import VetVisit
+        from services.visit_service import VisitService
         
         current_user_id = int(get_jwt_identity())
-        visit = VetVisit.query.get(visit_id)
+        
+        # Cached ownership: load only the visit, still joined to its pet's owner since the
+        # cache may be stale; the pet is loaded if the handler uses it
+        cached_pet_id = ownership_cache.visit_pet(visit_id)
+        if cached_pet_id is not None and ownership_cache.owns_pet(current_user_id, cached_pet_id):
+            visit = db.session.execute(
+                select(VetVisit).join(Pet, Pet.id == VetVisit.pet_id)
+                .where(VetVisit.id == visit_id, Pet.user_id == current_user_id)
+            ).scalar()
+            if visit is not None:
+                return f(visit_id, visit=visit, pet=LocalProxy(lambda: visit.pet), *args, **kwargs)
+            ownership_cache.forget_visit(visit_id)
+        
+        # Visit and its pet in a single statement
+        visit = VisitService.get_visit_with_pet(visit_id)
         
         if not visit:
             return jsonify({'error': 'Visit not found'}), 404
         
-        pet = Pet.query.filter_by(id=visit.pet_id, user_id=current_user_id).first()
+        pet = visit.pet
         
-        if not pet:
+        if pet.user_id != current_user_id:
             return jsonify({'error': 'Unauthorized'}), 403
         
+        ownership_cache.remember_visit(visit_id, pet.id)
+        ownership_cache.remember_pet(current_user_id, pet.id)
+        
         # Pass visit and pet to the function
         return f(visit_id, visit=visit, pet=pet, *args, **kwargs)
     
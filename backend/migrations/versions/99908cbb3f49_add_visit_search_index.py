@@ -0,0 +1,40 @@
+"""add visit search index
+
+Revision ID: 99908cbb3f49
+Revises: a6da966176b2
+Create Date: 2026-10-18 17:34:12.408315
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '99908cbb3f49'
+down_revision = 'a6da966176b2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # FTS5 is SQLite only; other databases search with LIKE
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS vet_visits_fts USING fts5("
+        "reason, diagnosis, treatment, medications, notes, owner, pet_id UNINDEXED, "
+        "tokenize='unicode61 remove_diacritics 2')"
+    )
+    op.execute(
+        "INSERT INTO vet_visits_fts (rowid, reason, diagnosis, treatment, medications, notes, owner, pet_id) "
+        "SELECT v.id, v.reason, v.diagnosis, v.treatment, v.medications, v.notes, 'u' || p.user_id, v.pet_id "
+        "FROM vet_visits v JOIN pets p ON p.id = v.pet_id"
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute('DROP TABLE IF EXISTS vet_visits_fts')
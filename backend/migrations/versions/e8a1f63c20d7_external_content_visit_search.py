@@ -0,0 +1,49 @@
+"""external content visit search
+
+Revision ID: e8a1f63c20d7
+Revises: 5c0e2b7d41a9
+Create Date: 2026-10-18 21:47:55.130864
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8a1f63c20d7'
+down_revision = '5c0e2b7d41a9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # FTS5 is SQLite only; other databases search with LIKE
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    # The index reads the text from vet_visits instead of keeping its own copy,
+    # and no longer holds an owner token (searches restrict rowids instead)
+    op.execute('DROP TABLE IF EXISTS vet_visits_fts')
+    op.execute(
+        "CREATE VIRTUAL TABLE vet_visits_fts USING fts5("
+        "reason, diagnosis, treatment, medications, notes, content='vet_visits', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')"
+    )
+    op.execute("INSERT INTO vet_visits_fts (vet_visits_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute('DROP TABLE IF EXISTS vet_visits_fts')
+    op.execute(
+        "CREATE VIRTUAL TABLE vet_visits_fts USING fts5("
+        "reason, diagnosis, treatment, medications, notes, owner, pet_id UNINDEXED, "
+        "tokenize='unicode61 remove_diacritics 2')"
+    )
+    op.execute(
+        "INSERT INTO vet_visits_fts (rowid, reason, diagnosis, treatment, medications, notes, owner, pet_id) "
+        "SELECT v.id, v.reason, v.diagnosis, v.treatment, v.medications, v.notes, 'u' || p.user_id, v.pet_id "
+        "FROM vet_visits v JOIN pets p ON p.id = v.pet_id"
+    )
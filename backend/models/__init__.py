@@ -2,5 +2,6 @@ from .user import User
 from .pet import Pet
 from .feeding_schedule import FeedingSchedule
 from .vet_visit import VetVisit
+from .pet_tag import PetTag
 
-__all__ = ['User', 'Pet', 'FeedingSchedule', 'VetVisit']
+__all__ = ['User', 'Pet', 'FeedingSchedule', 'VetVisit', 'PetTag']
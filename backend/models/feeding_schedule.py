@@ -3,6 +3,10 @@ from datetime import datetime
 
 class FeedingSchedule(db.Model):
     __tablename__ = 'feeding_schedules'
+    __table_args__ = (
+        # Pet's schedules, ordered by feeding time
+        db.Index('ix_feeding_schedules_pet_id_time', 'pet_id', 'time'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     pet_id = db.Column(db.Integer, db.ForeignKey('pets.id'), nullable=False)
@@ -15,6 +19,18 @@ class FeedingSchedule(db.Model):
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # Fields exposed by to_dict(), selectable with ?fields=
+    FIELDS = ('id', 'pet_id', 'food_type', 'amount', 'time', 'frequency', 'notes', 'created_at')
+    # Unbounded Text columns, left out of list queries unless requested
+    DEFERRED_FIELDS = ()
+    # Fields computed from another column
+    FIELD_SOURCES = {}
+    # Fields not returned as stored
+    FIELD_FORMATS = {
+        'time': lambda feeding_time: feeding_time.strftime('%H:%M'),
+        'created_at': lambda created_at: created_at.isoformat(),
+    }
+    
     def __repr__(self):
         return f'<FeedingSchedule Pet:{self.pet_id} at {self.time}>'
     
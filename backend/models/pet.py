@@ -1,8 +1,15 @@
 from app import db
 from datetime import datetime
+from utils.file_helper import FileUploadHelper
 
 class Pet(db.Model):
     __tablename__ = 'pets'
+    __table_args__ = (
+        # Owner's pet list, ordered for keyset pagination
+        db.Index('ix_pets_user_id_created_at', 'user_id', 'created_at'),
+        # Reference counting of shared, content-addressed photos
+        db.Index('ix_pets_photo_url', 'photo_url'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -11,9 +18,13 @@ class Pet(db.Model):
     age = db.Column(db.Integer)
     weight = db.Column(db.Float)  # in kg
     photo_url = db.Column(db.String(255))
-    tags = db.Column(db.String(255))  # comma-separated tags
+    # Variant state of the photo (pending, ready, failed, missing); NULL = never queued
+    photo_status = db.Column(db.String(16))
+    tags = db.Column(db.String(255))  # comma-separated tags, display copy of pet_tags
     notes = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Bumped on every change to the pet, its schedules or visits (ETag of pet views)
+    data_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     
     # Foreign key
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -21,6 +32,21 @@ class Pet(db.Model):
     # Relationships
     feeding_schedules = db.relationship('FeedingSchedule', backref='pet', lazy=True, cascade='all, delete-orphan')
     vet_visits = db.relationship('VetVisit', backref='pet', lazy=True, cascade='all, delete-orphan')
+    tag_links = db.relationship('PetTag', lazy=True, cascade='all, delete-orphan')
+    
+    # Fields exposed by to_dict(), selectable with ?fields=
+    FIELDS = ('id', 'name', 'species', 'breed', 'age', 'weight', 'photo_url', 'photo_variants',
+              'tags', 'notes', 'created_at', 'user_id')
+    # Unbounded Text columns, left out of list queries unless requested
+    DEFERRED_FIELDS = ('notes',)
+    # Fields computed from other columns
+    FIELD_SOURCES = {'photo_variants': ('photo_url', 'photo_status')}
+    # Fields not returned as stored
+    FIELD_FORMATS = {
+        'photo_variants': FileUploadHelper.photo_variants,
+        'tags': lambda tags: tags.split(',') if tags else [],
+        'created_at': lambda created_at: created_at.isoformat(),
+    }
     
     def __repr__(self):
         return f'<Pet {self.name} ({self.species})>'
@@ -34,6 +60,7 @@ class Pet(db.Model):
             'age': self.age,
             'weight': self.weight,
             'photo_url': self.photo_url,
+            'photo_variants': FileUploadHelper.photo_variants(self.photo_url, self.photo_status),
             'tags': self.tags.split(',') if self.tags else [],
             'notes': self.notes,
             'created_at': self.created_at.isoformat(),
@@ -0,0 +1,17 @@
+from app import db
+
+class PetTag(db.Model):
+    """One tag of a pet; the indexed source of tag filters and counts"""
+    __tablename__ = 'pet_tags'
+    __table_args__ = (
+        # Owner's pets with a tag, and per-tag counts, without touching pets
+        db.Index('ix_pet_tags_user_id_tag_pet_id', 'user_id', 'tag', 'pet_id'),
+    )
+    
+    pet_id = db.Column(db.Integer, db.ForeignKey('pets.id'), primary_key=True)
+    tag = db.Column(db.String(50), primary_key=True)
+    # Copied from the pet, so filters never join pets
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    
+    def __repr__(self):
+        return f'<PetTag Pet:{self.pet_id} {self.tag}>'
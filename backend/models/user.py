@@ -9,6 +9,8 @@ class User(db.Model):
     email = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Bumped on every change to the user's pets (ETag of the pet list)
+    data_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     
     # Relationship with pets
     pets = db.relationship('Pet', backref='owner', lazy=True, cascade='all, delete-orphan')
@@ -1,8 +1,13 @@
 from app import db
 from datetime import datetime
+from sqlalchemy import DDL, event
 
 class VetVisit(db.Model):
     __tablename__ = 'vet_visits'
+    __table_args__ = (
+        # Pet's visit history, ordered by visit date
+        db.Index('ix_vet_visits_pet_id_visit_date', 'pet_id', 'visit_date'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     pet_id = db.Column(db.Integer, db.ForeignKey('pets.id'), nullable=False)
@@ -18,6 +23,19 @@ class VetVisit(db.Model):
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # Fields exposed by to_dict(), selectable with ?fields=
+    FIELDS = ('id', 'pet_id', 'visit_date', 'vet_name', 'clinic_name', 'reason',
+              'diagnosis', 'treatment', 'medications', 'notes', 'created_at')
+    # Unbounded Text columns, left out of list queries unless requested
+    DEFERRED_FIELDS = ('diagnosis', 'treatment', 'medications', 'notes')
+    # Fields computed from another column
+    FIELD_SOURCES = {}
+    # Fields not returned as stored
+    FIELD_FORMATS = {
+        'visit_date': lambda visit_date: visit_date.isoformat(),
+        'created_at': lambda created_at: created_at.isoformat(),
+    }
+    
     def __repr__(self):
         return f'<VetVisit Pet:{self.pet_id} on {self.visit_date}>'
     
@@ -35,3 +53,18 @@ class VetVisit(db.Model):
             'notes': self.notes,
             'created_at': self.created_at.isoformat()
         }
+
+# Full-text index over visit text (SQLite FTS5), kept in sync by VisitService.
+# External content: the index reads the text back from vet_visits instead of
+# storing a copy; searches are scoped by restricting rowids to the user's visits.
+VISIT_SEARCH_TABLE = 'vet_visits_fts'
+VISIT_SEARCH_COLUMNS = ('reason', 'diagnosis', 'treatment', 'medications', 'notes')
+
+event.listen(VetVisit.__table__, 'after_create', DDL(
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {VISIT_SEARCH_TABLE} USING fts5("
+    f"{', '.join(VISIT_SEARCH_COLUMNS)}, content='vet_visits', content_rowid='id', "
+    f"tokenize='unicode61 remove_diacritics 2')"
+).execute_if(dialect='sqlite'))
+event.listen(VetVisit.__table__, 'after_drop', DDL(
+    f'DROP TABLE IF EXISTS {VISIT_SEARCH_TABLE}'
+).execute_if(dialect='sqlite'))
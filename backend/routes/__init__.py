@@ -1,3 +1,3 @@
-from . import auth, pets, schedules, visits
+from . import auth, pets, schedules, visits, export, uploads, metrics
 
-__all__ = ['auth', 'pets', 'schedules', 'visits']
+__all__ = ['auth', 'pets', 'schedules', 'visits', 'export', 'uploads', 'metrics']
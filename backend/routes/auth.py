@@ -1,6 +1,6 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from services.auth_service import AuthService
+from services.auth_service import AuthService, BUSY_ERROR
 
 bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
@@ -12,6 +12,8 @@ def register():
     user, access_token, error = AuthService.register_user(data)
     
     if error:
+        if error == BUSY_ERROR:
+            return jsonify({'error': error}), 503, {'Retry-After': '1'}
         status_code = 409 if 'already exists' in error else 400
         return jsonify({'error': error}), status_code
     
@@ -29,6 +31,8 @@ def login():
     user, access_token, error = AuthService.login_user(data)
     
     if error:
+        if error == BUSY_ERROR:
+            return jsonify({'error': error}), 503, {'Retry-After': '1'}
         status_code = 401 if 'Invalid' in error else 400
         return jsonify({'error': error}), status_code
     
@@ -0,0 +1,33 @@
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from services.export_service import ExportService, EXPORTS
+
+bp = Blueprint('export', __name__, url_prefix='/api/export')
+
+@bp.route('/<kind>', methods=['GET'])
+@jwt_required()
+def export_data(kind):
+    """Stream all of the user's pets, schedules and/or visits as CSV or NDJSON"""
+    current_user_id = int(get_jwt_identity())
+    export_format = request.args.get('format', 'ndjson')
+    
+    if kind != 'all' and kind not in EXPORTS:
+        return jsonify({'error': f'Unknown export. Use one of: all, {", ".join(EXPORTS)}'}), 404
+    
+    if export_format == 'ndjson':
+        kinds = list(EXPORTS) if kind == 'all' else [kind]
+        chunks = ExportService.stream_ndjson(current_user_id, kinds)
+        mimetype, extension = 'application/x-ndjson', 'ndjson'
+    elif export_format == 'csv':
+        if kind == 'all':
+            return jsonify({'error': 'CSV export needs a single kind: pets, schedules or visits'}), 400
+        chunks = ExportService.stream_csv(current_user_id, kind)
+        mimetype, extension = 'text/csv', 'csv'
+    else:
+        return jsonify({'error': 'Invalid format. Use csv or ndjson'}), 400
+    
+    return Response(
+        stream_with_context(chunks),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename=petcare-{kind}.{extension}'}
+    )
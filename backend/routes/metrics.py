@@ -0,0 +1,20 @@
+import hmac
+from flask import Blueprint, Response, current_app, jsonify, request
+from prometheus_client import CONTENT_TYPE_LATEST
+from utils.metrics import render
+
+bp = Blueprint('metrics', __name__)
+
+@bp.before_request
+def require_token():
+    """Scrapes must present METRICS_TOKEN as a bearer token when one is configured"""
+    token = current_app.config.get('METRICS_TOKEN')
+    if token is None:
+        return None
+    if not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return jsonify({'error': 'Unauthorized'}), 401
+
+@bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus scrape endpoint, aggregated across workers in multiprocess mode"""
+    return Response(render(), mimetype=CONTENT_TYPE_LATEST)
@@ -1,20 +1,68 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from models.pet import Pet
 from services.pet_service import PetService
 from utils.file_helper import FileUploadHelper
+from services.version_service import VersionService
+from utils.pagination import validate_page_size
+from utils.validators import validate_tags
+from utils.conditional import make_etag, not_modified, tag_response
+from utils.fields import Projection, list_fields, parse_fields
 
 bp = Blueprint('pets', __name__, url_prefix='/api/pets')
 
 @bp.route('/', methods=['GET'])
 @jwt_required()
 def get_pets():
-    """Get all pets for the current user"""
+    """
+    Get all pets for the current user (paginated when limit or cursor is given)
+    ?fields= selects the returned fields; notes are only loaded when requested
+    ?tag=a&tag=b keeps pets with every tag (?match=any: with at least one)
+    and adds the user's per-tag pet counts
+    """
     current_user_id = int(get_jwt_identity())
-    pets = PetService.get_user_pets(current_user_id)
     
-    return jsonify({
-        'pets': [pet.to_dict() for pet in pets]
-    }), 200
+    # Unchanged since the client's copy: answer before loading any pet
+    etag = make_etag('pets', current_user_id, VersionService.get_user_version(current_user_id))
+    cached = not_modified(etag)
+    if cached:
+        return cached
+    
+    is_valid, fields, error = parse_fields(request.args.get('fields'), Pet, list_fields(Pet))
+    if not is_valid:
+        return jsonify({'error': error}), 400
+    
+    is_valid, tags, error = validate_tags(request.args.getlist('tag'))
+    if not is_valid:
+        return jsonify({'error': error}), 400
+    
+    match = request.args.get('match', 'all')
+    if match not in ('all', 'any'):
+        return jsonify({'error': 'Match must be all or any'}), 400
+    match_all = match == 'all'
+    
+    if 'limit' not in request.args and 'cursor' not in request.args:
+        projection = Projection(Pet, fields)
+        rows = PetService.get_user_pet_rows(current_user_id, projection.columns, tags, match_all)
+        payload = {'pets': projection.serialize(rows)}
+    else:
+        is_valid, limit, error = validate_page_size(request.args.get('limit'))
+        if not is_valid:
+            return jsonify({'error': error}), 400
+        
+        projection = Projection(Pet, fields, required=('created_at', 'id'))
+        rows, next_cursor, error = PetService.get_user_pet_rows_page(
+            current_user_id, projection.columns, limit, request.args.get('cursor'), tags, match_all
+        )
+        if error:
+            return jsonify({'error': error}), 400
+        
+        payload = {'pets': projection.serialize(rows), 'next_cursor': next_cursor}
+    
+    if tags:
+        payload['tag_counts'] = PetService.count_user_tags(current_user_id, tags)
+    
+    return tag_response(jsonify(payload), etag)
 
 @bp.route('/', methods=['POST'])
 @jwt_required()
@@ -47,8 +95,21 @@ def create_pet():
 @bp.route('/<int:pet_id>', methods=['GET'])
 @jwt_required()
 def get_pet(pet_id):
-    """Get a specific pet by ID"""
+    """Get a specific pet by ID (?fields= selects only some columns)"""
     current_user_id = int(get_jwt_identity())
+    
+    if 'fields' in request.args:
+        is_valid, fields, error = parse_fields(request.args['fields'], Pet)
+        if not is_valid:
+            return jsonify({'error': error}), 400
+        
+        projection = Projection(Pet, fields)
+        row = PetService.get_pet_row(pet_id, current_user_id, projection.columns)
+        if row is None:
+            return jsonify({'error': 'Pet not found'}), 404
+        
+        return jsonify({'pet': projection.serialize([row])[0]}), 200
+    
     pet = PetService.get_pet_by_id(pet_id, current_user_id)
     
     if not pet:
@@ -66,12 +127,9 @@ def update_pet(pet_id):
     if not pet:
         return jsonify({'error': 'Pet not found'}), 404
     
-    # Handle photo upload
+    # Handle photo upload; the service stores it and releases the old photo once committed
     photo_url = None
     if 'photo' in request.files:
-        # Delete old photo
-        if pet.photo_url:
-            FileUploadHelper.delete_photo(pet.photo_url)
         photo_url = FileUploadHelper.save_photo(request.files['photo'])
     
     # Get data
@@ -101,11 +159,7 @@ def delete_pet(pet_id):
     if not pet:
         return jsonify({'error': 'Pet not found'}), 404
     
-    # Delete photo
-    if pet.photo_url:
-        FileUploadHelper.delete_photo(pet.photo_url)
-    
-    # Delete pet using service
+    # Delete pet using service (its photo is released once unreferenced)
     PetService.delete_pet(pet)
     
     return jsonify({'message': 'Pet deleted successfully'}), 200
@@ -1,28 +1,51 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from models.feeding_schedule import FeedingSchedule
 from services.schedule_service import ScheduleService
 from services.pet_service import PetService
+from services.version_service import VersionService
 from middlewares.auth_middleware import verify_schedule_owner
+from utils.validators import validate_date
+from utils.bulk import parse_bulk_payload
+from utils.conditional import make_etag, not_modified, tag_response
+from utils.fields import Projection, list_fields, parse_fields
 
 bp = Blueprint('schedules', __name__, url_prefix='/api')
 
 @bp.route('/pets/<int:pet_id>/schedule', methods=['GET'])
 @jwt_required()
 def get_pet_schedule(pet_id):
-    """Get all feeding schedules for a specific pet"""
+    """Get all feeding schedules for a specific pet (?fields= selects the schedule fields)"""
     current_user_id = int(get_jwt_identity())
     
+    # The version lookup also checks ownership; unchanged data is answered right away
+    version = VersionService.get_pet_version(pet_id, current_user_id)
+    if version is None:
+        return jsonify({'error': 'Pet not found'}), 404
+    
+    etag = make_etag('schedule', pet_id, version)
+    cached = not_modified(etag)
+    if cached:
+        return cached
+    
+    is_valid, fields, error = parse_fields(
+        request.args.get('fields'), FeedingSchedule, list_fields(FeedingSchedule)
+    )
+    if not is_valid:
+        return jsonify({'error': error}), 400
+    
     # Verify pet belongs to user
     pet = PetService.get_pet_by_id(pet_id, current_user_id)
     if not pet:
         return jsonify({'error': 'Pet not found'}), 404
     
-    schedules = ScheduleService.get_pet_schedules(pet_id)
+    projection = Projection(FeedingSchedule, fields)
+    rows = ScheduleService.get_pet_schedule_rows(pet_id, projection.columns)
     
-    return jsonify({
+    return tag_response(jsonify({
         'pet': pet.to_dict(),
-        'schedules': [schedule.to_dict() for schedule in schedules]
-    }), 200
+        'schedules': projection.serialize(rows)
+    }), etag)
 
 @bp.route('/pets/<int:pet_id>/schedule', methods=['POST'])
 @jwt_required()
@@ -31,8 +54,7 @@ def create_schedule(pet_id):
     current_user_id = int(get_jwt_identity())
     
     # Verify pet belongs to user
-    pet = PetService.get_pet_by_id(pet_id, current_user_id)
-    if not pet:
+    if not PetService.owns_pet(pet_id, current_user_id):
         return jsonify({'error': 'Pet not found'}), 404
     
     data = request.get_json()
@@ -48,6 +70,33 @@ def create_schedule(pet_id):
         'schedule': schedule.to_dict()
     }), 201
 
+@bp.route('/pets/<int:pet_id>/schedule/bulk', methods=['POST'])
+@jwt_required()
+def create_schedules_bulk(pet_id):
+    """Create many feeding schedules for a pet in one request"""
+    current_user_id = int(get_jwt_identity())
+    
+    # Verify pet belongs to user
+    if not PetService.owns_pet(pet_id, current_user_id):
+        return jsonify({'error': 'Pet not found'}), 404
+    
+    is_valid, items, error = parse_bulk_payload(
+        request.get_json(silent=True), 'schedules', current_app.config['BULK_MAX_ITEMS']
+    )
+    if not is_valid:
+        return jsonify({'error': error}), 400
+    
+    created_ids, errors = ScheduleService.create_schedules_bulk(pet_id, items)
+    
+    if not created_ids:
+        return jsonify({'error': 'No schedules created', 'errors': errors}), 400
+    
+    return jsonify({
+        'message': f'{len(created_ids)} feeding schedules created',
+        'ids': created_ids,
+        'errors': errors
+    }), 207 if errors else 201
+
 @bp.route('/schedule/<int:schedule_id>', methods=['PUT'])
 @jwt_required()
 @verify_schedule_owner
@@ -78,27 +127,16 @@ def delete_schedule(schedule_id, schedule=None, pet=None):
 @bp.route('/schedule/day/<date>', methods=['GET'])
 @jwt_required()
 def get_schedules_by_day(date):
-    """Get all feeding schedules for a specific day (all user's pets)"""
+    """Get feeding schedules due on a specific day (all user's pets)"""
     current_user_id = int(get_jwt_identity())
     
-    # Get all user's pets
-    user_pets = PetService.get_user_pets(current_user_id)
-    pet_ids = [pet.id for pet in user_pets]
-    
-    # Get all schedules for these pets
-    schedules = ScheduleService.get_schedules_for_user_pets(pet_ids)
-    
-    # Group by pet
-    schedules_by_pet = {}
-    for schedule in schedules:
-        pet = next((p for p in user_pets if p.id == schedule.pet_id), None)
-        if pet:
-            if pet.name not in schedules_by_pet:
-                schedules_by_pet[pet.name] = {
-                    'pet': pet.to_dict(),
-                    'schedules': []
-                }
-            schedules_by_pet[pet.name]['schedules'].append(schedule.to_dict())
+    is_valid, parsed_date, error = validate_date(date, 'Date')
+    if not is_valid:
+        return jsonify({'error': error}), 400
+    
+    # Schedules and their pets in one query, grouped by pet id
+    rows = ScheduleService.get_user_schedules_with_pets(current_user_id)
+    schedules_by_pet = ScheduleService.group_schedules_by_pet(rows, day=parsed_date.date())
     
     return jsonify({
         'date': date,
@@ -115,12 +153,11 @@ def get_schedules_by_month(year, month):
     if month < 1 or month > 12:
         return jsonify({'error': 'Invalid month. Must be 1-12'}), 400
     
-    # Get all user's pets
-    user_pets = PetService.get_user_pets(current_user_id)
-    pet_ids = [pet.id for pet in user_pets]
+    if year < 1 or year > 9999:
+        return jsonify({'error': 'Invalid year'}), 400
     
-    # Get all schedules for these pets
-    schedules = ScheduleService.get_schedules_for_user_pets(pet_ids)
+    # Schedules and their pets in one query
+    rows = ScheduleService.get_user_schedules_with_pets(current_user_id)
     
     # Build response
     result = {
@@ -129,11 +166,14 @@ def get_schedules_by_month(year, month):
         'schedules': []
     }
     
-    for schedule in schedules:
-        pet = next((p for p in user_pets if p.id == schedule.pet_id), None)
-        if pet:
-            schedule_dict = schedule.to_dict()
-            schedule_dict['pet_name'] = pet.name
-            result['schedules'].append(schedule_dict)
+    for schedule, pet in rows:
+        schedule_dict = schedule.to_dict()
+        schedule_dict['pet_name'] = pet.name
+        result['schedules'].append(schedule_dict)
+    
+    # Dated occurrences: ISO date -> schedule ids ordered by feeding time
+    result['days'] = ScheduleService.expand_schedules_for_month(
+        [schedule for schedule, _ in rows], year, month
+    )
     
     return jsonify(result), 200
@@ -0,0 +1,33 @@
+import os
+import re
+from flask import Blueprint, jsonify, send_file, current_app
+from utils.file_helper import FileUploadHelper
+
+bp = Blueprint('uploads', __name__, url_prefix='/uploads')
+
+# Content-addressed photos and their variants: <hh>/<sha256>.<ext>[.<variant>.webp]
+IMMUTABLE_NAME = re.compile(r'^[0-9a-f]{2}/[0-9a-f]{64}\.[a-z0-9.]+$')
+
+@bp.route('/<path:filename>', methods=['GET'])
+def get_upload(filename):
+    """
+    Serve an uploaded photo
+    send_file hands the open file to the server's wsgi.file_wrapper (sendfile
+    under gunicorn, X-Sendfile when USE_X_SENDFILE is set) and answers
+    If-None-Match and Range requests
+    """
+    path = FileUploadHelper.photo_path(f'/uploads/{filename}')
+    if not path or not os.path.isfile(path) or path.endswith(('.part', '.failed', '.lock')):
+        return jsonify({'error': 'File not found'}), 404
+    
+    if IMMUTABLE_NAME.match(filename):
+        # The name is derived from the content, so it can be cached forever
+        response = send_file(
+            path,
+            etag=os.path.basename(filename),
+            max_age=current_app.config['UPLOADS_IMMUTABLE_MAX_AGE']
+        )
+        response.cache_control.immutable = True
+        return response
+    
+    return send_file(path, max_age=current_app.config['UPLOADS_MAX_AGE'])
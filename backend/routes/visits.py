@@ -1,28 +1,71 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from models.vet_visit import VetVisit
 from services.visit_service import VisitService
 from services.pet_service import PetService
+from services.search_service import SearchService
+from services.version_service import VersionService
 from middlewares.auth_middleware import verify_visit_owner
+from utils.pagination import validate_page_size
+from utils.bulk import parse_bulk_payload
+from utils.conditional import make_etag, not_modified, tag_response
+from utils.fields import Projection, list_fields, parse_fields, pick_fields
 
 bp = Blueprint('visits', __name__, url_prefix='/api')
 
 @bp.route('/pets/<int:pet_id>/visits', methods=['GET'])
 @jwt_required()
 def get_pet_visits(pet_id):
-    """Get all vet visits for a specific pet"""
+    """
+    Get all vet visits for a specific pet (paginated when limit or cursor is given)
+    ?fields= selects the visit fields; diagnosis, treatment, medications and
+    notes are only loaded when requested
+    """
     current_user_id = int(get_jwt_identity())
     
+    # The version lookup also checks ownership; unchanged data is answered right away
+    version = VersionService.get_pet_version(pet_id, current_user_id)
+    if version is None:
+        return jsonify({'error': 'Pet not found'}), 404
+    
+    etag = make_etag('visits', pet_id, version)
+    cached = not_modified(etag)
+    if cached:
+        return cached
+    
+    is_valid, fields, error = parse_fields(request.args.get('fields'), VetVisit, list_fields(VetVisit))
+    if not is_valid:
+        return jsonify({'error': error}), 400
+    
     # Verify pet belongs to user
     pet = PetService.get_pet_by_id(pet_id, current_user_id)
     if not pet:
         return jsonify({'error': 'Pet not found'}), 404
     
-    visits = VisitService.get_pet_visits(pet_id)
+    if 'limit' not in request.args and 'cursor' not in request.args:
+        projection = Projection(VetVisit, fields)
+        rows = VisitService.get_pet_visit_rows(pet_id, projection.columns)
+        return tag_response(jsonify({
+            'pet': pet.to_dict(),
+            'visits': projection.serialize(rows)
+        }), etag)
     
-    return jsonify({
+    is_valid, limit, error = validate_page_size(request.args.get('limit'))
+    if not is_valid:
+        return jsonify({'error': error}), 400
+    
+    projection = Projection(VetVisit, fields, required=('visit_date', 'id'))
+    rows, next_cursor, error = VisitService.get_pet_visit_rows_page(
+        pet_id, projection.columns, limit, request.args.get('cursor')
+    )
+    if error:
+        return jsonify({'error': error}), 400
+    
+    return tag_response(jsonify({
         'pet': pet.to_dict(),
-        'visits': [visit.to_dict() for visit in visits]
-    }), 200
+        'visits': projection.serialize(rows),
+        'next_cursor': next_cursor
+    }), etag)
 
 @bp.route('/pets/<int:pet_id>/visits', methods=['POST'])
 @jwt_required()
@@ -31,8 +74,7 @@ def create_visit(pet_id):
     current_user_id = int(get_jwt_identity())
     
     # Verify pet belongs to user
-    pet = PetService.get_pet_by_id(pet_id, current_user_id)
-    if not pet:
+    if not PetService.owns_pet(pet_id, current_user_id):
         return jsonify({'error': 'Pet not found'}), 404
     
     data = request.get_json()
@@ -48,13 +90,73 @@ def create_visit(pet_id):
         'visit': visit.to_dict()
     }), 201
 
+@bp.route('/pets/<int:pet_id>/visits/bulk', methods=['POST'])
+@jwt_required()
+def create_visits_bulk(pet_id):
+    """Create many vet visits for a pet in one request"""
+    current_user_id = int(get_jwt_identity())
+    
+    # Verify pet belongs to user
+    if not PetService.owns_pet(pet_id, current_user_id):
+        return jsonify({'error': 'Pet not found'}), 404
+    
+    is_valid, items, error = parse_bulk_payload(
+        request.get_json(silent=True), 'visits', current_app.config['BULK_MAX_ITEMS']
+    )
+    if not is_valid:
+        return jsonify({'error': error}), 400
+    
+    created_ids, errors = VisitService.create_visits_bulk(pet_id, items)
+    
+    if not created_ids:
+        return jsonify({'error': 'No visits created', 'errors': errors}), 400
+    
+    return jsonify({
+        'message': f'{len(created_ids)} vet visits created',
+        'ids': created_ids,
+        'errors': errors
+    }), 207 if errors else 201
+
+@bp.route('/visits/search', methods=['GET'])
+@jwt_required()
+def search_visits():
+    """
+    Full-text search over the vet visits of the current user's pets
+    ?q= words are matched in reason, diagnosis, treatment, medications and
+    notes, with <mark>-highlighted matches; results of owners with many visits
+    are ranked (score), the others are newest first (score null)
+    """
+    current_user_id = int(get_jwt_identity())
+    
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'Search query is required'}), 400
+    if len(query) > 200:
+        return jsonify({'error': 'Search query must be at most 200 characters'}), 400
+    
+    is_valid, limit, error = validate_page_size(request.args.get('limit'))
+    if not is_valid:
+        return jsonify({'error': error}), 400
+    
+    results = SearchService.search_visits(current_user_id, query, limit)
+    
+    return jsonify({'query': query, 'results': results}), 200
+
 @bp.route('/visits/<int:visit_id>', methods=['GET'])
 @jwt_required()
 @verify_visit_owner
 def get_visit(visit_id, visit=None, pet=None):
-    """Get a specific vet visit by ID"""
+    """
+    Get a specific vet visit by ID
+    ?fields= selects the visit fields; the visit row is already loaded by the
+    ownership check, so this trims the payload rather than the query
+    """
+    is_valid, fields, error = parse_fields(request.args.get('fields'), VetVisit)
+    if not is_valid:
+        return jsonify({'error': error}), 400
+    
     return jsonify({
-        'visit': visit.to_dict(),
+        'visit': pick_fields(visit.to_dict(), fields),
         'pet': pet.to_dict()
     }), 200
 
@@ -2,20 +2,32 @@
 Authentication service - Business logic for user authentication
 """
 from models.user import User
+from flask import current_app
 from flask_jwt_extended import create_access_token
-from utils.validators import validate_email, validate_username, validate_password
+from utils.schema import Schema, password, string
+from utils.hashing_pool import HashingPoolFull, hash_rounds
+
+BUSY_ERROR = 'Authentication service is busy, please retry shortly'
+
+REGISTRATION_SCHEMA = Schema({
+    'username': string('Username', min_length=3, max_length=50, pattern=r'^[a-zA-Z0-9_-]+$',
+                       pattern_error='Username can only contain letters, numbers, underscore and dash'),
+    'email': string('Email', pattern=r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$',
+                    pattern_error='Invalid email format'),
+    'password': password()
+}, required=('username', 'email', 'password'), required_error='Username, email and password are required')
 
 class AuthService:
     
     @staticmethod
     def register_user(data):
         """Register a new user"""
-        from app import db, bcrypt
+        from app import db, bcrypt, hashing_pool
         
         # Validate input
-        errors = AuthService._validate_registration_data(data)
+        _, errors = REGISTRATION_SCHEMA.validate(data)
         if errors:
-            return None, None, errors
+            return None, None, '; '.join(errors)
         
         # Check if user exists
         if User.query.filter_by(username=data['username']).first():
@@ -24,8 +36,11 @@ class AuthService:
         if User.query.filter_by(email=data['email']).first():
             return None, None, 'Email already exists'
         
-        # Hash password
-        password_hash = bcrypt.generate_password_hash(data['password']).decode('utf-8')
+        # Hash password off the request worker
+        try:
+            password_hash = hashing_pool.run(bcrypt.generate_password_hash, data['password']).decode('utf-8')
+        except HashingPoolFull:
+            return None, None, BUSY_ERROR
         
         # Create user
         new_user = User(
@@ -45,7 +60,7 @@ class AuthService:
     @staticmethod
     def login_user(data):
         """Login user and return JWT token"""
-        from app import bcrypt
+        from app import db, bcrypt, hashing_pool
         
         # Validate input
         if not data or not data.get('username') or not data.get('password'):
@@ -57,9 +72,20 @@ class AuthService:
         if not user:
             return None, None, 'Invalid username or password'
         
-        # Check password
-        if not bcrypt.check_password_hash(user.password_hash, data['password']):
-            return None, None, 'Invalid username or password'
+        # Check password off the request worker
+        try:
+            if not hashing_pool.run(bcrypt.check_password_hash, user.password_hash, data['password']):
+                return None, None, 'Invalid username or password'
+        except HashingPoolFull:
+            return None, None, BUSY_ERROR
+        
+        # Upgrade hashes created with a lower cost factor; retried on a later login if busy
+        if hash_rounds(user.password_hash) < current_app.config['BCRYPT_LOG_ROUNDS']:
+            try:
+                user.password_hash = hashing_pool.run(bcrypt.generate_password_hash, data['password']).decode('utf-8')
+                db.session.commit()
+            except HashingPoolFull:
+                pass
         
         # Create token
         access_token = create_access_token(identity=user.id)
@@ -70,26 +96,3 @@ class AuthService:
     def get_user_by_id(user_id):
         """Get user by ID"""
         return User.query.get(user_id)
-    
-    @staticmethod
-    def _validate_registration_data(data):
-        """Validate registration data"""
-        if not data or not data.get('username') or not data.get('email') or not data.get('password'):
-            return 'Username, email and password are required'
-        
-        # Validate username
-        is_valid, error = validate_username(data.get('username'))
-        if not is_valid:
-            return error
-        
-        # Validate email
-        is_valid, error = validate_email(data.get('email'))
-        if not is_valid:
-            return error
-        
-        # Validate password
-        is_valid, error = validate_password(data.get('password'))
-        if not is_valid:
-            return error
-        
-        return None
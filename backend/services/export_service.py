@@ -0,0 +1,112 @@
+"""
+Export service - Streams a user's data as CSV or NDJSON
+"""
+import csv
+import json
+from datetime import datetime, time
+from sqlalchemy import select
+from app import db
+from models.pet import Pet
+from models.feeding_schedule import FeedingSchedule
+from models.vet_visit import VetVisit
+
+# Rows fetched per round trip from the server-side cursor
+YIELD_PER = 1000
+
+# Rows serialized before a chunk is handed to the WSGI server
+CHUNK_ROWS = 500
+
+# Leading characters that make a spreadsheet read a CSV cell as a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+EXPORTS = {
+    'pets': (Pet, [
+        'id', 'name', 'species', 'breed', 'age', 'weight', 'photo_url',
+        'tags', 'notes', 'created_at', 'user_id'
+    ]),
+    'schedules': (FeedingSchedule, [
+        'id', 'pet_id', 'food_type', 'amount', 'time', 'frequency', 'notes', 'created_at'
+    ]),
+    'visits': (VetVisit, [
+        'id', 'pet_id', 'visit_date', 'vet_name', 'clinic_name', 'reason',
+        'diagnosis', 'treatment', 'medications', 'notes', 'created_at'
+    ]),
+}
+
+class _LineWriter:
+    """File-like target that hands each CSV line back instead of buffering it"""
+    def write(self, value):
+        return value
+
+class ExportService:
+
+    @staticmethod
+    def iter_rows(user_id, kind):
+        """
+        Yield (columns, row) tuples for every record of a kind owned by the user
+        Rows come from a server-side cursor, so memory stays flat
+        """
+        model, columns = EXPORTS[kind]
+        statement = select(*[getattr(model, column) for column in columns])
+        if model is Pet:
+            statement = statement.where(Pet.user_id == user_id)
+        else:
+            statement = statement.join(Pet, model.pet_id == Pet.id).where(Pet.user_id == user_id)
+        statement = statement.order_by(model.id).execution_options(yield_per=YIELD_PER)
+        
+        for row in db.session.execute(statement):
+            yield columns, row
+    
+    @staticmethod
+    def stream_ndjson(user_id, kinds):
+        """Yield NDJSON chunks, one object per line tagged with its type"""
+        lines = []
+        for kind in kinds:
+            record_type = kind[:-1]
+            for columns, row in ExportService.iter_rows(user_id, kind):
+                record = {'type': record_type}
+                for column, value in zip(columns, row):
+                    record[column] = ExportService._json_value(column, value)
+                lines.append(json.dumps(record, ensure_ascii=False))
+                if len(lines) >= CHUNK_ROWS:
+                    yield '\n'.join(lines) + '\n'
+                    lines = []
+        if lines:
+            yield '\n'.join(lines) + '\n'
+    
+    @staticmethod
+    def stream_csv(user_id, kind):
+        """Yield CSV chunks with a header row"""
+        writer = csv.writer(_LineWriter())
+        _, columns = EXPORTS[kind]
+        lines = [writer.writerow(columns)]
+        for _, row in ExportService.iter_rows(user_id, kind):
+            lines.append(writer.writerow([ExportService._csv_value(value) for value in row]))
+            if len(lines) >= CHUNK_ROWS:
+                yield ''.join(lines)
+                lines = []
+        if lines:
+            yield ''.join(lines)
+    
+    @staticmethod
+    def _json_value(column, value):
+        """Format a value the way the models' to_dict does"""
+        if column == 'tags':
+            return value.split(',') if value else []
+        return ExportService._format_value(value)
+    
+    @staticmethod
+    def _csv_value(value):
+        """Format a value for a CSV cell; text that would run as a formula is prefixed with '"""
+        value = ExportService._format_value(value)
+        if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+            return "'" + value
+        return value
+    
+    @staticmethod
+    def _format_value(value):
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, time):
+            return value.strftime('%H:%M')
+        return value
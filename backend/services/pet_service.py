@@ -1,50 +1,149 @@
 """
 Pet service - Business logic for pet management
 """
-from app import db
+from app import db, ownership_cache
+from sqlalchemy import func, or_, select, update
 from models.pet import Pet
-from utils.validators import validate_age, validate_weight, validate_string_length
+from models.pet_tag import PetTag
+from utils.validators import validate_tags
+from utils.schema import Schema, number, string, validator
+from utils.pagination import paginate
+from utils.file_helper import FileUploadHelper
+from services.version_service import VersionService
+from services.search_service import SearchService
+
+PET_SCHEMA = Schema({
+    'name': string('Name', min_length=1, max_length=100),
+    'species': string('Species', min_length=1, max_length=50),
+    'age': number('Age', int, maximum=50, maximum_text='50 years'),
+    'weight': number('Weight', float, maximum=500, maximum_text='500kg', positive=True),
+    'tags': validator(validate_tags)
+}, required=('name', 'species'), required_error='Name and species are required')
 
 class PetService:
-    
+
     @staticmethod
     def get_user_pets(user_id):
         """Get all pets for a user"""
         return Pet.query.filter_by(user_id=user_id).all()
     
+    @staticmethod
+    def get_user_pets_page(user_id, limit, cursor=None):
+        """
+        Get one page of a user's pets ordered by (created_at, id)
+        Returns: (pets, next_cursor, error)
+        """
+        query = Pet.query.filter_by(user_id=user_id)
+        return paginate(query, Pet.created_at, Pet.id, limit, cursor)
+    
+    @staticmethod
+    def get_user_pet_rows(user_id, columns, tags=None, match_all=True):
+        """
+        Get only the given columns of a user's pets, as rows (no ORM objects)
+        If tags are given, only pets with all of them (or any, match_all=False) are kept
+        """
+        query = PetService._user_pets_query(user_id, columns, tags, match_all)
+        return query.all()
+    
+    @staticmethod
+    def get_user_pet_rows_page(user_id, columns, limit, cursor=None, tags=None, match_all=True):
+        """
+        Get one page of a user's pets as rows of the given columns
+        The columns must include Pet.created_at and Pet.id (the cursor key)
+        Returns: (rows, next_cursor, error)
+        """
+        query = PetService._user_pets_query(user_id, columns, tags, match_all)
+        return paginate(query, Pet.created_at, Pet.id, limit, cursor)
+    
+    @staticmethod
+    def count_user_tags(user_id, tags):
+        """Number of the user's pets carrying each tag, read from the pet_tags index only"""
+        counts = dict.fromkeys(tags, 0)
+        rows = db.session.execute(
+            select(PetTag.tag, func.count())
+            .where(PetTag.user_id == user_id, PetTag.tag.in_(tags))
+            .group_by(PetTag.tag)
+        )
+        counts.update(tuple(row) for row in rows)
+        return counts
+    
+    @staticmethod
+    def _user_pets_query(user_id, columns, tags, match_all):
+        """Projection query of a user's pets, optionally narrowed to tagged ones"""
+        query = Pet.query.with_entities(*columns).filter(Pet.user_id == user_id)
+        if not tags:
+            return query
+        
+        # Pet ids come from the (user_id, tag, pet_id) index; (pet_id, tag) is
+        # the primary key, so a pet matching every tag appears len(tags) times
+        tagged = select(PetTag.pet_id).where(PetTag.user_id == user_id, PetTag.tag.in_(tags))
+        if match_all and len(tags) > 1:
+            tagged = tagged.group_by(PetTag.pet_id).having(func.count() == len(tags))
+        return query.filter(Pet.id.in_(tagged))
+    
+    @staticmethod
+    def get_pet_row(pet_id, user_id, columns):
+        """Get only the given columns of a user's pet, None if it is not theirs"""
+        row = Pet.query.with_entities(*columns).filter(Pet.id == pet_id, Pet.user_id == user_id).first()
+        if row is not None:
+            ownership_cache.remember_pet(user_id, pet_id)
+        return row
+    
     @staticmethod
     def get_pet_by_id(pet_id, user_id):
         """Get a specific pet by ID for a user"""
-        return Pet.query.filter_by(id=pet_id, user_id=user_id).first()
+        # Primary key lookup through the request's session identity map,
+        # so a pet loaded earlier in the request is not fetched again
+        pet = db.session.get(Pet, pet_id)
+        if pet is None or pet.user_id != user_id:
+            return None
+        
+        ownership_cache.remember_pet(user_id, pet_id)
+        return pet
+    
+    @staticmethod
+    def owns_pet(pet_id, user_id):
+        """
+        Check a user owns a pet without loading it
+        Always asks the database: a cached ownership can outlive a delete made
+        by another worker, and SQLite hands the deleted id to the next pet
+        """
+        owned = db.session.execute(
+            select(Pet.id).where(Pet.id == pet_id, Pet.user_id == user_id)
+        ).first() is not None
+        if owned:
+            ownership_cache.remember_pet(user_id, pet_id)
+        return owned
     
     @staticmethod
     def create_pet(user_id, data, photo_url=None):
         """Create a new pet"""
         # Validate data
-        errors = PetService._validate_pet_data(data, is_create=True)
+        values, errors = PET_SCHEMA.validate(data)
         if errors:
             return None, errors
-        
-        # Handle tags
-        tags = data.get('tags', [])
-        if isinstance(tags, list):
-            tags = ','.join(tags)
+        tags = values.get('tags') or []
         
         # Create pet
         new_pet = Pet(
             name=data.get('name'),
             species=data.get('species'),
             breed=data.get('breed'),
-            age=data.get('age'),
-            weight=data.get('weight'),
+            age=values.get('age'),
+            weight=values.get('weight'),
             photo_url=photo_url,
-            tags=tags,
+            photo_status='pending' if photo_url else None,
+            tags=','.join(tags),
             notes=data.get('notes'),
             user_id=user_id
         )
+        new_pet.tag_links = [PetTag(tag=tag, user_id=user_id) for tag in tags]
         
         db.session.add(new_pet)
+        VersionService.bump_user(user_id)
         db.session.commit()
+        ownership_cache.remember_pet(user_id, new_pet.id)
+        PetService.store_photo(photo_url)
         
         return new_pet, None
     
@@ -52,7 +151,7 @@ class PetService:
     def update_pet(pet, data, photo_url=None):
         """Update an existing pet"""
         # Validate data
-        errors = PetService._validate_pet_data(data, is_create=False)
+        values, errors = PET_SCHEMA.validate(data, partial=True)
         if errors:
             return None, errors
         
@@ -64,63 +163,107 @@ class PetService:
         if 'breed' in data:
             pet.breed = data['breed']
         if 'age' in data:
-            pet.age = data['age']
+            pet.age = values['age']
         if 'weight' in data:
-            pet.weight = data['weight']
+            pet.weight = values['weight']
         if 'notes' in data:
             pet.notes = data['notes']
         if 'tags' in data:
-            tags = data['tags']
-            if isinstance(tags, list):
-                tags = ','.join(tags)
-            pet.tags = tags
-        if photo_url:
+            PetService._set_tags(pet, values['tags'])
+        old_photo_url = pet.photo_url
+        photo_changed = photo_url and old_photo_url != photo_url
+        if photo_changed:
             pet.photo_url = photo_url
+            pet.photo_status = 'pending'
         
+        VersionService.bump_user(pet.user_id)
+        VersionService.bump_pet(pet.id)
         db.session.commit()
         
+        if photo_changed:
+            PetService.store_photo(photo_url)
+            PetService.release_photo(old_photo_url)
+        
         return pet, None
     
     @staticmethod
     def delete_pet(pet):
         """Delete a pet"""
+        pet_id = pet.id
+        photo_url = pet.photo_url
+        SearchService.remove_pet_visits(pet_id)
         db.session.delete(pet)
+        VersionService.bump_user(pet.user_id)
         db.session.commit()
+        ownership_cache.forget_pet(pet_id)
+        PetService.release_photo(photo_url)
         return True
     
     @staticmethod
-    def _validate_pet_data(data, is_create=True):
-        """Validate pet data"""
-        errors = []
-        
-        # Required fields for creation
-        if is_create:
-            if not data.get('name') or not data.get('species'):
-                errors.append('Name and species are required')
-                return errors
-        
-        # Validate name
-        if 'name' in data:
-            is_valid, error = validate_string_length(data.get('name'), 'Name', min_length=1, max_length=100)
-            if not is_valid:
-                errors.append(error)
-        
-        # Validate species
-        if 'species' in data:
-            is_valid, error = validate_string_length(data.get('species'), 'Species', min_length=1, max_length=50)
-            if not is_valid:
-                errors.append(error)
+    def store_photo(photo_url):
+        """
+        Put an uploaded photo in place and queue its variants once its pet is committed
+        (so a concurrent release sees the reference, and the variant outcome
+        always finds the rows it has to update)
+        """
+        if not photo_url:
+            return
         
-        # Validate age
-        if data.get('age'):
-            is_valid, error = validate_age(data.get('age'))
-            if not is_valid:
-                errors.append(error)
+        FileUploadHelper.store_photo(photo_url)
+        state = FileUploadHelper.queue_variants(
+            photo_url, lambda state: PetService.set_photo_status(photo_url, state)
+        )
+        if state != 'pending':
+            PetService.set_photo_status(photo_url, state)
+    
+    @staticmethod
+    def set_photo_status(photo_url, state):
+        """
+        Record the variant state of a photo on every pet using it
+        The state is part of the pet views, so their data versions (ETags) move with it
+        """
+        changed = db.session.execute(
+            select(Pet.id, Pet.user_id)
+            .where(Pet.photo_url == photo_url, or_(Pet.photo_status.is_(None), Pet.photo_status != state))
+        ).all()
+        if not changed:
+            return
         
-        # Validate weight
-        if data.get('weight'):
-            is_valid, error = validate_weight(data.get('weight'))
-            if not is_valid:
-                errors.append(error)
+        db.session.execute(
+            update(Pet).where(Pet.id.in_([pet_id for pet_id, _ in changed]))
+            .values(photo_status=state, data_version=Pet.data_version + 1)
+        )
+        for user_id in {user_id for _, user_id in changed}:
+            VersionService.bump_user(user_id)
+        db.session.commit()
+    
+    @staticmethod
+    def release_photo(photo_url):
+        """
+        Drop a reference to a stored photo
+        Photos are shared by content, so the file is only removed once no pet uses it.
+        References are counted under photo_lock() on a fresh connection, so a
+        pet committed by another request before its photo is stored is always seen
+        """
+        if not photo_url:
+            return
         
-        return errors if errors else None
+        with FileUploadHelper.photo_lock():
+            with db.engine.connect() as connection:
+                used = connection.execute(
+                    select(Pet.id).where(Pet.photo_url == photo_url).limit(1)
+                ).first()
+            if used is None:
+                FileUploadHelper.delete_photo(photo_url)
+    
+    @staticmethod
+    def _set_tags(pet, tags):
+        """Replace a pet's tags, touching only the pet_tags rows that change"""
+        current = {link.tag: link for link in pet.tag_links}
+        for tag, link in current.items():
+            if tag not in tags:
+                pet.tag_links.remove(link)
+        for tag in tags:
+            if tag not in current:
+                pet.tag_links.append(PetTag(tag=tag, user_id=pet.user_id))
+        pet.tags = ','.join(tags)
@@ -1,10 +1,20 @@
 """
 Feeding schedule service - Business logic for feeding schedules
 """
-from app import db
+from app import db, ownership_cache
+from sqlalchemy.orm import joinedload
 from models.feeding_schedule import FeedingSchedule
-from datetime import time
-from utils.validators import validate_time, validate_string_length
+from models.pet import Pet
+from datetime import date, datetime
+from utils.schema import Schema, clock_time, string
+from utils.recurrence import expand_month, is_due_on
+from utils.bulk import insert_many
+from services.version_service import VersionService
+
+SCHEDULE_SCHEMA = Schema({
+    'food_type': string('Food type', min_length=1, max_length=100),
+    'time': clock_time()
+}, required=('food_type', 'time'), required_error='food_type and time are required')
 
 class ScheduleService:
     
@@ -13,54 +23,96 @@ class ScheduleService:
         """Get all schedules for a pet"""
         return FeedingSchedule.query.filter_by(pet_id=pet_id).all()
     
+    @staticmethod
+    def get_pet_schedule_rows(pet_id, columns):
+        """Get only the given columns of a pet's schedules, as rows (no ORM objects)"""
+        return FeedingSchedule.query.with_entities(*columns) \
+            .filter(FeedingSchedule.pet_id == pet_id) \
+            .all()
+    
+    @staticmethod
+    def get_schedule_with_pet(schedule_id):
+        """Get a schedule and its pet in one joined query (identity map first)"""
+        return db.session.get(FeedingSchedule, schedule_id, options=[joinedload(FeedingSchedule.pet, innerjoin=True)])
+    
     @staticmethod
     def create_schedule(pet_id, data):
         """Create a new feeding schedule"""
         # Validate data
-        errors = ScheduleService._validate_schedule_data(data)
+        values, errors = SCHEDULE_SCHEMA.validate(data)
         if errors:
-            return None, errors
-        
-        # Parse time
-        time_str = data.get('time')
-        hour, minute = map(int, time_str.split(':'))
-        feeding_time = time(hour, minute)
+            return None, '; '.join(errors)
         
         # Create schedule
         new_schedule = FeedingSchedule(
             pet_id=pet_id,
             food_type=data.get('food_type'),
             amount=data.get('amount'),
-            time=feeding_time,
+            time=values['time'],
             frequency=data.get('frequency'),
             notes=data.get('notes')
         )
         
         db.session.add(new_schedule)
+        VersionService.bump_pet(pet_id)
         db.session.commit()
+        ownership_cache.remember_schedule(new_schedule.id, pet_id)
         
         return new_schedule, None
     
+    @staticmethod
+    def create_schedules_bulk(pet_id, items):
+        """
+        Create many feeding schedules in a single transaction
+        Every record is validated first; invalid ones are reported, valid ones inserted
+        Returns: (created_ids, errors) where errors is a list of {'index', 'error'}
+        """
+        valid, errors = SCHEDULE_SCHEMA.validate_many(items, 'Each schedule must be an object')
+        created_at = datetime.utcnow()
+        
+        rows = []
+        for index, values in valid:
+            data = items[index]
+            rows.append({
+                'pet_id': pet_id,
+                'food_type': data.get('food_type'),
+                'amount': data.get('amount'),
+                'time': values['time'],
+                'frequency': data.get('frequency'),
+                'notes': data.get('notes'),
+                'created_at': created_at
+            })
+        
+        if not rows:
+            return [], errors
+        
+        created_ids = insert_many(db.session, FeedingSchedule.__table__, rows)
+        VersionService.bump_pet(pet_id)
+        db.session.commit()
+        
+        return created_ids, errors
+    
     @staticmethod
     def update_schedule(schedule, data):
         """Update a schedule"""
+        # Validate data
+        values, errors = SCHEDULE_SCHEMA.validate(data, partial=True)
+        if errors:
+            return None, '; '.join(errors)
+        
         # Update fields if provided
         if 'food_type' in data:
             schedule.food_type = data['food_type']
         if 'amount' in data:
             schedule.amount = data['amount']
         if 'time' in data:
-            is_valid, error = validate_time(data['time'])
-            if not is_valid:
-                return None, error
-            time_str = data['time']
-            hour, minute = map(int, time_str.split(':'))
-            schedule.time = time(hour, minute)
+            schedule.time = values['time']
         if 'frequency' in data:
             schedule.frequency = data['frequency']
         if 'notes' in data:
             schedule.notes = data['notes']
         
+        VersionService.bump_pet(schedule.pet_id)
         db.session.commit()
         
         return schedule, None
@@ -68,8 +120,11 @@ class ScheduleService:
     @staticmethod
     def delete_schedule(schedule):
         """Delete a schedule"""
+        schedule_id = schedule.id
         db.session.delete(schedule)
+        VersionService.bump_pet(schedule.pet_id)
         db.session.commit()
+        ownership_cache.forget_schedule(schedule_id)
         return True
     
     @staticmethod
@@ -78,19 +133,44 @@ class ScheduleService:
         return FeedingSchedule.query.filter(FeedingSchedule.pet_id.in_(pet_ids)).all()
     
     @staticmethod
-    def _validate_schedule_data(data):
-        """Validate schedule data"""
-        if not data.get('food_type') or not data.get('time'):
-            return 'food_type and time are required'
-        
-        # Validate food_type
-        is_valid, error = validate_string_length(data.get('food_type'), 'Food type', min_length=1, max_length=100)
-        if not is_valid:
-            return error
-        
-        # Validate time
-        is_valid, error = validate_time(data.get('time'))
-        if not is_valid:
-            return error
-        
-        return None
+    def get_user_schedules_with_pets(user_id):
+        """Get (schedule, pet) pairs for all user's pets in a single joined query"""
+        return db.session.query(FeedingSchedule, Pet) \
+            .join(Pet, FeedingSchedule.pet_id == Pet.id) \
+            .filter(Pet.user_id == user_id) \
+            .order_by(FeedingSchedule.time, FeedingSchedule.id) \
+            .all()
+    
+    @staticmethod
+    def group_schedules_by_pet(rows, day=None):
+        """
+        Group (schedule, pet) pairs by pet id
+        If day is given, only schedules due on that date are kept
+        """
+        grouped = {}
+        for schedule, pet in rows:
+            if day is not None and not is_due_on(schedule.frequency, ScheduleService._anchor(schedule, day), day):
+                continue
+            group = grouped.get(pet.id)
+            if group is None:
+                group = grouped[pet.id] = {
+                    'pet': pet.to_dict(),
+                    'schedules': []
+                }
+            group['schedules'].append(schedule.to_dict())
+        return grouped
+    
+    @staticmethod
+    def expand_schedules_for_month(schedules, year, month):
+        """Expand schedules into dated occurrences for a month"""
+        month_start = date(year, month, 1)
+        entries = [
+            (schedule.id, schedule.time, schedule.frequency, ScheduleService._anchor(schedule, month_start))
+            for schedule in schedules
+        ]
+        return expand_month(entries, year, month)
+    
+    @staticmethod
+    def _anchor(schedule, default):
+        """Date that fixes the phase of every-other-day and weekly schedules"""
+        return schedule.created_at.date() if schedule.created_at else default
@@ -0,0 +1,197 @@
+"""
+Search service - Full-text search over vet visits
+"""
+import html
+import re
+from flask import current_app
+from app import db
+from sqlalchemy import column, func, insert, literal, literal_column, or_, select, table
+from models.pet import Pet
+from models.vet_visit import VetVisit, VISIT_SEARCH_TABLE, VISIT_SEARCH_COLUMNS
+from utils.fields import Projection, list_fields
+
+visit_search = table(
+    VISIT_SEARCH_TABLE,
+    column(VISIT_SEARCH_TABLE),  # hidden column taking FTS5 commands
+    column('rowid'),
+    *(column(name) for name in VISIT_SEARCH_COLUMNS)
+)
+
+# Column weights for bm25(): reason first
+SEARCH_WEIGHTS = (4.0, 2.0, 2.0, 2.0, 1.0)
+
+# snippet() markers; the text is HTML-escaped before they become <mark> tags
+MARK_START, MARK_END = '\x02', '\x03'
+
+WORD = re.compile(r'\w+', re.UNICODE)
+
+class SearchService:
+    """
+    Maintains and queries the vet_visits_fts index
+    
+    Index writes join the caller's transaction, so a visit and its index
+    entry are committed (or rolled back) together. On databases without
+    FTS5 the writes are skipped and every search is a scan.
+    """
+    
+    @staticmethod
+    def enabled():
+        return db.engine.dialect.name == 'sqlite'
+    
+    @staticmethod
+    def index_visits(visits):
+        """Add visits to the index; visits are dicts or objects with the visit columns"""
+        if not SearchService.enabled() or not visits:
+            return
+        
+        rows = []
+        for visit in visits:
+            if isinstance(visit, dict):
+                row = {name: visit.get(name) for name in VISIT_SEARCH_COLUMNS}
+                row['rowid'] = visit['id']
+            else:
+                row = {name: getattr(visit, name) for name in VISIT_SEARCH_COLUMNS}
+                row['rowid'] = visit.id
+            rows.append(row)
+        db.session.execute(insert(visit_search), rows)
+    
+    @staticmethod
+    def reindex_visit(visit):
+        """Replace the index entry of an updated visit (before its changes are flushed)"""
+        SearchService.remove_visits([visit.id])
+        SearchService.index_visits([visit])
+    
+    @staticmethod
+    def remove_visits(visit_ids):
+        """Drop the index entries of visits (before their deletion is flushed)"""
+        if visit_ids:
+            SearchService._unindex(VetVisit.id.in_(visit_ids))
+    
+    @staticmethod
+    def remove_pet_visits(pet_id):
+        """Drop the index entries of every visit of a pet (before the pet is deleted)"""
+        SearchService._unindex(VetVisit.pet_id == pet_id)
+    
+    @staticmethod
+    def _unindex(condition):
+        """
+        Send FTS5 'delete' commands for the visits matching condition
+        An external-content index has to be given the text it indexed, so it
+        is read from vet_visits without flushing pending changes to the rows
+        """
+        if not SearchService.enabled():
+            return
+        
+        indexed = select(literal('delete'), VetVisit.id, *(getattr(VetVisit, name) for name in VISIT_SEARCH_COLUMNS))
+        with db.session.no_autoflush:
+            db.session.execute(insert(visit_search).from_select(
+                [VISIT_SEARCH_TABLE, 'rowid', *VISIT_SEARCH_COLUMNS], indexed.where(condition)
+            ))
+    
+    @staticmethod
+    def build_query(text):
+        """
+        Turn free text into an FTS5 query: every word must match, the last one
+        as a prefix so results keep up with typing (prefix terms on every word
+        would make FTS5 merge the posting lists of all their completions)
+        Returns: the query string, or None if the text has no words
+        """
+        words = WORD.findall(text or '')
+        if not words:
+            return None
+        return ' '.join(f'"{word}"' for word in words) + '*'
+    
+    @staticmethod
+    def search_visits(user_id, text, limit):
+        """
+        Best matching visits of the user's pets
+        A full-text query costs as much as its matches across the whole index,
+        so owners with up to SEARCH_SCAN_MAX_VISITS visits are scanned instead
+        (newest first, unscored); larger owners get bm25-ranked results
+        Returns: list of {'visit', 'score', 'highlights'} dicts
+        """
+        match = SearchService.build_query(text)
+        if match is None:
+            return []
+        
+        if not SearchService.enabled() or SearchService._has_few_visits(user_id):
+            return SearchService._search_scan(user_id, text, limit)
+        
+        projection = Projection(VetVisit, list_fields(VetVisit))
+        fts = literal_column(VISIT_SEARCH_TABLE)
+        # Labelled so ORDER BY reuses the value instead of scoring every match twice
+        score = func.bm25(fts, *SEARCH_WEIGHTS).label('score')
+        snippets = [
+            func.snippet(fts, index, MARK_START, MARK_END, '…', 16)
+            for index in range(len(VISIT_SEARCH_COLUMNS))
+        ]
+        # Unary + keeps the owned rowids from becoming an index constraint, which
+        # would make SQLite run the MATCH once per owned visit; this way the
+        # query runs once and its matches are checked against the owned set
+        owned = select(VetVisit.id).join(Pet, Pet.id == VetVisit.pet_id).where(Pet.user_id == user_id)
+        statement = select(*projection.columns, score, *snippets) \
+            .select_from(visit_search) \
+            .join(VetVisit, VetVisit.id == visit_search.c.rowid) \
+            .where(fts.op('MATCH')(match), literal_column(f'+{VISIT_SEARCH_TABLE}.rowid').in_(owned)) \
+            .order_by(score) \
+            .limit(limit)
+        rows = db.session.execute(statement).all()
+        
+        width = len(projection.columns)
+        visits = projection.serialize(rows)
+        results = []
+        for visit, row in zip(visits, rows):
+            highlights = {
+                name: SearchService._highlight(snippet)
+                for name, snippet in zip(VISIT_SEARCH_COLUMNS, row[width + 1:])
+                if snippet and MARK_START in snippet
+            }
+            results.append({'visit': visit, 'score': -row[width], 'highlights': highlights})
+        return results
+    
+    @staticmethod
+    def _has_few_visits(user_id):
+        """Whether the user's pets have at most SEARCH_SCAN_MAX_VISITS visits, counting no further"""
+        maximum = current_app.config['SEARCH_SCAN_MAX_VISITS']
+        owned = select(VetVisit.id).join(Pet, Pet.id == VetVisit.pet_id) \
+            .where(Pet.user_id == user_id).limit(maximum + 1).subquery()
+        return db.session.execute(select(func.count()).select_from(owned)).scalar() <= maximum
+    
+    @staticmethod
+    def _highlight(snippet):
+        """HTML-escape a snippet and turn its markers into <mark> tags"""
+        return html.escape(snippet).replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
+    
+    @staticmethod
+    def _search_scan(user_id, text, limit):
+        """
+        Substring search over the user's visits, newest first
+        Used for small owners and on databases without FTS5; words are
+        highlighted like the index does, the last one as a prefix
+        """
+        words = WORD.findall(text)
+        # The text columns are read for highlighting even when not returned (notes)
+        projection = Projection(VetVisit, list_fields(VetVisit), required=VISIT_SEARCH_COLUMNS)
+        query = VetVisit.query.with_entities(*projection.columns) \
+            .join(Pet, Pet.id == VetVisit.pet_id) \
+            .filter(Pet.user_id == user_id)
+        for word in words:
+            pattern = f'%{word}%'
+            query = query.filter(or_(*(
+                getattr(VetVisit, name).ilike(pattern) for name in VISIT_SEARCH_COLUMNS
+            )))
+        rows = query.order_by(VetVisit.visit_date.desc()).limit(limit).all()
+        
+        terms = [re.escape(word) + r'\b' for word in words[:-1]] + [re.escape(words[-1]) + r'\w*']
+        pattern = re.compile(r'\b(?:' + '|'.join(terms) + ')', re.IGNORECASE)
+        positions = {column.key: index for index, column in enumerate(projection.columns)}
+        results = []
+        for visit, row in zip(projection.serialize(rows), rows):
+            highlights = {}
+            for name in VISIT_SEARCH_COLUMNS:
+                value = row[positions[name]]
+                marked = pattern.sub(lambda found: MARK_START + found.group(0) + MARK_END, value or '')
+                if MARK_START in marked:
+                    highlights[name] = SearchService._highlight(marked)
+            results.append({'visit': visit, 'score': None, 'highlights': highlights})
+        return results
@@ -0,0 +1,44 @@
+"""
+Data version service - Monotonic change counters behind conditional GETs
+"""
+from app import db
+from sqlalchemy import select, update
+from models.user import User
+from models.pet import Pet
+
+class VersionService:
+    """
+    Per-user and per-pet data versions
+    
+    Counters live in the users / pets rows and are bumped in the same
+    transaction as the change they describe, so every worker process sees
+    the same version. Reading one is a single primary key lookup.
+    """
+    
+    @staticmethod
+    def bump_user(user_id):
+        """Mark the user's pet list as changed (committed by the caller)"""
+        db.session.execute(
+            update(User).where(User.id == user_id).values(data_version=User.data_version + 1)
+        )
+    
+    @staticmethod
+    def bump_pet(pet_id):
+        """Mark a pet, its schedules or visits as changed (committed by the caller)"""
+        db.session.execute(
+            update(Pet).where(Pet.id == pet_id).values(data_version=Pet.data_version + 1)
+        )
+    
+    @staticmethod
+    def get_user_version(user_id):
+        """Current version of a user's pet list, None if the user does not exist"""
+        return db.session.execute(
+            select(User.data_version).where(User.id == user_id)
+        ).scalar()
+    
+    @staticmethod
+    def get_pet_version(pet_id, user_id):
+        """Current version of a pet, None if it does not exist or is not the user's"""
+        return db.session.execute(
+            select(Pet.data_version).where(Pet.id == pet_id, Pet.user_id == user_id)
+        ).scalar()
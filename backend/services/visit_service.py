@@ -1,30 +1,72 @@
 """
 Vet visit service - Business logic for vet visits
 """
-from app import db
+from app import db, ownership_cache
+from sqlalchemy.orm import joinedload
 from models.vet_visit import VetVisit
 from datetime import datetime
-from utils.validators import validate_date, validate_future_date, validate_string_length
+from utils.schema import Schema, past_datetime, string
+from utils.pagination import paginate
+from utils.bulk import insert_many
+from services.version_service import VersionService
+from services.search_service import SearchService
+
+VISIT_SCHEMA = Schema({
+    'reason': string('Reason', min_length=1, max_length=200),
+    'visit_date': past_datetime('Visit date')
+}, required=('visit_date', 'reason'), required_error='visit_date and reason are required')
 
 class VisitService:
-    
+
     @staticmethod
     def get_pet_visits(pet_id):
         """Get all visits for a pet"""
         return VetVisit.query.filter_by(pet_id=pet_id).order_by(VetVisit.visit_date.desc()).all()
     
+    @staticmethod
+    def get_pet_visits_page(pet_id, limit, cursor=None):
+        """
+        Get one page of a pet's visits, newest first, ordered by (visit_date, id)
+        Returns: (visits, next_cursor, error)
+        """
+        query = VetVisit.query.filter_by(pet_id=pet_id)
+        return paginate(query, VetVisit.visit_date, VetVisit.id, limit, cursor, descending=True)
+    
+    @staticmethod
+    def get_pet_visit_rows(pet_id, columns):
+        """Get only the given columns of a pet's visits, newest first, as rows (no ORM objects)"""
+        return VetVisit.query.with_entities(*columns) \
+            .filter(VetVisit.pet_id == pet_id) \
+            .order_by(VetVisit.visit_date.desc()) \
+            .all()
+    
+    @staticmethod
+    def get_pet_visit_rows_page(pet_id, columns, limit, cursor=None):
+        """
+        Get one page of a pet's visits as rows of the given columns
+        The columns must include VetVisit.visit_date and VetVisit.id (the cursor key)
+        Returns: (rows, next_cursor, error)
+        """
+        query = VetVisit.query.with_entities(*columns).filter(VetVisit.pet_id == pet_id)
+        return paginate(query, VetVisit.visit_date, VetVisit.id, limit, cursor, descending=True)
+    
+    @staticmethod
+    def get_visit_with_pet(visit_id):
+        """Get a visit and its pet in one joined query (identity map first)"""
+        return db.session.get(VetVisit, visit_id, options=[joinedload(VetVisit.pet, innerjoin=True)])
+    
     @staticmethod
     def create_visit(pet_id, data):
         """Create a new vet visit"""
         # Validate data
-        visit_date, errors = VisitService._validate_visit_data(data)
+        values, errors = VISIT_SCHEMA.validate(data)
         if errors:
-            return None, errors
+            return None, '; '.join(errors)
         
         # Create visit
         new_visit = VetVisit(
             pet_id=pet_id,
-            visit_date=visit_date,
+            visit_date=values['visit_date'],
             vet_name=data.get('vet_name'),
             clinic_name=data.get('clinic_name'),
             reason=data.get('reason'),
@@ -35,26 +77,63 @@ class VisitService:
         )
         
         db.session.add(new_visit)
+        db.session.flush()
+        SearchService.index_visits([new_visit])
+        VersionService.bump_pet(pet_id)
         db.session.commit()
+        ownership_cache.remember_visit(new_visit.id, pet_id)
         
         return new_visit, None
     
+    @staticmethod
+    def create_visits_bulk(pet_id, items):
+        """
+        Create many vet visits in a single transaction
+        Every record is validated first; invalid ones are reported, valid ones inserted
+        Returns: (created_ids, errors) where errors is a list of {'index', 'error'}
+        """
+        valid, errors = VISIT_SCHEMA.validate_many(items, 'Each visit must be an object')
+        created_at = datetime.utcnow()
+        
+        rows = []
+        for index, values in valid:
+            data = items[index]
+            rows.append({
+                'pet_id': pet_id,
+                'visit_date': values['visit_date'],
+                'vet_name': data.get('vet_name'),
+                'clinic_name': data.get('clinic_name'),
+                'reason': data.get('reason'),
+                'diagnosis': data.get('diagnosis'),
+                'treatment': data.get('treatment'),
+                'medications': data.get('medications'),
+                'notes': data.get('notes'),
+                'created_at': created_at
+            })
+        
+        if not rows:
+            return [], errors
+        
+        created_ids = insert_many(db.session, VetVisit.__table__, rows)
+        for row, visit_id in zip(rows, created_ids):
+            row['id'] = visit_id
+        SearchService.index_visits(rows)
+        VersionService.bump_pet(pet_id)
+        db.session.commit()
+        
+        return created_ids, errors
+    
     @staticmethod
     def update_visit(visit, data):
         """Update a visit"""
-        # Validate visit_date if provided
-        if 'visit_date' in data:
-            is_valid, visit_date, error = validate_date(data['visit_date'], 'Visit date')
-            if not is_valid:
-                return None, error
-            
-            is_valid, error = validate_future_date(visit_date, 'Visit date')
-            if not is_valid:
-                return None, error
-            
-            visit.visit_date = visit_date
+        # Validate data
+        values, errors = VISIT_SCHEMA.validate(data, partial=True)
+        if errors:
+            return None, '; '.join(errors)
         
-        # Update other fields
+        # Update fields if provided
+        if 'visit_date' in data:
+            visit.visit_date = values['visit_date']
         if 'vet_name' in data:
             visit.vet_name = data['vet_name']
         if 'clinic_name' in data:
@@ -70,6 +149,8 @@ class VisitService:
         if 'notes' in data:
             visit.notes = data['notes']
         
+        SearchService.reindex_visit(visit)
+        VersionService.bump_pet(visit.pet_id)
         db.session.commit()
         
         return visit, None
@@ -77,29 +158,10 @@ class VisitService:
     @staticmethod
     def delete_visit(visit):
         """Delete a visit"""
+        visit_id = visit.id
         db.session.delete(visit)
+        SearchService.remove_visits([visit_id])
+        VersionService.bump_pet(visit.pet_id)
         db.session.commit()
+        ownership_cache.forget_visit(visit_id)
         return True
-    
-    @staticmethod
-    def _validate_visit_data(data):
-        """Validate visit data"""
-        if not data.get('visit_date') or not data.get('reason'):
-            return None, 'visit_date and reason are required'
-        
-        # Validate reason
-        is_valid, error = validate_string_length(data.get('reason'), 'Reason', min_length=1, max_length=200)
-        if not is_valid:
-            return None, error
-        
-        # Validate visit_date
-        is_valid, visit_date, error = validate_date(data.get('visit_date'), 'Visit date')
-        if not is_valid:
-            return None, error
-        
-        # Check if not in future
-        is_valid, error = validate_future_date(visit_date, 'Visit date')
-        if not is_valid:
-            return None, error
-        
-        return visit_date, None
@@ -0,0 +1,66 @@
+"""
+Integration tests for Export endpoints
+Testing streaming CSV / NDJSON export through API
+"""
+import pytest
+import csv
+import io
+import json
+from flask_jwt_extended import create_access_token
+
+class TestExportEndpoints:
+    """Test cases for export API endpoints"""
+    
+    def get_auth_headers(self, app, user_id):
+        """Helper to get authorization headers"""
+        with app.app_context():
+            token = create_access_token(identity=str(user_id))
+        return {'Authorization': f'Bearer {token}'}
+    
+    def test_export_all_ndjson_and_visits_csv(self, client, app, sample_user, sample_pet):
+        """Test GET /api/export/<kind> streams the user's records"""
+        headers = self.get_auth_headers(app, sample_user.id)
+        client.post(f'/api/pets/{sample_pet.id}/visits',
+            json={'visit_date': '2024-01-10T10:00:00', 'reason': 'Checkup, yearly'},
+            headers=headers
+        )
+        client.post(f'/api/pets/{sample_pet.id}/schedule',
+            json={'food_type': 'Kibble', 'time': '08:00'},
+            headers=headers
+        )
+        
+        response = client.get('/api/export/all', headers=headers)
+        
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+        records = [json.loads(line) for line in response.data.decode().splitlines()]
+        assert [r['type'] for r in records] == ['pet', 'schedule', 'visit']
+        assert records[1]['time'] == '08:00'
+        
+        response = client.get('/api/export/visits?format=csv', headers=headers)
+        
+        lines = response.data.decode().splitlines()
+        assert lines[0].startswith('id,pet_id,visit_date')
+        assert '"Checkup, yearly"' in lines[1]
+        assert len(lines) == 2
+    
+    def test_csv_export_neutralizes_formulas(self, client, app, sample_user, sample_pet):
+        """Test CSV cells starting like a spreadsheet formula are prefixed with ' and NDJSON is untouched"""
+        headers = self.get_auth_headers(app, sample_user.id)
+        client.post(f'/api/pets/{sample_pet.id}/visits',
+            json={'visit_date': '2024-01-10T10:00:00', 'reason': '=HYPERLINK("http://evil.example")',
+                  'notes': '@SUM(A1)', 'diagnosis': '-2+3', 'treatment': 'Rest, +fluids'},
+            headers=headers
+        )
+        
+        response = client.get('/api/export/visits?format=csv', headers=headers)
+        
+        rows = list(csv.DictReader(io.StringIO(response.data.decode())))
+        assert rows[0]['reason'] == "'=HYPERLINK(\"http://evil.example\")"
+        assert rows[0]['notes'] == "'@SUM(A1)"
+        assert rows[0]['diagnosis'] == "'-2+3"
+        assert rows[0]['treatment'] == 'Rest, +fluids'
+        assert rows[0]['id'].isdigit()
+        
+        records = [json.loads(line) for line in client.get('/api/export/visits', headers=headers).data.decode().splitlines()]
+        assert records[0]['reason'] == '=HYPERLINK("http://evil.example")'
@@ -0,0 +1,87 @@
+"""
+Integration tests for Metrics endpoint
+Testing the Prometheus scrape output
+"""
+import pytest
+from flask_jwt_extended import create_access_token
+from prometheus_client.parser import text_string_to_metric_families
+from app import create_app, db
+from config import Config
+
+class MetricsConfig(Config):
+    METRICS_ENABLED = True
+    METRICS_TOKEN = None
+
+@pytest.fixture
+def app():
+    """Test application with the metrics endpoint enabled"""
+    app = create_app(MetricsConfig)
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+class TestMetricsEndpoints:
+    """Test cases for the /metrics endpoint"""
+    
+    def get_auth_headers(self, app, user_id):
+        """Helper to get authorization headers"""
+        with app.app_context():
+            token = create_access_token(identity=str(user_id))
+        return {'Authorization': f'Bearer {token}'}
+    
+    def scrape(self, client):
+        """Helper to parse /metrics into {(name, labels): value}"""
+        response = client.get('/metrics')
+        assert response.status_code == 200
+        assert response.mimetype == 'text/plain'
+        return {
+            (sample.name, tuple(sorted(sample.labels.items()))): sample.value
+            for family in text_string_to_metric_families(response.get_data(as_text=True))
+            for sample in family.samples
+        }
+    
+    def test_metrics_count_requests_by_endpoint_and_status(self, client, app, sample_user):
+        """Test /metrics exposes request counts, latency histograms, in-flight and pool gauges"""
+        headers = self.get_auth_headers(app, sample_user.id)
+        ok = ('petcare_http_requests_total', (('endpoint', 'pets.get_pets'), ('method', 'GET'), ('status', '2xx')))
+        denied = ('petcare_http_requests_total', (('endpoint', 'pets.get_pets'), ('method', 'GET'), ('status', '4xx')))
+        latency = ('petcare_http_request_duration_seconds_count', (('endpoint', 'pets.get_pets'), ('method', 'GET')))
+        before = self.scrape(client)
+        
+        client.get('/api/pets/', headers=headers)
+        client.get('/api/pets/', headers=headers)
+        client.get('/api/pets/')
+        
+        after = self.scrape(client)
+        assert after[ok] - before.get(ok, 0) == 2
+        assert after[denied] - before.get(denied, 0) == 1
+        assert after[latency] - before.get(latency, 0) == 3
+        assert after[('petcare_http_requests_in_flight', (('endpoint', 'pets.get_pets'),))] == 0
+        assert after[('petcare_db_pool_checked_out', (('engine', 'primary'),))] >= 0
+        assert ('petcare_bcrypt_pending', ()) in after
+        # The scrape endpoint does not record itself
+        assert not any(labels and labels[0] == ('endpoint', 'metrics.get_metrics') for _, labels in after)
+    
+    def test_metrics_require_configured_token(self, client, app):
+        """Test a configured METRICS_TOKEN must be sent as a bearer token"""
+        app.config['METRICS_TOKEN'] = 'scrape-secret'
+        
+        assert client.get('/metrics').status_code == 401
+        assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 401
+        response = client.get('/metrics', headers={'Authorization': 'Bearer scrape-secret'})
+        assert response.status_code == 200
+    
+    def test_metrics_disabled_by_default(self):
+        """Test /metrics is not served unless METRICS_ENABLED is set"""
+        class DefaultConfig(Config):
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+        
+        assert DefaultConfig.METRICS_ENABLED is False
+        app = create_app(DefaultConfig)
+        
+        assert app.test_client().get('/metrics').status_code == 404
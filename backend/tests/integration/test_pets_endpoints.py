@@ -4,6 +4,7 @@ Testing complete pet management flow through API
 """
 import pytest
 import json
+from flask.json.provider import DefaultJSONProvider
 from flask_jwt_extended import create_access_token
 
 class TestPetsEndpoints:
@@ -34,3 +35,156 @@ class TestPetsEndpoints:
         data = json.loads(response.data)
         assert data['pet']['name'] == 'Rex'
         assert data['pet']['species'] == 'Dog'
+    
+    def test_get_pets_cursor_pagination(self, client, app, sample_user):
+        """Test GET /api/pets with limit and cursor walks every pet once"""
+        headers = self.get_auth_headers(app, sample_user.id)
+        for name in ['Rex', 'Luna', 'Milo']:
+            client.post('/api/pets/', json={'name': name, 'species': 'Dog'}, headers=headers)
+        
+        first = client.get('/api/pets/?limit=2', headers=headers).get_json()
+        second = client.get(f'/api/pets/?limit=2&cursor={first["next_cursor"]}', headers=headers).get_json()
+        
+        assert [pet['name'] for pet in first['pets']] == ['Rex', 'Luna']
+        assert [pet['name'] for pet in second['pets']] == ['Milo']
+        assert second['next_cursor'] is None
+        assert 'next_cursor' not in client.get('/api/pets/', headers=headers).get_json()
+    
+    def test_shared_photo_is_stored_once_and_kept_while_referenced(self, client, app, sample_user, tmp_path):
+        """Test identical uploads share one file, named by its format, that is removed with its last pet"""
+        import io
+        import os
+        from PIL import Image
+        from app import image_pipeline
+        from utils.file_helper import FileUploadHelper
+        
+        app.config['UPLOAD_FOLDER'] = str(tmp_path)
+        app.config['IMAGE_WORKERS'] = 0
+        image_pipeline.init_app(app)
+        headers = self.get_auth_headers(app, sample_user.id)
+        photo = io.BytesIO()
+        Image.new('RGB', (40, 30), 'blue').save(photo, 'PNG')
+        
+        pets = []
+        for filename in ['rex.png', 'luna.JPG']:
+            response = client.post('/api/pets/',
+                data={'name': 'Rex', 'species': 'Dog', 'photo': (io.BytesIO(photo.getvalue()), filename)},
+                headers=headers,
+                content_type='multipart/form-data'
+            )
+            pets.append(response.get_json()['pet'])
+        
+        assert pets[0]['photo_url'] == pets[1]['photo_url']
+        assert pets[0]['photo_url'].endswith('.png')
+        assert not [name for name in os.listdir(tmp_path) if name.endswith('.part')]
+        with app.test_request_context():
+            path = FileUploadHelper.photo_path(pets[0]['photo_url'])
+        
+        client.delete(f'/api/pets/{pets[0]["id"]}', headers=headers)
+        assert os.path.exists(path)
+        
+        client.delete(f'/api/pets/{pets[1]["id"]}', headers=headers)
+        assert not os.path.exists(path)
+        assert os.listdir(os.path.dirname(path)) == []
+    
+    def test_photo_variants_exposed_in_pet(self, client, app, sample_user, tmp_path):
+        """Test uploaded photos get thumbnail and web variants listed in the pet"""
+        import io
+        from PIL import Image
+        from app import image_pipeline
+        
+        app.config['UPLOAD_FOLDER'] = str(tmp_path)
+        app.config['IMAGE_WORKERS'] = 0
+        image_pipeline.init_app(app)
+        headers = self.get_auth_headers(app, sample_user.id)
+        
+        photo = io.BytesIO()
+        Image.new('RGB', (2000, 1000), 'orange').save(photo, 'PNG')
+        photo.seek(0)
+        
+        response = client.post('/api/pets/',
+            data={'name': 'Rex', 'species': 'Dog', 'photo': (photo, 'rex.png')},
+            headers=headers,
+            content_type='multipart/form-data'
+        )
+        
+        variants = response.get_json()['pet']['photo_variants']
+        assert variants['status'] == 'ready'
+        thumb_path = tmp_path / variants['thumb'][len('/uploads/'):]
+        web_path = tmp_path / variants['web'][len('/uploads/'):]
+        assert Image.open(thumb_path).size == (160, 160)
+        assert Image.open(web_path).size == (1280, 640)
+    
+    def test_pending_photo_views_are_tagged_until_variants_are_recorded(self, client, app, sample_user, sample_pet):
+        """Test views of a pet with pending variants carry an ETag that the finished state invalidates"""
+        from app import db
+        from services.pet_service import PetService
+        
+        sample_pet.photo_url = '/uploads/ab/abcd.png'
+        sample_pet.photo_status = 'pending'
+        db.session.commit()
+        headers = self.get_auth_headers(app, sample_user.id)
+        
+        etags = {}
+        for url in ('/api/pets/', f'/api/pets/{sample_pet.id}/visits', f'/api/pets/{sample_pet.id}/schedule'):
+            etags[url] = client.get(url, headers=headers).headers['ETag']
+            assert client.get(url, headers={**headers, 'If-None-Match': etags[url]}).status_code == 304
+        
+        PetService.set_photo_status(sample_pet.photo_url, 'ready')
+        
+        for url, etag in etags.items():
+            response = client.get(url, headers={**headers, 'If-None-Match': etag})
+            assert response.status_code == 200
+        assert response.get_json()['pet']['photo_variants']['status'] == 'ready'
+    
+    def test_pet_list_etag_changes_with_pet_updates(self, client, app, sample_user, sample_pet):
+        """Test GET /api/pets answers If-None-Match with 304 and is invalidated by an update"""
+        headers = self.get_auth_headers(app, sample_user.id)
+        
+        etag = client.get('/api/pets/', headers=headers).headers['ETag']
+        assert client.get('/api/pets/', headers={**headers, 'If-None-Match': etag}).status_code == 304
+        
+        # Paginated views are tagged separately
+        assert client.get('/api/pets/?limit=1', headers={**headers, 'If-None-Match': etag}).status_code == 200
+        
+        client.put(f'/api/pets/{sample_pet.id}', json={'name': 'Max'}, headers=headers)
+        
+        response = client.get('/api/pets/', headers={**headers, 'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.get_json()['pets'][0]['name'] == 'Max'
+    
+    def test_pet_list_matches_to_dict_output(self, client, app, sample_user, sample_pet):
+        """Test GET /api/pets projection of every field returns the same bytes as serializing to_dict()"""
+        headers = self.get_auth_headers(app, sample_user.id)
+        client.post('/api/pets/',
+            json={'name': 'Łatka', 'species': 'Kot', 'weight': 4.25, 'tags': ['młody', 'spokojny'],
+                  'notes': 'Żółć \u2028 😺'},
+            headers=headers
+        )
+        
+        from models.pet import Pet
+        response = client.get(f'/api/pets/?fields={",".join(Pet.FIELDS)}', headers=headers)
+        
+        pets = Pet.query.filter_by(user_id=sample_user.id).order_by(Pet.created_at, Pet.id).all()
+        expected = DefaultJSONProvider(app).response({'pets': [pet.to_dict() for pet in pets]})
+        assert response.data == expected.data
+    
+    def test_tag_filter_all_any_and_counts(self, client, app, sample_user):
+        """Test GET /api/pets?tag= filters through pet_tags with AND/OR matching and per-tag counts"""
+        headers = self.get_auth_headers(app, sample_user.id)
+        for name, tags in [('Rex', ['senior', 'diabetic']), ('Mruczek', ['senior']), ('Azor', ['diabetic'])]:
+            client.post('/api/pets/', json={'name': name, 'species': 'Dog', 'tags': tags}, headers=headers)
+        
+        data = client.get('/api/pets/?tag=senior&tag=diabetic', headers=headers).get_json()
+        assert [pet['name'] for pet in data['pets']] == ['Rex']
+        assert data['tag_counts'] == {'senior': 2, 'diabetic': 2}
+        
+        data = client.get('/api/pets/?tag=senior&tag=diabetic&match=any', headers=headers).get_json()
+        assert sorted(pet['name'] for pet in data['pets']) == ['Azor', 'Mruczek', 'Rex']
+        
+        # Updating tags keeps the association table in sync
+        rex = next(pet for pet in data['pets'] if pet['name'] == 'Rex')
+        client.put(f'/api/pets/{rex["id"]}', json={'tags': ['diabetic', 'blind']}, headers=headers)
+        data = client.get('/api/pets/?tag=senior&tag=blind&match=any', headers=headers).get_json()
+        assert sorted(pet['name'] for pet in data['pets']) == ['Mruczek', 'Rex']
+        assert data['tag_counts'] == {'senior': 1, 'blind': 1}
@@ -0,0 +1,90 @@
+"""
+Integration tests for read/write splitting
+Testing which requests read from the replica
+"""
+import sqlite3
+import pytest
+from flask_jwt_extended import create_access_token
+from app import create_app, db, replica_router
+from config import Config
+from models.user import User
+from models.pet import Pet
+
+class TestReplicaRouting:
+    """Test cases for replica routing of reads"""
+    
+    def get_auth_headers(self, app, user_id):
+        """Helper to get authorization headers"""
+        with app.app_context():
+            token = create_access_token(identity=str(user_id))
+        return {'Authorization': f'Bearer {token}'}
+    
+    @pytest.fixture
+    def replica_app(self, tmp_path):
+        """(app with a replica bind, id of a user, replicate() copying the primary over the replica)"""
+        class ReplicaConfig(Config):
+            SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path / "primary.db"}'
+            SQLALCHEMY_REPLICA_URI = f'sqlite:///{tmp_path / "replica.db"}'
+            REPLICA_LAG_WINDOW = 60
+        
+        def replicate():
+            with sqlite3.connect(tmp_path / 'primary.db') as primary, sqlite3.connect(tmp_path / 'replica.db') as replica:
+                primary.backup(replica)
+        
+        app = create_app(ReplicaConfig)
+        with app.app_context():
+            user = User(username='replica', email='replica@example.com', password_hash='x')
+            db.session.add(user)
+            db.session.commit()
+            user_id = user.id
+        replicate()
+        
+        yield app, user_id, replicate
+        
+        with app.app_context():
+            db.session.remove()
+            for engine in db.engines.values():
+                engine.dispose()
+    
+    def test_get_reads_replica_outside_read_your_writes_window(self, replica_app):
+        """Test GET requests read the replica bind, except right after the user's own writes"""
+        app, user_id, replicate = replica_app
+        client = app.test_client()
+        headers = self.get_auth_headers(app, user_id)
+        names = lambda **extra: [pet['name'] for pet in
+                                 client.get('/api/pets/', headers={**headers, **extra}).get_json()['pets']]
+        
+        response = client.post('/api/pets/', json={'name': 'Rex', 'species': 'Dog'}, headers=headers)
+        last_write = response.headers['X-Last-Write']
+        assert names() == ['Rex']
+        
+        # Window over: the replica has not caught up yet, unless the client echoes its last write
+        replica_router._last_writes.clear()
+        assert names() == []
+        assert names(**{'X-Last-Write': last_write}) == ['Rex']
+        
+        replicate()
+        assert names() == ['Rex']
+    
+    def test_write_keeps_later_reads_of_the_request_on_primary(self, replica_app):
+        """Test a GET that writes reads its own rows back from the primary after the write"""
+        app, user_id, _ = replica_app
+        
+        @app.route('/test/write-then-read')
+        def write_then_read():
+            before = [pet.name for pet in Pet.query.order_by(Pet.id)]
+            db.session.add(Pet(name='Luna', species='Cat', user_id=user_id))
+            db.session.flush()
+            after = [pet.name for pet in Pet.query.order_by(Pet.id)]
+            db.session.commit()
+            return {'before': before, 'after': after}
+        
+        # On the primary only, as if the replica lagged behind
+        with app.app_context():
+            db.session.add(Pet(name='Rex', species='Dog', user_id=user_id))
+            db.session.commit()
+        
+        response = app.test_client().get('/test/write-then-read')
+        
+        assert response.get_json() == {'before': [], 'after': ['Rex', 'Luna']}
+        assert 'X-Last-Write' in response.headers
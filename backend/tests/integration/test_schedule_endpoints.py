@@ -4,6 +4,7 @@ Testing complete feeding schedule flow through API
 """
 import pytest
 import json
+from datetime import datetime
 from flask_jwt_extended import create_access_token
 
 class TestScheduleEndpoints:
@@ -15,6 +16,17 @@ class TestScheduleEndpoints:
             token = create_access_token(identity=str(user_id))
         return {'Authorization': f'Bearer {token}'}
     
+    def set_created(self, created_at, *schedule_ids):
+        """Helper to move schedules' creation (their first day) to a date"""
+        from sqlalchemy import update
+        from app import db
+        from models.feeding_schedule import FeedingSchedule
+        
+        db.session.execute(
+            update(FeedingSchedule).where(FeedingSchedule.id.in_(schedule_ids)).values(created_at=created_at)
+        )
+        db.session.commit()
+    
     def test_create_schedule_endpoint(self, client, app, sample_user, sample_pet):
         """Test POST /api/pets/<id>/schedule endpoint"""
         headers = self.get_auth_headers(app, sample_user.id)
@@ -33,3 +45,148 @@ class TestScheduleEndpoints:
         data = json.loads(response.data)
         assert data['schedule']['food_type'] == 'Premium dog food'
         assert data['schedule']['time'] == '09:00'
+    
+    def test_month_endpoint_expands_occurrences(self, client, app, sample_user, sample_pet):
+        """Test GET /api/schedule/month/<year>/<month> returns dated occurrences"""
+        headers = self.get_auth_headers(app, sample_user.id)
+        
+        daily = client.post(f'/api/pets/{sample_pet.id}/schedule',
+            json={'food_type': 'Kibble', 'time': '18:00', 'frequency': 'Codziennie'},
+            headers=headers
+        ).get_json()['schedule']
+        weekends = client.post(f'/api/pets/{sample_pet.id}/schedule',
+            json={'food_type': 'Treat', 'time': '08:00', 'frequency': 'Weekendy'},
+            headers=headers
+        ).get_json()['schedule']
+        twice = client.post(f'/api/pets/{sample_pet.id}/schedule',
+            json={'food_type': 'Wet food', 'time': '12:00', 'frequency': 'twice a day'},
+            headers=headers
+        ).get_json()['schedule']
+        self.set_created(datetime(2026, 1, 1, 9, 0), daily['id'], weekends['id'])
+        self.set_created(datetime(2026, 2, 10, 9, 0), twice['id'])
+        
+        response = client.get('/api/schedule/month/2026/2', headers=headers)
+        
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert len(data['days']) == 28
+        # 2026-02-01 is a Sunday, 2026-02-02 a Monday
+        assert data['days']['2026-02-01'] == [weekends['id'], daily['id']]
+        assert data['days']['2026-02-02'] == [daily['id']]
+        # Nothing before a schedule's first day; 'twice a day' is listed once per day
+        assert data['days']['2026-02-09'] == [daily['id']]
+        assert data['days']['2026-02-10'] == [twice['id'], daily['id']]
+        
+        january = client.get('/api/schedule/month/2026/1', headers=headers).get_json()
+        assert list(january['days']) == [f'2026-01-{day:02d}' for day in range(1, 32)]
+        assert client.get('/api/schedule/month/2025/12', headers=headers).get_json()['days'] == {}
+    
+    def test_day_endpoint_groups_by_pet_and_filters_due(self, client, app, sample_user, sample_pet):
+        """Test GET /api/schedule/day/<date> keeps same-named pets apart and skips days off"""
+        headers = self.get_auth_headers(app, sample_user.id)
+        
+        twin = client.post('/api/pets/', json={'name': sample_pet.name, 'species': 'Dog'}, headers=headers).get_json()['pet']
+        daily = client.post(f'/api/pets/{sample_pet.id}/schedule',
+            json={'food_type': 'Kibble', 'time': '18:00', 'frequency': 'Codziennie'},
+            headers=headers
+        ).get_json()['schedule']
+        weekends = client.post(f'/api/pets/{twin["id"]}/schedule',
+            json={'food_type': 'Treat', 'time': '08:00', 'frequency': 'Weekendy'},
+            headers=headers
+        ).get_json()['schedule']
+        self.set_created(datetime(2026, 1, 1, 9, 0), daily['id'], weekends['id'])
+        
+        # 2026-02-01 is a Sunday, 2026-02-02 a Monday
+        sunday = client.get('/api/schedule/day/2026-02-01', headers=headers).get_json()
+        monday = client.get('/api/schedule/day/2026-02-02', headers=headers).get_json()
+        
+        assert set(sunday['schedules_by_pet']) == {str(sample_pet.id), str(twin['id'])}
+        assert set(monday['schedules_by_pet']) == {str(sample_pet.id)}
+        assert client.get('/api/schedule/day/2025-12-31', headers=headers).get_json()['schedules_by_pet'] == {}
+        assert client.get('/api/schedule/day/not-a-date', headers=headers).status_code == 400
+    
+    def test_schedule_owner_check_rejects_other_user(self, client, app, sample_user, sample_pet):
+        """Test a cached schedule owner does not leak access to another user"""
+        from app import db
+        from models.user import User
+        
+        headers = self.get_auth_headers(app, sample_user.id)
+        schedule = client.post(f'/api/pets/{sample_pet.id}/schedule',
+            json={'food_type': 'Kibble', 'time': '18:00'},
+            headers=headers
+        ).get_json()['schedule']
+        
+        other = User(username='other', email='other@example.com', password_hash='x')
+        db.session.add(other)
+        db.session.commit()
+        other_headers = self.get_auth_headers(app, other.id)
+        
+        assert client.put(f'/api/schedule/{schedule["id"]}', json={'amount': '1 cup'}, headers=headers).status_code == 200
+        assert client.put(f'/api/schedule/{schedule["id"]}', json={'amount': '2 cups'}, headers=other_headers).status_code == 403
+        assert client.delete(f'/api/schedule/{schedule["id"]}', headers=headers).status_code == 200
+        assert client.delete(f'/api/schedule/{schedule["id"]}', headers=headers).status_code == 404
+    
+    def test_stale_cached_owner_is_rejected(self, client, app, sample_user, sample_pet):
+        """Test a cached schedule owner is re-checked once the pet belongs to someone else"""
+        from sqlalchemy import update
+        from app import db
+        from models.pet import Pet
+        from models.user import User
+        
+        headers = self.get_auth_headers(app, sample_user.id)
+        schedule = client.post(f'/api/pets/{sample_pet.id}/schedule',
+            json={'food_type': 'Kibble', 'time': '18:00'},
+            headers=headers
+        ).get_json()['schedule']
+        assert client.put(f'/api/schedule/{schedule["id"]}', json={'amount': '1 cup'}, headers=headers).status_code == 200
+        
+        # Another worker hands the pet id to another user; this worker's cache still names the old owner
+        other = User(username='other', email='other@example.com', password_hash='x')
+        db.session.add(other)
+        db.session.commit()
+        db.session.execute(update(Pet).where(Pet.id == sample_pet.id).values(user_id=other.id))
+        db.session.commit()
+        
+        assert client.put(f'/api/schedule/{schedule["id"]}', json={'amount': '2 cups'}, headers=headers).status_code == 403
+        assert client.delete(f'/api/schedule/{schedule["id"]}', headers=headers).status_code == 403
+    
+    def test_bulk_create_schedules_endpoint(self, client, app, sample_user, sample_pet):
+        """Test POST /api/pets/<id>/schedule/bulk inserts valid records and reports invalid ones"""
+        headers = self.get_auth_headers(app, sample_user.id)
+        
+        response = client.post(f'/api/pets/{sample_pet.id}/schedule/bulk',
+            json={'schedules': [
+                {'food_type': 'Kibble', 'time': '08:00'},
+                {'food_type': 'Kibble', 'time': '25:00'},
+                {'food_type': 'Wet food', 'time': '18:30', 'frequency': 'Weekendy'}
+            ]},
+            headers=headers
+        )
+        
+        assert response.status_code == 207
+        data = json.loads(response.data)
+        assert len(data['ids']) == 2
+        assert data['errors'] == [{'index': 1, 'error': 'Hour must be between 0 and 23'}]
+        
+        schedules = client.get(f'/api/pets/{sample_pet.id}/schedule', headers=headers).get_json()['schedules']
+        assert sorted(s['time'] for s in schedules) == ['08:00', '18:30']
+    
+    def test_schedule_etag_not_modified_until_change(self, client, app, sample_user, sample_pet):
+        """Test GET /api/pets/<id>/schedule answers If-None-Match with 304 until a schedule changes"""
+        headers = self.get_auth_headers(app, sample_user.id)
+        url = f'/api/pets/{sample_pet.id}/schedule'
+        
+        first = client.get(url, headers=headers)
+        etag = first.headers['ETag']
+        assert first.status_code == 200
+        
+        cached = client.get(url, headers={**headers, 'If-None-Match': etag})
+        assert cached.status_code == 304
+        assert cached.data == b''
+        
+        client.post(url, json={'food_type': 'Kibble', 'time': '08:00'}, headers=headers)
+        
+        changed = client.get(url, headers={**headers, 'If-None-Match': etag})
+        assert changed.status_code == 200
+        assert changed.headers['ETag'] != etag
+        assert len(changed.get_json()['schedules']) == 1
@@ -0,0 +1,75 @@
+"""
+Integration tests for SQL profiling
+Testing the Server-Timing header and the N+1 log
+"""
+import pytest
+from sqlalchemy import event
+from app import create_app, db, sql_profiler
+from config import Config
+from models.user import User
+from models.pet import Pet
+
+class TestSQLProfiling:
+    """Test cases for per-request SQL profiling"""
+    
+    def test_sql_profiling_server_timing_and_n_plus_one(self, tmp_path, caplog):
+        """Test SQL profiling adds Server-Timing and logs repeated same-shape queries"""
+        class ProfilingConfig(Config):
+            SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path / "profiled.db"}'
+            SQL_PROFILING = True
+            N_PLUS_ONE_THRESHOLD = 3
+        
+        app = create_app(ProfilingConfig)
+        
+        @app.route('/test/schedules')
+        def schedule_counts():
+            return {'counts': [len(pet.feeding_schedules) for pet in Pet.query.all()]}
+        
+        with app.app_context():
+            db.create_all()
+            user = User(username='profiled', email='profiled@example.com', password_hash='x')
+            user.pets = [Pet(name=f'Pet {i}', species='Cat') for i in range(4)]
+            db.session.add(user)
+            db.session.commit()
+        
+        client = app.test_client()
+        response = client.get('/test/schedules')
+        assert response.get_json() == {'counts': [0, 0, 0, 0]}
+        assert response.headers['Server-Timing'].startswith('db;dur=')
+        assert 'desc="5 queries"' in response.headers['Server-Timing']
+        assert any('Suspected N+1 in GET /test/schedules: 4 x' in record.getMessage() for record in caplog.records)
+        
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+    
+    def test_profiling_off_installs_nothing(self, tmp_path):
+        """Test SQL_PROFILING off leaves no engine listener, request hook or Server-Timing header"""
+        class ProfilingConfig(Config):
+            SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path / "profiled.db"}'
+            SQL_PROFILING = True
+        
+        class PlainConfig(Config):
+            SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path / "plain.db"}'
+            SQL_PROFILING = False
+        
+        profiled = create_app(ProfilingConfig)
+        with profiled.app_context():
+            profiled_engine = db.engine
+        app = create_app(PlainConfig)
+        
+        with app.app_context():
+            engine = db.engine
+            response = app.test_client().get('/api/pets/')
+        
+        assert 'Server-Timing' not in response.headers
+        for listened in (engine, profiled_engine):
+            assert not event.contains(listened, 'before_cursor_execute', sql_profiler._before_cursor_execute)
+            assert not event.contains(listened, 'after_cursor_execute', sql_profiler._after_cursor_execute)
+        assert sql_profiler._before_request not in app.before_request_funcs.get(None, [])
+        assert sql_profiler._after_request not in app.after_request_funcs.get(None, [])
+        
+        with app.app_context():
+            db.session.remove()
+            engine.dispose()
+        profiled_engine.dispose()
@@ -0,0 +1,31 @@
+"""
+Integration tests for Uploads endpoints
+Testing static serving of stored photos
+"""
+import pytest
+
+class TestUploadsEndpoints:
+    """Test cases for uploads serving"""
+    
+    def test_content_addressed_photo_caching_and_range(self, client, app, tmp_path):
+        """Test GET /uploads/<file> sends ETag, answers If-None-Match and Range"""
+        content_hash = 'ab' + '0' * 62
+        (tmp_path / 'ab').mkdir()
+        (tmp_path / 'ab' / f'{content_hash}.png').write_bytes(b'0123456789')
+        app.config['UPLOAD_FOLDER'] = str(tmp_path)
+        url = f'/uploads/ab/{content_hash}.png'
+        
+        response = client.get(url)
+        
+        assert response.status_code == 200
+        assert response.data == b'0123456789'
+        assert response.headers['ETag'] == f'"{content_hash}.png"'
+        assert 'immutable' in response.headers['Cache-Control']
+        
+        assert client.get(url, headers={'If-None-Match': response.headers['ETag']}).status_code == 304
+        
+        partial = client.get(url, headers={'Range': 'bytes=2-5'})
+        assert partial.status_code == 206
+        assert partial.data == b'2345'
+        
+        assert client.get('/uploads/../config.py').status_code == 404
@@ -0,0 +1,161 @@
+"""
+Integration tests for Visit endpoints
+Testing complete vet visit flow through API
+"""
+import pytest
+import json
+from flask_jwt_extended import create_access_token
+
+class TestVisitEndpoints:
+    """Test cases for vet visit API endpoints"""
+    
+    def get_auth_headers(self, app, user_id):
+        """Helper to get authorization headers"""
+        with app.app_context():
+            token = create_access_token(identity=str(user_id))
+        return {'Authorization': f'Bearer {token}'}
+    
+    def test_get_visits_cursor_pagination(self, client, app, sample_user, sample_pet):
+        """Test GET /api/pets/<id>/visits pages newest first by visit_date"""
+        headers = self.get_auth_headers(app, sample_user.id)
+        for day in ['2024-01-10', '2024-03-05', '2024-02-20']:
+            client.post(f'/api/pets/{sample_pet.id}/visits',
+                json={'visit_date': f'{day}T10:00:00', 'reason': 'Checkup'},
+                headers=headers
+            )
+        
+        first = client.get(f'/api/pets/{sample_pet.id}/visits?limit=2', headers=headers).get_json()
+        second = client.get(
+            f'/api/pets/{sample_pet.id}/visits?limit=2&cursor={first["next_cursor"]}',
+            headers=headers
+        ).get_json()
+        
+        assert [v['visit_date'][:10] for v in first['visits']] == ['2024-03-05', '2024-02-20']
+        assert [v['visit_date'][:10] for v in second['visits']] == ['2024-01-10']
+        assert second['next_cursor'] is None
+        
+        response = client.get(f'/api/pets/{sample_pet.id}/visits?cursor=garbage', headers=headers)
+        assert response.status_code == 400
+    
+    def test_visit_owner_check_uses_single_query(self, client, app, sample_user, sample_pet):
+        """Test GET /api/visits/<id> loads the visit and its pet in one statement"""
+        from sqlalchemy import event
+        from app import db, ownership_cache
+        
+        headers = self.get_auth_headers(app, sample_user.id)
+        visit = client.post(f'/api/pets/{sample_pet.id}/visits',
+            json={'visit_date': '2024-01-10T10:00:00', 'reason': 'Checkup'},
+            headers=headers
+        ).get_json()['visit']
+        ownership_cache.clear()
+        
+        statements = []
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', count)
+        try:
+            response = client.get(f'/api/visits/{visit["id"]}', headers=headers)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', count)
+        
+        assert response.status_code == 200
+        assert response.get_json()['pet']['id'] == sample_pet.id
+        assert len(statements) == 1
+    
+    def test_visit_fields_and_deferred_text_columns(self, client, app, sample_user, sample_pet):
+        """Test visit lists leave out heavy Text columns unless ?fields= asks for them"""
+        headers = self.get_auth_headers(app, sample_user.id)
+        visit = client.post(f'/api/pets/{sample_pet.id}/visits',
+            json={'visit_date': '2026-01-10', 'reason': 'Checkup', 'diagnosis': 'Healthy', 'notes': 'All good'},
+            headers=headers
+        ).get_json()['visit']
+        
+        listed = client.get(f'/api/pets/{sample_pet.id}/visits', headers=headers).get_json()['visits'][0]
+        assert listed['reason'] == 'Checkup'
+        assert 'diagnosis' not in listed and 'notes' not in listed
+        
+        sparse = client.get(f'/api/pets/{sample_pet.id}/visits?fields=id,diagnosis&limit=10', headers=headers)
+        assert sparse.get_json()['visits'] == [{'id': visit['id'], 'diagnosis': 'Healthy'}]
+        
+        detail = client.get(f'/api/visits/{visit["id"]}?fields=notes', headers=headers).get_json()['visit']
+        assert detail == {'notes': 'All good'}
+        
+        response = client.get(f'/api/pets/{sample_pet.id}/visits?fields=id,secret', headers=headers)
+        assert response.status_code == 400
+    
+    def test_search_visits_ranked_scoped_and_synced(self, client, app, sample_user, sample_pet):
+        """Test GET /api/visits/search follows visit create/update/delete and only sees the user's pets"""
+        app.config['SEARCH_SCAN_MAX_VISITS'] = 0  # full-text index for any owner
+        headers = self.get_auth_headers(app, sample_user.id)
+        url = f'/api/pets/{sample_pet.id}/visits'
+        first = client.post(url, json={'visit_date': '2026-01-10', 'reason': 'Kaszel',
+                                       'medications': 'Antybiotyk <amoksycylina>'}, headers=headers).get_json()['visit']
+        client.post(f'{url}/bulk', json={'visits': [
+            {'visit_date': '2026-02-10', 'reason': 'Antybiotyk - kontrola'},
+            {'visit_date': '2026-03-10', 'reason': 'Szczepienie'}
+        ]}, headers=headers)
+        
+        # Another user's visits never show up
+        from app import db
+        from models.user import User
+        from models.pet import Pet
+        other = User(username='other', email='other@example.com', password_hash='x')
+        db.session.add(other)
+        db.session.commit()
+        other_pet = Pet(name='Obcy', species='Cat', user_id=other.id)
+        db.session.add(other_pet)
+        db.session.commit()
+        other_headers = self.get_auth_headers(app, other.id)
+        client.post(f'/api/pets/{other_pet.id}/visits', json={'visit_date': '2026-01-01', 'reason': 'Antybiotyk'},
+                    headers=other_headers)
+        
+        results = client.get('/api/visits/search?q=antyb', headers=headers).get_json()['results']
+        assert [result['visit']['reason'] for result in results] == ['Antybiotyk - kontrola', 'Kaszel']
+        assert results[1]['highlights']['medications'] == '<mark>Antybiotyk</mark> &lt;amoksycylina&gt;'
+        
+        client.put(f'/api/visits/{first["id"]}', json={'medications': 'Witaminy'}, headers=headers)
+        results = client.get('/api/visits/search?q=antybiotyk', headers=headers).get_json()['results']
+        assert len(results) == 1
+        
+        client.delete(f'/api/visits/{results[0]["visit"]["id"]}', headers=headers)
+        assert client.get('/api/visits/search?q=antybiotyk', headers=headers).get_json()['results'] == []
+        assert client.get('/api/visits/search?q=', headers=headers).status_code == 400
+        assert client.get(f'/api/visits/search?q=u{sample_user.id}', headers=headers).get_json()['results'] == []
+        
+        # The external-content index still matches vet_visits after the updates and deletes
+        from sqlalchemy import text
+        db.session.execute(text("INSERT INTO vet_visits_fts (vet_visits_fts, rank) VALUES ('integrity-check', 1)"))
+    
+    def test_search_visits_of_small_owner_scans_newest_first(self, client, app, sample_user, sample_pet):
+        """Test owners under SEARCH_SCAN_MAX_VISITS get unscored, newest first, highlighted results"""
+        headers = self.get_auth_headers(app, sample_user.id)
+        client.post(f'/api/pets/{sample_pet.id}/visits/bulk', json={'visits': [
+            {'visit_date': '2026-01-10', 'reason': 'Kaszel', 'notes': 'Antybiotyk <5 dni>'},
+            {'visit_date': '2026-02-10', 'reason': 'Kontrola', 'medications': 'antybiotyki'},
+            {'visit_date': '2026-03-10', 'reason': 'Szczepienie'}
+        ]}, headers=headers)
+        
+        results = client.get('/api/visits/search?q=antyb', headers=headers).get_json()['results']
+        assert [result['visit']['reason'] for result in results] == ['Kontrola', 'Kaszel']
+        assert results[0]['score'] is None
+        assert results[0]['highlights'] == {'medications': '<mark>antybiotyki</mark>'}
+        assert results[1]['highlights'] == {'notes': '<mark>Antybiotyk</mark> &lt;5 dni&gt;'}
+    
+    def test_bulk_visits_report_every_error_of_a_record(self, client, app, sample_user, sample_pet):
+        """Test POST /api/pets/<id>/visits/bulk validates all records and collects all errors per record"""
+        headers = self.get_auth_headers(app, sample_user.id)
+        response = client.post(f'/api/pets/{sample_pet.id}/visits/bulk', json={'visits': [
+            {'visit_date': '2024-01-10', 'reason': 'Checkup'},
+            {'visit_date': '2999-01-01', 'reason': 'x' * 201},
+            {'reason': 'Checkup'},
+            'not a visit'
+        ]}, headers=headers)
+        
+        assert response.status_code == 207
+        data = response.get_json()
+        assert len(data['ids']) == 1
+        assert data['errors'] == [
+            {'index': 1, 'error': 'Reason must be at most 200 characters; Visit date cannot be in the future'},
+            {'index': 2, 'error': 'visit_date and reason are required'},
+            {'index': 3, 'error': 'Each visit must be an object'}
+        ]
@@ -25,3 +25,39 @@ class TestAuthService:
             assert error is None
             assert user.username == 'newuser'
             assert user.email == 'newuser@example.com'
+    
+    def test_login_upgrades_low_cost_hash(self, app):
+        """Test login transparently rehashes passwords stored with fewer bcrypt rounds"""
+        from app import db, bcrypt
+        from utils.hashing_pool import hash_rounds
+        
+        with app.app_context():
+            user = User(
+                username='legacy',
+                email='legacy@example.com',
+                password_hash=bcrypt.generate_password_hash('TestPass123!', rounds=4).decode('utf-8')
+            )
+            db.session.add(user)
+            db.session.commit()
+            
+            user, token, error = AuthService.login_user({'username': 'legacy', 'password': 'TestPass123!'})
+            
+            assert error is None
+            assert hash_rounds(user.password_hash) == app.config['BCRYPT_LOG_ROUNDS']
+            assert bcrypt.check_password_hash(user.password_hash, 'TestPass123!')
+    
+    def test_login_rejected_when_hashing_pool_full(self, app, sample_user, monkeypatch):
+        """Test login reports busy instead of queueing without bound"""
+        from app import hashing_pool
+        from utils.hashing_pool import HashingPoolFull
+        from services.auth_service import BUSY_ERROR
+        
+        def full(*args):
+            raise HashingPoolFull()
+        monkeypatch.setattr(hashing_pool, 'run', full)
+        
+        with app.app_context():
+            user, token, error = AuthService.login_user({'username': 'testuser', 'password': 'TestPass123!'})
+            
+            assert user is None
+            assert error == BUSY_ERROR
@@ -0,0 +1,65 @@
+"""
+Unit tests for database engine profiles
+Testing profile resolution, engine option merging and SQLite pragmas
+"""
+import pytest
+from flask import Flask
+from sqlalchemy import text
+from app import create_app, db
+from config import Config
+from utils.engine_profiles import configure_engine, resolve_profile
+
+class TestEngineProfiles:
+    """Test cases for utils.engine_profiles"""
+    
+    def test_resolve_profile_from_uri_scheme(self):
+        """Test auto picks the profile from the scheme, drivers included"""
+        assert resolve_profile('auto', 'sqlite:///petcare.db') == 'sqlite'
+        assert resolve_profile('auto', 'sqlite+pysqlite:///:memory:') == 'sqlite'
+        assert resolve_profile('auto', 'postgresql://user@db/petcare') == 'postgres'
+        assert resolve_profile('auto', 'postgresql+psycopg://user@db/petcare') == 'postgres'
+        assert resolve_profile('auto', 'postgres://user@db/petcare') == 'postgres'
+        assert resolve_profile('auto', 'mysql+pymysql://user@db/petcare') == 'default'
+    
+    def test_resolve_profile_by_name(self):
+        """Test explicit names win over the URI and unknown names are rejected"""
+        assert resolve_profile('default', 'sqlite:///petcare.db') == 'default'
+        assert resolve_profile('postgres', 'sqlite:///petcare.db') == 'postgres'
+        
+        with pytest.raises(ValueError, match='Unknown DB_PROFILE'):
+            resolve_profile('oracle', 'sqlite:///petcare.db')
+    
+    def test_explicit_engine_options_win_over_profile(self):
+        """Test configure_engine merges the profile's pool options under SQLALCHEMY_ENGINE_OPTIONS"""
+        app = Flask(__name__)
+        app.config.from_object(Config)
+        app.config.update(
+            SQLALCHEMY_DATABASE_URI='postgresql+psycopg://user@db/petcare',
+            SQLALCHEMY_ENGINE_OPTIONS={'pool_size': 3, 'echo': True},
+            DB_MAX_OVERFLOW=7,
+        )
+        
+        name, pragmas = configure_engine(app)
+        
+        assert name == 'postgres'
+        assert pragmas == {}
+        options = app.config['SQLALCHEMY_ENGINE_OPTIONS']
+        assert options['pool_size'] == 3
+        assert options['echo'] is True
+        assert options['max_overflow'] == 7
+        assert options['pool_pre_ping'] is True
+    
+    def test_sqlite_connections_get_pragmas(self, tmp_path):
+        """Test a connection of the app's engine runs in WAL mode with the configured busy timeout"""
+        class PragmaConfig(Config):
+            SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path / "pragmas.db"}'
+            SQLITE_BUSY_TIMEOUT = 1234
+        
+        app = create_app(PragmaConfig)
+        
+        with app.app_context():
+            assert db.session.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+            assert db.session.execute(text('PRAGMA busy_timeout')).scalar() == 1234
+            assert db.session.execute(text('PRAGMA synchronous')).scalar() == 1  # NORMAL
+            db.session.remove()
+            db.engine.dispose()
@@ -0,0 +1,78 @@
+"""
+Unit tests for ImagePipeline
+Testing how queued variant jobs report back
+"""
+import os
+from concurrent.futures import Future
+import pytest
+from flask import current_app
+from app import create_app, image_pipeline
+from config import Config
+import utils.image_variants as image_variants
+
+class ManualExecutor:
+    """Stand-in for the process pool whose jobs the test runs by hand"""
+    
+    jobs = []
+    
+    def __init__(self, *args, **kwargs):
+        pass
+    
+    def submit(self, fn, *args):
+        future = Future()
+        ManualExecutor.jobs.append((future, fn, args))
+        return future
+    
+    def shutdown(self, wait=True):
+        pass
+    
+    @classmethod
+    def run(cls):
+        """Run the queued jobs here, completing their futures (and callbacks)"""
+        jobs, cls.jobs = cls.jobs, []
+        for future, fn, args in jobs:
+            future.set_result(fn(*args))
+
+class TestImagePipeline:
+    """Test cases for ImagePipeline"""
+    
+    @pytest.fixture
+    def photo(self, app, tmp_path, monkeypatch):
+        """A stored photo, with the pipeline queuing onto a ManualExecutor"""
+        from PIL import Image
+        
+        monkeypatch.setattr(image_variants, 'ProcessPoolExecutor', ManualExecutor)
+        ManualExecutor.jobs = []
+        app.config['UPLOAD_FOLDER'] = str(tmp_path)
+        app.config['IMAGE_WORKERS'] = 1
+        image_pipeline.init_app(app)
+        path = tmp_path / 'abcd.png'
+        Image.new('RGB', (400, 300), 'green').save(path)
+        return str(path)
+    
+    def test_variants_of_a_released_photo_are_discarded(self, app, photo, tmp_path):
+        """Test variants written after the photo was released are deleted and reported missing"""
+        states = []
+        assert image_pipeline.submit(photo, states.append) == 'pending'
+        
+        # The release unlinks the photo while the worker is still writing its variants
+        future, fn, args = ManualExecutor.jobs.pop()
+        assert fn(*args) is True
+        os.remove(photo)
+        future.set_result(True)
+        
+        assert states == ['missing']
+        assert [name for name in os.listdir(tmp_path) if name != '.photos.lock'] == []
+    
+    def test_outcome_is_reported_to_the_queuing_app(self, app, photo):
+        """Test a job finishing after another app was set up reports into the app that queued it"""
+        class OtherConfig(Config):
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+        
+        seen = []
+        image_pipeline.submit(photo, lambda state: seen.append((current_app._get_current_object(), state)))
+        create_app(OtherConfig)
+        
+        ManualExecutor.run()
+        
+        assert seen == [(app, 'ready')]
@@ -0,0 +1,53 @@
+"""
+Unit tests for OwnershipCache
+Testing expiry, eviction and per-pet invalidation
+"""
+import pytest
+from flask import Flask
+from utils.ownership_cache import OwnershipCache
+
+class TestOwnershipCache:
+    """Test cases for OwnershipCache"""
+    
+    def make_cache(self, size=100, ttl=30):
+        """Helper to build a cache from app config"""
+        app = Flask(__name__)
+        app.config.update(OWNERSHIP_CACHE_SIZE=size, OWNERSHIP_CACHE_TTL=ttl)
+        return OwnershipCache(app)
+    
+    def test_forget_pet_drops_only_its_entries(self):
+        """Test a pet delete drops its ownership, schedules and visits and keeps other pets'"""
+        cache = self.make_cache()
+        cache.remember_pet(1, 10)
+        cache.remember_schedule(100, 10)
+        cache.remember_visit(200, 10)
+        cache.remember_pet(1, 11)
+        cache.remember_schedule(101, 11)
+        
+        cache.forget_pet(10)
+        
+        assert cache.owns_pet(1, 10) is None
+        assert cache.schedule_pet(100) is None
+        assert cache.visit_pet(200) is None
+        assert cache.owns_pet(1, 11) is True
+        assert cache.schedule_pet(101) == 11
+        assert cache._by_pet == {11: {('pet', 1, 11), ('schedule', 101)}}
+    
+    def test_pet_index_follows_eviction_expiry_and_moves(self):
+        """Test evicted, expired and re-pointed entries leave no stale index links"""
+        cache = self.make_cache(size=2)
+        cache.remember_schedule(100, 10)
+        cache.remember_schedule(100, 11)
+        cache.remember_visit(200, 11)
+        cache.remember_visit(201, 12)
+        
+        assert cache.schedule_pet(100) is None
+        assert cache._by_pet == {11: {('visit', 200)}, 12: {('visit', 201)}}
+        
+        cache.forget_visit(200)
+        assert cache._by_pet == {12: {('visit', 201)}}
+        
+        expired = self.make_cache(ttl=-1)
+        expired.remember_pet(1, 10)
+        assert expired.owns_pet(1, 10) is None
+        assert expired._by_pet == {}
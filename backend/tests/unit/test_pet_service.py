@@ -25,3 +25,61 @@ class TestPetService:
             assert pet is None
             assert error is not None
             assert 'Age cannot be negative' in error
+    
+    def test_owns_pet_is_confirmed_by_the_database(self, app, sample_user, sample_pet):
+        """Test a cached ownership is not trusted once the pet id belongs to someone else"""
+        from sqlalchemy import delete
+        from app import db, ownership_cache
+        from models.user import User
+        
+        with app.app_context():
+            pet_id = sample_pet.id
+            ownership_cache.clear()
+            assert PetService.owns_pet(pet_id, sample_user.id) is True
+            assert PetService.owns_pet(pet_id, sample_user.id + 1) is False
+            
+            # Pet deleted by another worker (this cache is not told) and its id reused by another user
+            db.session.execute(delete(Pet).where(Pet.id == pet_id))
+            other = User(username='bob', email='bob@example.com', password_hash='x')
+            db.session.add(other)
+            db.session.commit()
+            other_id = other.id
+            db.session.expunge_all()
+            reused = Pet(name='Rex', species='Dog', user_id=other_id)
+            db.session.add(reused)
+            db.session.commit()
+            
+            assert reused.id == pet_id
+            assert ownership_cache.owns_pet(sample_user.id, pet_id) is True
+            assert PetService.owns_pet(pet_id, sample_user.id) is False
+            assert PetService.owns_pet(pet_id, other_id) is True
+    
+    def test_photo_released_before_commit_is_stored_again(self, app, sample_user, tmp_path):
+        """Test a reused photo deleted by a release before its pet is committed is put back"""
+        import io
+        import os
+        from PIL import Image
+        from werkzeug.datastructures import FileStorage
+        from app import image_pipeline
+        from utils.file_helper import FileUploadHelper
+        
+        app.config['UPLOAD_FOLDER'] = str(tmp_path)
+        app.config['IMAGE_WORKERS'] = 0
+        image_pipeline.init_app(app)
+        photo = io.BytesIO()
+        Image.new('RGB', (40, 30), 'blue').save(photo, 'PNG')
+        upload = lambda: FileStorage(io.BytesIO(photo.getvalue()), 'rex.png')
+        
+        with app.test_request_context():
+            first, _ = PetService.create_pet(sample_user.id, {'name': 'Rex', 'species': 'Dog'},
+                                             FileUploadHelper.save_photo(upload()))
+            path = FileUploadHelper.photo_path(first.photo_url)
+            
+            # Same content staged by another request, then the only pet using it is deleted
+            photo_url = FileUploadHelper.save_photo(upload())
+            PetService.delete_pet(first)
+            assert not os.path.exists(path)
+            
+            second, _ = PetService.create_pet(sample_user.id, {'name': 'Luna', 'species': 'Dog'}, photo_url)
+            assert os.path.exists(path)
+            assert second.to_dict()['photo_variants']['status'] == 'ready'
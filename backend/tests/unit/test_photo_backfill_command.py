@@ -0,0 +1,41 @@
+"""
+Unit tests for the flask backfill-photos command
+Testing stored photo variant states
+"""
+import os
+from app import db, image_pipeline
+from commands.photos import backfill_photos_command
+from models.pet import Pet
+
+class TestPhotoBackfillCommand:
+    """Test cases for the backfill-photos command"""
+    
+    def test_backfill_records_ready_and_missing_photos(self, app, sample_user, tmp_path):
+        """Test never queued photos report so, and the backfill generates or marks them missing"""
+        from PIL import Image
+        
+        app.config['UPLOAD_FOLDER'] = str(tmp_path)
+        app.config['IMAGE_WORKERS'] = 0
+        image_pipeline.init_app(app)
+        os.makedirs(tmp_path / 'ab')
+        Image.new('RGB', (400, 300), 'green').save(tmp_path / 'ab' / 'abcd.png')
+        
+        stored = Pet(name='Rex', species='Dog', photo_url='/uploads/ab/abcd.png', user_id=sample_user.id)
+        lost = Pet(name='Tom', species='Cat', photo_url='/uploads/cd/cdef.png', user_id=sample_user.id)
+        db.session.add_all([stored, lost])
+        db.session.commit()
+        assert stored.to_dict()['photo_variants'] == {'status': 'unqueued'}
+        
+        result = app.test_cli_runner().invoke(backfill_photos_command)
+        assert result.exit_code == 0, result.output
+        assert 'Checked 2 photos: 1 missing, 1 ready' in result.output
+        
+        db.session.expire_all()
+        assert lost.to_dict()['photo_variants'] == {'status': 'missing'}
+        variants = stored.to_dict()['photo_variants']
+        assert variants['status'] == 'ready'
+        assert os.path.exists(tmp_path / variants['thumb'][len('/uploads/'):])
+        
+        # Recorded photos are skipped unless --all is given
+        result = app.test_cli_runner().invoke(backfill_photos_command)
+        assert 'Checked 0 photos' in result.output
@@ -0,0 +1,42 @@
+"""
+Unit tests for the flask seed command
+Testing synthetic data generation
+"""
+import pytest
+from app import db
+from commands.seed import seed_command
+from models.pet import Pet
+from models.pet_tag import PetTag
+from models.feeding_schedule import FeedingSchedule
+from models.vet_visit import VetVisit
+from services.search_service import SearchService
+
+class TestSeedCommand:
+    """Test cases for the seed command"""
+    
+    def test_seed_is_deterministic_and_fills_tags_and_search_index(self, app):
+        """Test seeded rows depend only on the seed and every dependent table is filled"""
+        runner = app.test_cli_runner()
+        options = ['--users', '5', '--pets-per-user', '2', '--schedules-per-pet', '3',
+                   '--visits', '200', '--passwords', '2', '--batch-size', '64']
+        
+        snapshots = []
+        for _ in range(2):
+            result = runner.invoke(seed_command, ['--reset', *options])
+            assert result.exit_code == 0, result.output
+            snapshots.append([
+                (pet.name, pet.species, pet.tags, [visit.reason for visit in pet.vet_visits])
+                for pet in Pet.query.order_by(Pet.id)
+            ])
+            db.session.expunge_all()
+        
+        assert snapshots[0] == snapshots[1]
+        assert Pet.query.count() == 10
+        assert FeedingSchedule.query.count() == 30
+        assert VetVisit.query.count() == 200
+        assert PetTag.query.count() == sum(len(tags.split(',')) for _, _, tags, _ in snapshots[0] if tags)
+        
+        user_id = Pet.query.first().user_id
+        visit = VetVisit.query.join(Pet).filter(Pet.user_id == user_id).first()
+        results = SearchService.search_visits(user_id, visit.reason, 50)
+        assert visit.id in [result['visit']['id'] for result in results]
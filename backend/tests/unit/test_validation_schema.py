@@ -0,0 +1,90 @@
+"""
+Unit tests for the compiled validation schemas
+Testing the edge cases of the pet, visit and schedule records
+"""
+from datetime import datetime, time
+from services.pet_service import PET_SCHEMA
+from services.visit_service import VISIT_SCHEMA
+from services.schedule_service import SCHEDULE_SCHEMA
+
+class TestPetSchema:
+    """Test cases for PET_SCHEMA"""
+    
+    def test_zero_weight_is_rejected(self):
+        """Test weight 0 fails whether sent as a JSON number or a form string"""
+        for weight in (0, '0'):
+            values, errors = PET_SCHEMA.validate({'name': 'Rex', 'species': 'Dog', 'weight': weight})
+            
+            assert errors == ['Weight must be positive']
+            assert 'weight' not in values
+    
+    def test_zero_age_is_accepted(self):
+        """Test age only has to be non-negative"""
+        values, errors = PET_SCHEMA.validate({'name': 'Rex', 'species': 'Dog', 'age': 0})
+        
+        assert errors == []
+        assert values['age'] == 0
+    
+    def test_blank_numbers_are_cleaned_to_none(self):
+        """Test blank form fields are stored as NULL, not as ''"""
+        values, errors = PET_SCHEMA.validate({'name': 'Rex', 'species': 'Dog', 'age': '', 'weight': ''})
+        
+        assert errors == []
+        assert values['age'] is None
+        assert values['weight'] is None
+    
+    def test_numbers_are_cast_and_bounded(self):
+        """Test numeric strings are cast and out-of-range values report their limit"""
+        values, errors = PET_SCHEMA.validate({'name': 'Rex', 'species': 'Dog', 'age': '3', 'weight': '12.5'})
+        assert errors == []
+        assert values['age'] == 3
+        assert values['weight'] == 12.5
+        
+        _, errors = PET_SCHEMA.validate({'name': 'Rex', 'species': 'Dog', 'age': 'abc', 'weight': 501})
+        assert errors == ['Age must be a number', 'Weight seems unrealistic (max 500kg)']
+    
+    def test_required_fields(self):
+        """Test missing and empty required fields are reported once"""
+        for data in ({'species': 'Dog'}, {'name': '', 'species': ''}, {'age': 3}):
+            _, errors = PET_SCHEMA.validate(data)
+            
+            assert errors == ['Name and species are required']
+    
+    def test_partial_update_skips_required_fields(self):
+        """Test a partial update validates only the fields it sends"""
+        values, errors = PET_SCHEMA.validate({'age': 3}, partial=True)
+        
+        assert errors == []
+        assert values == {'age': 3}
+    
+    def test_invalid_tags(self):
+        """Test tags must be a list of strings"""
+        _, errors = PET_SCHEMA.validate({'name': 'Rex', 'species': 'Dog', 'tags': 5})
+        
+        assert errors == ['Tags must be a list of strings']
+
+class TestVisitAndScheduleSchemas:
+    """Test cases for VISIT_SCHEMA and SCHEDULE_SCHEMA"""
+    
+    def test_validate_many_joins_errors_per_record(self):
+        """Test bulk validation reports every message of a record at its index"""
+        valid, errors = VISIT_SCHEMA.validate_many([
+            {'reason': '', 'visit_date': '2999-01-01T10:00:00'},
+            'not an object',
+            {'reason': 'Kontrola', 'visit_date': '2020-01-01T10:00:00'}
+        ], 'Each visit must be an object')
+        
+        assert errors == [
+            {'index': 0, 'error': 'visit_date and reason are required; Visit date cannot be in the future'},
+            {'index': 1, 'error': 'Each visit must be an object'}
+        ]
+        assert valid == [(2, {'reason': 'Kontrola', 'visit_date': datetime(2020, 1, 1, 10, 0)})]
+    
+    def test_schedule_time(self):
+        """Test feeding times are parsed and checked"""
+        values, errors = SCHEDULE_SCHEMA.validate({'food_type': 'Karma', 'time': '08:30'})
+        assert errors == []
+        assert values['time'] == time(8, 30)
+        
+        _, errors = SCHEDULE_SCHEMA.validate({'food_type': 'Karma', 'time': '25:00'})
+        assert errors == ['Hour must be between 0 and 23']
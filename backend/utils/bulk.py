@@ -0,0 +1,34 @@
+"""
+Bulk insert helpers
+"""
+BATCH_SIZE = 1000
+
+def parse_bulk_payload(data, key, max_items):
+    """
+    Extract the list of records from a bulk request body
+    Accepts either a JSON array or an object holding the array under key
+    Returns: (is_valid, items, error_message)
+    """
+    if isinstance(data, dict):
+        data = data.get(key)
+    
+    if not isinstance(data, list) or not data:
+        return False, None, f'Expected a non-empty array of {key}'
+    
+    if len(data) > max_items:
+        return False, None, f'At most {max_items} {key} can be created per request'
+    
+    return True, data, None
+
+def insert_many(session, table, rows, batch_size=BATCH_SIZE):
+    """
+    Insert rows with executemany-style batches on the session's connection
+    The caller owns the transaction; nothing is committed here
+    Returns: list of new primary keys in the order of rows
+    """
+    ids = []
+    statement = table.insert().returning(table.c.id, sort_by_parameter_order=True)
+    for start in range(0, len(rows), batch_size):
+        result = session.execute(statement, rows[start:start + batch_size])
+        ids.extend(row[0] for row in result)
+    return ids
@@ -0,0 +1,37 @@
+"""
+Conditional GET helpers for versioned JSON views
+"""
+import hashlib
+from flask import request, current_app
+
+def make_etag(scope, owner_id, version):
+    """
+    Entity tag of a view: its scope, owner, data version and query string
+    (pagination parameters change the body, so they are part of the tag)
+    """
+    etag = f'{scope}-{owner_id}-{version}'
+    if request.query_string:
+        etag += '-' + hashlib.sha1(request.query_string).hexdigest()[:12]
+    return etag
+
+def not_modified(etag):
+    """Return a 304 response if the client already holds etag, otherwise None"""
+    if not request.if_none_match.contains(etag):
+        return None
+    
+    response = current_app.response_class(status=304)
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+def tag_response(response, etag):
+    """
+    Attach etag to a JSON response
+    Photo variant states are stored on the pet and bump its data version,
+    so a view showing a pending photo is revalidated once the variants exist
+    """
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
@@ -0,0 +1,81 @@
+"""
+Database engine profiles: pool options and per-connection SQLite pragmas
+"""
+from sqlalchemy import create_engine, event
+
+ENGINE_PROFILES = ('default', 'sqlite', 'postgres')
+
+def resolve_profile(name, uri):
+    """
+    Profile to use for a database URI; 'auto' picks one from the URI scheme
+    Raises ValueError for unknown profile names
+    """
+    if name != 'auto':
+        if name not in ENGINE_PROFILES:
+            raise ValueError(f'Unknown DB_PROFILE {name!r}, expected auto or one of {", ".join(ENGINE_PROFILES)}')
+        return name
+
+    scheme = uri.split(':', 1)[0].split('+', 1)[0]
+    return {'sqlite': 'sqlite', 'postgresql': 'postgres', 'postgres': 'postgres'}.get(scheme, 'default')
+
+def profile_settings(name, config):
+    """
+    Engine options and SQLite pragmas of a profile
+    Returns: (engine_options, pragmas)
+    """
+    if name == 'sqlite':
+        return {}, {
+            # Readers no longer block the writer and vice versa
+            'journal_mode': 'WAL',
+            # Safe with WAL: a power loss can only drop the last commits, never corrupt
+            'synchronous': 'NORMAL',
+            # Wait for the write lock instead of failing with "database is locked"
+            'busy_timeout': config['SQLITE_BUSY_TIMEOUT'],
+            'mmap_size': config['SQLITE_MMAP_SIZE'],
+            'cache_size': config['SQLITE_CACHE_SIZE'],
+        }
+    if name == 'postgres':
+        return {
+            'pool_size': config['DB_POOL_SIZE'],
+            'max_overflow': config['DB_MAX_OVERFLOW'],
+            'pool_timeout': config['DB_POOL_TIMEOUT'],
+            'pool_recycle': config['DB_POOL_RECYCLE'],
+            # Drop connections the server or a proxy closed while they sat in the pool
+            'pool_pre_ping': True,
+        }, {}
+    return {}, {}
+
+def configure_engine(app):
+    """
+    Merge the DB_PROFILE engine options into SQLALCHEMY_ENGINE_OPTIONS
+    Call before db.init_app; explicit SQLALCHEMY_ENGINE_OPTIONS win.
+    Returns: (profile_name, pragmas) for install_pragmas
+    """
+    name = resolve_profile(app.config.get('DB_PROFILE', 'auto'), app.config['SQLALCHEMY_DATABASE_URI'])
+    options, pragmas = profile_settings(name, app.config)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {**options, **app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {})}
+    return name, pragmas
+
+def make_engine(url, config):
+    """Engine outside Flask-SQLAlchemy's binds (e.g. a read replica) with its own profile"""
+    name = resolve_profile(config.get('DB_PROFILE', 'auto'), url)
+    options, pragmas = profile_settings(name, config)
+    engine = create_engine(url, **options)
+    install_pragmas(engine, pragmas)
+    return engine
+
+def install_pragmas(engine, pragmas):
+    """Run the pragmas on every new connection of a SQLite engine"""
+    if not pragmas or engine.dialect.name != 'sqlite':
+        return
+
+    statements = [f'PRAGMA {name} = {value}' for name, value in pragmas.items()]
+
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
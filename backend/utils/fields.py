@@ -0,0 +1,70 @@
+"""
+Sparse fieldsets (?fields=) mapped to column projections
+"""
+
+def parse_fields(raw, model, default=None):
+    """
+    Parse a comma-separated ?fields= value against model.FIELDS
+    Returns: (is_valid, fields, error_message); fields is default when raw is None
+    """
+    if raw is None:
+        return True, default or model.FIELDS, None
+    
+    fields = tuple(dict.fromkeys(field.strip() for field in raw.split(',') if field.strip()))
+    if not fields:
+        return False, None, 'Fields must name at least one field'
+    
+    unknown = [field for field in fields if field not in model.FIELDS]
+    if unknown:
+        return False, None, f'Unknown fields: {", ".join(unknown)}'
+    
+    return True, fields, None
+
+def list_fields(model):
+    """Default fields of list queries: everything but the model's deferred Text columns"""
+    return tuple(field for field in model.FIELDS if field not in model.DEFERRED_FIELDS)
+
+def pick_fields(data, fields):
+    """Keep only the requested keys of a to_dict() result"""
+    return {field: data[field] for field in fields}
+
+class Projection:
+    """
+    Columns to select for a set of fields, and the serializer of the rows
+    
+    Fields are formatted with model.FIELD_FORMATS exactly as to_dict() does;
+    fields derived from other columns (model.FIELD_SOURCES) select those columns
+    and pass them to the format function in order.
+    Columns listed in required are selected but not serialized, e.g. the sort
+    keys pagination reads from the last row.
+    """
+    
+    def __init__(self, model, fields, required=()):
+        sources = [model.FIELD_SOURCES.get(field, (field,)) for field in fields]
+        names = list(dict.fromkeys([name for source in sources for name in source] + list(required)))
+        positions = {name: index for index, name in enumerate(names)}
+        
+        self.fields = fields
+        self.columns = [getattr(model, name) for name in names]
+        self._plan = [
+            (field, positions[source[0]], model.FIELD_FORMATS.get(field))
+            for field, source in zip(fields, sources) if len(source) == 1
+        ]
+        self._derived = [
+            (field, [positions[name] for name in source], model.FIELD_FORMATS[field])
+            for field, source in zip(fields, sources) if len(source) > 1
+        ]
+    
+    def serialize(self, rows):
+        """Build to_dict()-shaped dicts (restricted to the fields) from result rows"""
+        plan = self._plan
+        derived = self._derived
+        data = [
+            {field: format_value(row[index]) if format_value else row[index] for field, index, format_value in plan}
+            for row in rows
+        ]
+        if derived:
+            for item, row in zip(data, rows):
+                for field, indexes, format_value in derived:
+                    item[field] = format_value(*(row[index] for index in indexes))
+        return data
@@ -1,13 +1,33 @@
 """
 File upload helper for handling pet photos
 """
+import hashlib
 import os
-from datetime import datetime
-from werkzeug.utils import secure_filename
-from flask import current_app
+import tempfile
+import threading
+from contextlib import contextmanager
+from flask import after_this_request, current_app, g
+from utils.image_variants import variant_files
+from utils.metrics import UPLOAD_BYTES
+
+try:
+    import fcntl
+except ImportError:  # Windows: the lock only covers the threads of one process
+    fcntl = None
+
+# Bytes read from the upload stream per iteration
+CHUNK_SIZE = 64 * 1024
+
+# Stored extension of every accepted image format, as sniffed by Pillow
+IMAGE_EXTENSIONS = {'PNG': 'png', 'JPEG': 'jpg', 'GIF': 'gif'}
+
+# Lock file in the upload folder serializing stores and deletes across workers
+LOCK_FILE = '.photos.lock'
+
+_photo_lock = threading.Lock()
 
 class FileUploadHelper:
-    
+
     @staticmethod
     def allowed_file(filename):
         """Check if file extension is allowed"""
@@ -16,31 +36,169 @@ class FileUploadHelper:
     
     @staticmethod
     def save_photo(file):
-        """Save uploaded photo and return URL"""
+        """
+        Stage an uploaded photo under its content-addressed name and return URL
+        The upload is streamed to disk in chunks while its SHA-256 is computed,
+        and its extension comes from the image format, not the client's name;
+        identical content is stored once and shared by every pet using it.
+        The file is only moved into place by store_photo(), once the pet
+        referencing it is committed; an unstored upload is dropped with the request.
+        """
         if not file or not file.filename:
             return None
         
         if not FileUploadHelper.allowed_file(file.filename):
             return None
         
-        filename = secure_filename(file.filename)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"{timestamp}_{filename}"
-        
         upload_folder = current_app.config['UPLOAD_FOLDER']
         os.makedirs(upload_folder, exist_ok=True)
         
-        filepath = os.path.join(upload_folder, filename)
-        file.save(filepath)
+        digest = hashlib.sha256()
+        size = 0
+        fd, temp_path = tempfile.mkstemp(dir=upload_folder, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                for chunk in iter(lambda: file.stream.read(CHUNK_SIZE), b''):
+                    digest.update(chunk)
+                    temp_file.write(chunk)
+                    size += len(chunk)
+            UPLOAD_BYTES.inc(size)
+            extension = FileUploadHelper.image_extension(temp_path)
+        except Exception:
+            os.remove(temp_path)
+            raise
+        
+        if extension is None:
+            os.remove(temp_path)
+            return None
+        
+        content_hash = digest.hexdigest()
+        photo_url = f'/uploads/{content_hash[:2]}/{content_hash}.{extension}'
+        staged = g.setdefault('staged_photos', {})
+        if photo_url in staged:
+            os.remove(temp_path)
+            return photo_url
+        
+        if not staged:
+            @after_this_request
+            def drop_unstored(response):
+                for path in g.pop('staged_photos', {}).values():
+                    if os.path.exists(path):
+                        os.remove(path)
+                return response
+        staged[photo_url] = temp_path
+        
+        return photo_url
+    
+    @staticmethod
+    def image_extension(path):
+        """Stored extension of an image file from its sniffed format, None if not an accepted image"""
+        from PIL import Image, UnidentifiedImageError
+        
+        try:
+            with Image.open(path) as image:
+                return IMAGE_EXTENSIONS.get(image.format)
+        except (UnidentifiedImageError, OSError):
+            return None
+    
+    @staticmethod
+    @contextmanager
+    def photo_lock():
+        """
+        Serialize storing and deleting shared photo files
+        Held across threads, and across the worker processes sharing the upload
+        folder where fcntl exists, so a delete never races a store of the same file
+        """
+        with _photo_lock:
+            if fcntl is None:
+                yield
+                return
+            
+            upload_folder = current_app.config['UPLOAD_FOLDER']
+            os.makedirs(upload_folder, exist_ok=True)
+            with open(os.path.join(upload_folder, LOCK_FILE), 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    @staticmethod
+    def store_photo(photo_url):
+        """
+        Move a photo staged by save_photo() in this request into place
+        Called once the pet referencing it is committed, under photo_lock():
+        a release that ran before the commit may have deleted the shared file,
+        so it is put back from the staged copy rather than assumed to exist.
+        """
+        temp_path = g.get('staged_photos', {}).pop(photo_url, None)
+        if temp_path is None:
+            return
+        
+        filepath = FileUploadHelper.photo_path(photo_url)
+        with FileUploadHelper.photo_lock():
+            if os.path.exists(filepath):
+                os.remove(temp_path)
+            else:
+                os.makedirs(os.path.dirname(filepath), exist_ok=True)
+                os.replace(temp_path, filepath)
+    
+    @staticmethod
+    def discard_orphan_variants(photo_path):
+        """
+        Delete the derived files of a photo that is no longer stored
+        Variant workers write without photo_lock(), so a release can run
+        while they generate; their files are checked for under the lock
+        Returns: True if the photo is gone
+        """
+        with FileUploadHelper.photo_lock():
+            if os.path.exists(photo_path):
+                return False
+            for path in variant_files(photo_path):
+                os.remove(path)
+            return True
+    
+    @staticmethod
+    def photo_path(photo_url):
+        """Resolve a /uploads/... URL to a path inside the upload folder"""
+        if not photo_url or not photo_url.startswith('/uploads/'):
+            return None
+        
+        upload_folder = os.path.abspath(current_app.config['UPLOAD_FOLDER'])
+        path = os.path.abspath(os.path.join(upload_folder, photo_url[len('/uploads/'):]))
+        if os.path.commonpath([upload_folder, path]) != upload_folder:
+            return None
+        return path
+    
+    @staticmethod
+    def queue_variants(photo_url, done):
+        """
+        Queue variant generation for a stored photo
+        Returns: 'pending' (done(state) reports the outcome later) or the final state
+        """
+        from app import image_pipeline
         
-        return f'/uploads/{filename}'
+        photo_path = FileUploadHelper.photo_path(photo_url)
+        if not photo_path:
+            return 'missing'
+        return image_pipeline.submit(photo_path, done)
+    
+    @staticmethod
+    def photo_variants(photo_url, photo_status):
+        """Variant state and URLs of a photo, None when there is no stored photo"""
+        from app import image_pipeline
+        
+        if not photo_url or not photo_url.startswith('/uploads/'):
+            return None
+        return image_pipeline.describe(photo_url, photo_status)
     
     @staticmethod
     def delete_photo(photo_url):
-        """Delete photo file"""
-        if not photo_url:
+        """Delete photo file and its variants"""
+        photo_path = FileUploadHelper.photo_path(photo_url)
+        if not photo_path:
             return
         
-        photo_path = os.path.join(current_app.root_path, photo_url.lstrip('/'))
-        if os.path.exists(photo_path):
-            os.remove(photo_path)
+        for path in variant_files(photo_path) + [photo_path]:
+            if os.path.exists(path):
+                os.remove(path)
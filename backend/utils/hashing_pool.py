@@ -0,0 +1,80 @@
+"""
+Bounded worker pool for bcrypt password hashing
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from utils.metrics import HASHING_PENDING
+
+class HashingPoolFull(Exception):
+    """Raised when every worker is busy and the wait queue is full"""
+
+class HashingPool:
+    """
+    Runs bcrypt work on a dedicated, size-bounded thread pool
+    
+    bcrypt releases the GIL while hashing, so a small pool caps how many
+    cores password checks can take at once. Work beyond the pool size waits
+    in a bounded queue; once that is full, submissions are rejected with
+    HashingPoolFull instead of piling up behind the request workers.
+    """
+    
+    def __init__(self, app=None):
+        self._executor = None
+        self._slots = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._timeout = None
+        if app is not None:
+            self.init_app(app)
+    
+    def init_app(self, app):
+        workers = app.config.get('HASHING_POOL_SIZE', 2)
+        queue_size = app.config.get('HASHING_QUEUE_SIZE', 32)
+        self._timeout = app.config.get('HASHING_TIMEOUT', 10)
+        
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bcrypt')
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        app.extensions['hashing_pool'] = self
+    
+    @property
+    def pending(self):
+        """Number of hashing jobs running or waiting in the queue"""
+        return self._pending
+    
+    def run(self, func, *args):
+        """
+        Run func(*args) on the pool and wait for its result
+        Raises HashingPoolFull when the queue has no free slot or the
+        job does not finish within HASHING_TIMEOUT seconds
+        """
+        if not self._slots.acquire(blocking=False):
+            raise HashingPoolFull()
+        
+        with self._lock:
+            self._pending += 1
+        HASHING_PENDING.inc()
+        try:
+            future = self._executor.submit(func, *args)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        try:
+            return future.result(timeout=self._timeout)
+        except TimeoutError:
+            raise HashingPoolFull()
+    
+    def _release(self):
+        with self._lock:
+            self._pending -= 1
+        HASHING_PENDING.dec()
+        self._slots.release()
+
+def hash_rounds(password_hash):
+    """Return the cost factor encoded in a bcrypt hash ($2b$<rounds>$...)"""
+    try:
+        return int(password_hash.split('$')[2])
+    except (AttributeError, IndexError, ValueError):
+        return 0
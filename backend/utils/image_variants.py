@@ -0,0 +1,171 @@
+"""
+Background pipeline generating resized variants of pet photos
+"""
+import glob
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from flask import current_app
+
+VARIANT_FORMAT = 'webp'
+
+def variant_path(photo_path, name):
+    """Variant files sit next to the original: <photo>.<name>.webp"""
+    return f'{photo_path}.{name}.{VARIANT_FORMAT}'
+
+def failed_marker(photo_path):
+    return f'{photo_path}.failed'
+
+def variant_files(photo_path):
+    """Every derived file (variants, markers) of a stored photo"""
+    return glob.glob(glob.escape(photo_path) + '.*')
+
+def generate_variants(photo_path, variants, quality):
+    """
+    Write every missing variant of a photo
+    variants: iterable of (name, size, crop); crop=True makes a size x size
+    thumbnail, otherwise the image is bounded to size on its longest edge
+    Runs inside a worker process, so it must stay a top-level function; it
+    takes no photo lock, and whoever collects the result drops the variants
+    of a photo released meanwhile (see ImagePipeline.outcome)
+    Returns: True on success, False if the image could not be processed
+    """
+    if not os.path.exists(photo_path):
+        # Photo was released before the worker got to it
+        return False
+    
+    try:
+        from PIL import Image, ImageOps
+        
+        with Image.open(photo_path) as source:
+            image = ImageOps.exif_transpose(source)
+            if image.mode not in ('RGB', 'RGBA'):
+                image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+            
+            for name, size, crop in variants:
+                target = variant_path(photo_path, name)
+                if os.path.exists(target):
+                    continue
+                
+                if crop:
+                    resized = ImageOps.fit(image, (size, size))
+                else:
+                    resized = image.copy()
+                    resized.thumbnail((size, size))
+                
+                temp_path = f'{target}.part'
+                resized.save(temp_path, VARIANT_FORMAT.upper(), quality=quality)
+                os.replace(temp_path, target)
+        return True
+    except Exception:
+        with open(failed_marker(photo_path), 'w'):
+            pass
+        return False
+
+class ImagePipeline:
+    """
+    Generates photo variants on a process pool so uploads return immediately
+    
+    The pool is created on first use, with the spawn start method so that
+    worker processes never inherit request threads or database connections.
+    IMAGE_WORKERS = 0 generates variants inline, which tests rely on.
+    The disk is only read when a photo is queued; the resulting state is
+    handed to the caller, which stores it with the pets using the photo.
+    """
+    
+    def __init__(self, app=None):
+        self._executor = None
+        self._lock = threading.Lock()
+        self._workers = 0
+        self._variants = ()
+        self._quality = 80
+        if app is not None:
+            self.init_app(app)
+    
+    def init_app(self, app):
+        self._workers = app.config.get('IMAGE_WORKERS', 2)
+        self._variants = tuple(
+            (name, size, crop) for name, (size, crop) in app.config.get('PHOTO_VARIANTS', {}).items()
+        )
+        self._quality = app.config.get('PHOTO_VARIANT_QUALITY', 80)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        app.extensions['image_pipeline'] = self
+    
+    def submit(self, photo_path, done):
+        """
+        Queue variant generation for a stored photo
+        done(state) is called with 'ready', 'failed' or 'missing' once a queued
+        photo is processed, inside a context of the app queuing it
+        Returns: 'pending' when queued, otherwise the final state
+        """
+        state = self.status(photo_path)
+        if state in ('ready', 'missing'):
+            return state
+        if self._workers <= 0:
+            return self.generate(photo_path)
+        
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+        app = current_app._get_current_object()
+        future = self._executor.submit(generate_variants, photo_path, self._variants, self._quality)
+        future.add_done_callback(lambda future: self._finished(future, app, photo_path, done))
+        return 'pending'
+    
+    def generate(self, photo_path):
+        """
+        Generate the missing variants of a photo in this process
+        Returns: 'ready', 'failed' or 'missing'
+        """
+        state = self.status(photo_path)
+        if state in ('ready', 'missing'):
+            return state
+        return self.outcome(photo_path, generate_variants(photo_path, self._variants, self._quality))
+    
+    def outcome(self, photo_path, succeeded):
+        """
+        State of a photo once its variants were generated
+        A photo released while they were being written is 'missing', and the
+        files written for it after the release are deleted
+        """
+        from utils.file_helper import FileUploadHelper
+        
+        if FileUploadHelper.discard_orphan_variants(photo_path):
+            return 'missing'
+        return 'ready' if succeeded else 'failed'
+    
+    def _finished(self, future, app, photo_path, done):
+        """Report a queued photo's outcome; a crashed worker counts as failed"""
+        try:
+            succeeded = future.result()
+        except Exception:
+            succeeded = False
+        with app.app_context():
+            done(self.outcome(photo_path, succeeded))
+    
+    def status(self, photo_path):
+        """Return 'ready', 'failed', 'pending' or 'missing' (no source file) from the disk"""
+        if not os.path.exists(photo_path):
+            return 'missing'
+        if all(os.path.exists(variant_path(photo_path, name)) for name, _, _ in self._variants):
+            return 'ready'
+        if os.path.exists(failed_marker(photo_path)):
+            return 'failed'
+        return 'pending'
+    
+    def describe(self, photo_url, state):
+        """
+        Variant state and, once ready, the variant URLs of a photo
+        Built from the stored state alone; None (never queued) is 'unqueued'
+        """
+        info = {'status': state or 'unqueued'}
+        if state == 'ready':
+            for name, _, _ in self._variants:
+                info[name] = f'{photo_url}.{name}.{VARIANT_FORMAT}'
+        return info
@@ -0,0 +1,61 @@
+"""
+JSON provider encoding responses with orjson when it is installed
+"""
+import codecs
+import re
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+def _escape_non_ascii(error):
+    """Codec error handler writing non-ASCII text as json.dumps(ensure_ascii=True) does"""
+    escaped = []
+    for char in error.object[error.start:error.end]:
+        code = ord(char)
+        if code > 0xFFFF:
+            code -= 0x10000
+            escaped.append('\\u%04x\\u%04x' % (0xD800 | (code >> 10), 0xDC00 | (code & 0x3FF)))
+        else:
+            escaped.append('\\u%04x' % code)
+    return ''.join(escaped), error.end
+
+codecs.register_error('json_ascii', _escape_non_ascii)
+
+# Floats repr() writes in exponent notation (below 1e-4, from 1e16 on), which
+# orjson formats differently; false positives inside strings only cost a fallback
+_EXPONENT_FLOAT = re.compile(rb'[:,\[]-?(?:\d+(?:\.\d+)?e|0\.0000)')
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Drop-in replacement for Flask's JSON provider
+    
+    Compact responses are encoded with orjson and produce the same bytes as
+    the default provider (sorted keys, compact separators, ASCII escapes).
+    Values orjson would encode differently, pretty-printed debug output and
+    every response when orjson is not installed go through the default provider.
+    """
+    
+    def response(self, *args, **kwargs):
+        if orjson is None or (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        
+        obj = self._prepare_response_obj(args, kwargs)
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        
+        try:
+            body = orjson.dumps(obj, default=self.default, option=option)
+        except TypeError:
+            return super().response(*args, **kwargs)
+        
+        if b'\x7f' in body or _EXPONENT_FLOAT.search(body):
+            # json.dumps escapes DEL and writes exponents as repr() does
+            return super().response(*args, **kwargs)
+        if self.ensure_ascii and not body.isascii():
+            body = body.decode('utf-8').encode('ascii', 'json_ascii')
+        
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
@@ -0,0 +1,142 @@
+"""
+Prometheus metrics: per-endpoint requests and latency, pool, bcrypt and upload stats
+
+Set PROMETHEUS_MULTIPROC_DIR (an empty directory, shared by the workers)
+in the environment before starting gunicorn: every worker then writes its
+values to memory-mapped files there and /metrics sums them across workers.
+prometheus_client reads the variable at import time, so it cannot come
+from Config. Gauges of exited workers are dropped by calling
+prometheus_client.multiprocess.mark_process_dead(worker.pid) from
+gunicorn's child_exit hook.
+"""
+import os
+import time
+from flask import request
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest, multiprocess
+from sqlalchemy import event
+
+# Latency buckets in seconds; dense around the bcrypt-bound auth endpoints
+LATENCY_BUCKETS = (.005, .01, .025, .05, .1, .15, .25, .35, .5, .75, 1, 2.5, 5, 10)
+
+REQUESTS = Counter(
+    'petcare_http_requests_total', 'HTTP requests by endpoint, method and status class',
+    ['endpoint', 'method', 'status']
+)
+LATENCY = Histogram(
+    'petcare_http_request_duration_seconds', 'HTTP request latency by endpoint and method',
+    ['endpoint', 'method'], buckets=LATENCY_BUCKETS
+)
+IN_FLIGHT = Gauge(
+    'petcare_http_requests_in_flight', 'HTTP requests being handled by endpoint',
+    ['endpoint'], multiprocess_mode='livesum'
+)
+POOL_CHECKED_OUT = Gauge(
+    'petcare_db_pool_checked_out', 'Database connections checked out of the pool',
+    ['engine'], multiprocess_mode='livesum'
+)
+POOL_OVERFLOW = Gauge(
+    'petcare_db_pool_overflow', 'Database connections open beyond the pool size',
+    ['engine'], multiprocess_mode='livesum'
+)
+HASHING_PENDING = Gauge(
+    'petcare_bcrypt_pending', 'bcrypt jobs running or waiting in the hashing pool queue',
+    multiprocess_mode='livesum'
+)
+UPLOAD_BYTES = Counter('petcare_upload_bytes_total', 'Bytes of uploaded photos received')
+
+def registry():
+    """Registry to expose: the workers' aggregated files in multiprocess mode, else this process"""
+    if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+        return REGISTRY
+    collected = CollectorRegistry()
+    multiprocess.MultiProcessCollector(collected)
+    return collected
+
+def render():
+    """
+    Current metrics in the Prometheus text format
+    Returns: bytes
+    """
+    return generate_latest(registry())
+
+class RequestMetrics:
+    """
+    Records count, status class, latency and in-flight requests of every
+    blueprint endpoint, plus the checked-out and overflow connections of
+    the given engines
+    
+    Label children are looked up once per endpoint and kept, so a request
+    only touches the metric values, not the metrics' label locks.
+    """
+    
+    def __init__(self, app=None):
+        self._children = {}
+        if app is not None:
+            self.init_app(app)
+    
+    def init_app(self, app, engines=None):
+        """Instrument requests and the pools of engines ({label: engine})"""
+        app.extensions['request_metrics'] = self
+        if not app.config.get('METRICS_ENABLED'):
+            return
+        
+        for name, engine in (engines or {}).items():
+            self._watch_pool(name, engine)
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+    
+    def _watch_pool(self, name, engine):
+        checked_out = POOL_CHECKED_OUT.labels(name)
+        overflow = POOL_OVERFLOW.labels(name)
+        pool = engine.pool
+        
+        def update_overflow():
+            # Only QueuePool has an overflow; it counts up from -pool_size
+            if hasattr(pool, 'overflow'):
+                overflow.set(max(pool.overflow(), 0))
+        
+        @event.listens_for(engine, 'checkout')
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            checked_out.inc()
+            update_overflow()
+        
+        @event.listens_for(engine, 'checkin')
+        def on_checkin(dbapi_connection, connection_record):
+            checked_out.dec()
+            update_overflow()
+    
+    def _endpoint_children(self, endpoint, method):
+        key = (endpoint, method)
+        children = self._children.get(key)
+        if children is None:
+            children = self._children[key] = (
+                LATENCY.labels(endpoint, method),
+                IN_FLIGHT.labels(endpoint),
+                {status: REQUESTS.labels(endpoint, method, status) for status in ('1xx', '2xx', '3xx', '4xx', '5xx')}
+            )
+        return children
+    
+    def _before_request(self):
+        # Only the endpoints of the routes/ blueprints are recorded, not /metrics itself
+        if request.blueprint is None or request.blueprint == 'metrics':
+            return
+        children = self._endpoint_children(request.endpoint, request.method)
+        children[1].inc()
+        request.environ['petcare.metrics'] = [children, time.perf_counter(), '5xx']
+    
+    def _after_request(self, response):
+        state = request.environ.get('petcare.metrics')
+        if state is not None:
+            state[2] = f'{response.status_code // 100}xx'
+        return response
+    
+    def _teardown_request(self, exception=None):
+        # Runs even when a handler raised, so the in-flight gauge always goes back down
+        state = request.environ.pop('petcare.metrics', None)
+        if state is None:
+            return
+        (latency, in_flight, requests), started, status = state
+        latency.observe(time.perf_counter() - started)
+        requests[status].inc()
+        in_flight.dec()
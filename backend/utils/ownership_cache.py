@@ -0,0 +1,131 @@
+"""
+Process-wide LRU + TTL cache of ownership lookups
+"""
+import threading
+import time
+from collections import OrderedDict
+
+class OwnershipCache:
+    """
+    Caches who owns what, so ownership checks can skip their queries
+    
+    Keys:
+        ('pet', user_id, pet_id) -> True (only positive ownership is cached)
+        ('schedule', schedule_id) -> pet_id
+        ('visit', visit_id) -> pet_id
+    
+    Entries expire after OWNERSHIP_CACHE_TTL seconds and the least recently
+    used ones are evicted beyond OWNERSHIP_CACHE_SIZE. Delete paths in the
+    services invalidate entries explicitly; deletes made by other worker
+    processes become visible once the TTL has passed, so an entry is only a
+    hint for which query to run, never an authorization on its own. Every
+    key is also indexed by its pet id, so dropping a pet touches only its
+    own entries.
+    """
+    
+    def __init__(self, app=None):
+        self._entries = OrderedDict()
+        self._by_pet = {}
+        self._lock = threading.Lock()
+        self._max_size = 0
+        self._ttl = 0
+        self.hits = 0
+        self.misses = 0
+        if app is not None:
+            self.init_app(app)
+    
+    def init_app(self, app):
+        self._max_size = app.config.get('OWNERSHIP_CACHE_SIZE', 10000)
+        self._ttl = app.config.get('OWNERSHIP_CACHE_TTL', 30)
+        self.clear()
+        app.extensions['ownership_cache'] = self
+    
+    @property
+    def stats(self):
+        """Hit/miss counters and current size"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
+    
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._by_pet.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def owns_pet(self, user_id, pet_id):
+        """Return True if ownership is cached, None on a miss"""
+        return self._get(('pet', user_id, pet_id))
+    
+    def remember_pet(self, user_id, pet_id):
+        self._set(('pet', user_id, pet_id), True)
+    
+    def schedule_pet(self, schedule_id):
+        """Return the cached pet id of a schedule, None on a miss"""
+        return self._get(('schedule', schedule_id))
+    
+    def remember_schedule(self, schedule_id, pet_id):
+        self._set(('schedule', schedule_id), pet_id)
+    
+    def forget_schedule(self, schedule_id):
+        with self._lock:
+            self._drop(('schedule', schedule_id))
+    
+    def visit_pet(self, visit_id):
+        """Return the cached pet id of a visit, None on a miss"""
+        return self._get(('visit', visit_id))
+    
+    def remember_visit(self, visit_id, pet_id):
+        self._set(('visit', visit_id), pet_id)
+    
+    def forget_visit(self, visit_id):
+        with self._lock:
+            self._drop(('visit', visit_id))
+    
+    def forget_pet(self, pet_id):
+        """Drop a pet's ownership and every schedule/visit entry pointing at it"""
+        with self._lock:
+            for key in self._by_pet.pop(pet_id, ()):
+                del self._entries[key]
+    
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def _set(self, key, value):
+        if self._max_size <= 0:
+            return
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (value, time.monotonic() + self._ttl)
+            self._by_pet.setdefault(self._pet_id(key, value), set()).add(key)
+            while len(self._entries) > self._max_size:
+                self._drop(next(iter(self._entries)))
+    
+    @staticmethod
+    def _pet_id(key, value):
+        """Pet an entry is about: in the key for ownership, the value for schedules and visits"""
+        return key[2] if key[0] == 'pet' else value
+    
+    def _drop(self, key):
+        """Remove an entry and its pet index link; the lock must be held"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        pet_id = self._pet_id(key, entry[0])
+        keys = self._by_pet[pet_id]
+        keys.discard(key)
+        if not keys:
+            del self._by_pet[pet_id]
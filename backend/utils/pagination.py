@@ -0,0 +1,82 @@
+"""
+Keyset (cursor) pagination helpers
+"""
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+def encode_cursor(sort_value, row_id):
+    """Encode the last row's (datetime, id) sort key as an opaque cursor"""
+    payload = json.dumps([sort_value.isoformat(), row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    """
+    Decode an opaque cursor
+    Returns: (is_valid, (sort_value, row_id), error_message)
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return True, (datetime.fromisoformat(sort_value), int(row_id)), None
+    except (ValueError, TypeError, UnicodeError):
+        return False, None, 'Invalid cursor'
+
+def validate_page_size(limit):
+    """
+    Validate requested page size
+    Returns: (is_valid, page_size, error_message)
+    """
+    if limit is None:
+        return True, DEFAULT_PAGE_SIZE, None
+    
+    try:
+        limit = int(limit)
+    except (ValueError, TypeError):
+        return False, None, 'Limit must be a number'
+    
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        return False, None, f'Limit must be between 1 and {MAX_PAGE_SIZE}'
+    
+    return True, limit, None
+
+def paginate(query, sort_column, id_column, limit, cursor=None, descending=False):
+    """
+    Fetch one page of a query ordered by (sort_column, id_column)
+    Seeks past the cursor instead of using OFFSET, so every page costs the same
+    Returns: (items, next_cursor, error_message)
+    """
+    if cursor:
+        is_valid, key, error = decode_cursor(cursor)
+        if not is_valid:
+            return None, None, error
+        sort_value, row_id = key
+        if descending:
+            query = query.filter(or_(
+                sort_column < sort_value,
+                and_(sort_column == sort_value, id_column < row_id)
+            ))
+        else:
+            query = query.filter(or_(
+                sort_column > sort_value,
+                and_(sort_column == sort_value, id_column > row_id)
+            ))
+    
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column, id_column)
+    
+    # Fetch one extra row to know whether another page exists
+    items = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+    
+    return items, next_cursor, None
@@ -0,0 +1,125 @@
+"""
+Recurrence helpers for expanding feeding schedules into dated occurrences
+"""
+import calendar
+from bisect import bisect_left
+from datetime import date
+
+DAILY = 'daily'
+EVERY_OTHER_DAY = 'every_other_day'
+WEEKLY = 'weekly'
+WEEKENDS = 'weekends'
+WEEKDAYS = 'weekdays'
+
+# Frequency labels used by the frontend (Polish) and the English ones
+# accepted by the API, normalized to a recurrence rule. A schedule has a
+# single feeding time, so 'twice a day' is due daily and listed once per
+# day; its second feeding is not a separate occurrence.
+FREQUENCY_RULES = {
+    'codziennie': DAILY,
+    'daily': DAILY,
+    'twice a day': DAILY,
+    'co drugi dzień': EVERY_OTHER_DAY,
+    'every other day': EVERY_OTHER_DAY,
+    'raz w tygodniu': WEEKLY,
+    'weekly': WEEKLY,
+    'once a week': WEEKLY,
+    'weekendy': WEEKENDS,
+    'weekends': WEEKENDS,
+    'dni robocze': WEEKDAYS,
+    'weekdays': WEEKDAYS,
+}
+
+def normalize_frequency(frequency):
+    """
+    Map a free-form frequency label to a recurrence rule
+    Unknown or empty labels are treated as daily
+    """
+    if not frequency:
+        return DAILY
+    return FREQUENCY_RULES.get(frequency.strip().lower(), DAILY)
+
+def rule_key(frequency, anchor):
+    """
+    Build a hashable key identifying which days a schedule is due on
+    Schedules sharing a key share the same day mask for any month
+    """
+    rule = normalize_frequency(frequency)
+    if rule == EVERY_OTHER_DAY:
+        return rule, anchor.toordinal() % 2
+    if rule == WEEKLY:
+        return rule, anchor.weekday()
+    return rule, None
+
+def month_mask(key, year, month):
+    """
+    Return the tuple of day numbers (1-based) in the month matching a rule key
+    """
+    rule, phase = key
+    first_ordinal = date(year, month, 1).toordinal()
+    first_weekday = date(year, month, 1).weekday()
+    days_in_month = calendar.monthrange(year, month)[1]
+    
+    if rule == EVERY_OTHER_DAY:
+        start = 1 if first_ordinal % 2 == phase else 2
+        return tuple(range(start, days_in_month + 1, 2))
+    if rule == WEEKLY:
+        start = (phase - first_weekday) % 7 + 1
+        return tuple(range(start, days_in_month + 1, 7))
+    if rule == WEEKENDS:
+        return tuple(day for day in range(1, days_in_month + 1)
+                     if (first_weekday + day - 1) % 7 >= 5)
+    if rule == WEEKDAYS:
+        return tuple(day for day in range(1, days_in_month + 1)
+                     if (first_weekday + day - 1) % 7 < 5)
+    return tuple(range(1, days_in_month + 1))
+
+def is_due_on(frequency, anchor, day):
+    """
+    Check whether a schedule with the given frequency is due on a date
+    anchor is the schedule's first day; it is never due before it
+    """
+    if day < anchor:
+        return False
+    rule, phase = rule_key(frequency, anchor)
+    if rule == EVERY_OTHER_DAY:
+        return day.toordinal() % 2 == phase
+    if rule == WEEKLY:
+        return day.weekday() == phase
+    if rule == WEEKENDS:
+        return day.weekday() >= 5
+    if rule == WEEKDAYS:
+        return day.weekday() < 5
+    return True
+
+def expand_month(entries, year, month):
+    """
+    Expand schedules into dated occurrences for a month
+    entries: iterable of (schedule_id, time, frequency, anchor_date), where
+    anchor_date is the schedule's first day (occurrences start there)
+    Returns: dict mapping ISO date -> list of schedule ids ordered by time
+    
+    Entries are sorted by time once and each distinct day mask is computed
+    once per month, so every occurrence is a single append in time order.
+    """
+    masks = {}
+    first_ordinal = date(year, month, 1).toordinal()
+    days_in_month = calendar.monthrange(year, month)[1]
+    per_day = [[] for _ in range(days_in_month + 1)]
+    for schedule_id, feeding_time, frequency, anchor in sorted(entries, key=lambda e: (e[1], e[0])):
+        first_day = anchor.toordinal() - first_ordinal + 1
+        if first_day > days_in_month:
+            continue
+        key = rule_key(frequency, anchor)
+        mask = masks.get(key)
+        if mask is None:
+            mask = masks[key] = month_mask(key, year, month)
+        for day in mask[bisect_left(mask, first_day):] if first_day > 1 else mask:
+            per_day[day].append(schedule_id)
+    
+    prefix = f'{year:04d}-{month:02d}-'
+    return {
+        f'{prefix}{day:02d}': schedule_ids
+        for day, schedule_ids in enumerate(per_day)
+        if schedule_ids
+    }
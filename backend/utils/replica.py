@@ -0,0 +1,112 @@
+"""
+Read/write splitting: GET requests read from a replica engine
+"""
+import threading
+import time
+import sqlalchemy as sa
+from flask import current_app, has_request_context, request
+from flask_sqlalchemy.session import Session
+from utils.engine_profiles import make_engine
+
+LAST_WRITE_HEADER = 'X-Last-Write'
+READ_METHODS = ('GET', 'HEAD')
+
+class RoutingSession(Session):
+    """
+    Session that sends the reads of replica-routed requests to the replica engine
+    
+    Flushes and INSERT/UPDATE/DELETE statements always go to the primary and
+    mark the session as written, after which its reads stay on the primary too.
+    """
+    
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            if self._flushing or isinstance(clause, sa.UpdateBase):
+                self.info['wrote'] = True
+            elif not self.info.get('wrote'):
+                router = current_app.extensions.get('replica_router')
+                if router is not None and router.engine is not None and router.reads_from_replica():
+                    return router.engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+class ReplicaRouter:
+    """
+    Decides per request whether reads may use the replica
+    
+    Only GET/HEAD requests do, and not while the user is inside the
+    read-your-writes window (REPLICA_LAG_WINDOW seconds) after a write. The
+    window is tracked per process and, across worker processes, through the
+    X-Last-Write header: responses to writes carry the write time, and
+    clients that echo it on later requests keep reading from the primary
+    until the window has passed.
+    """
+    
+    def __init__(self, app=None):
+        self._last_writes = {}
+        self._lock = threading.Lock()
+        self._window = 0
+        self.engine = None
+        if app is not None:
+            self.init_app(app)
+    
+    def init_app(self, app):
+        url = app.config.get('SQLALCHEMY_REPLICA_URI')
+        self._window = app.config.get('REPLICA_LAG_WINDOW', 5)
+        with self._lock:
+            self._last_writes.clear()
+        if self.engine is not None:
+            self.engine.dispose()
+        self.engine = make_engine(url, app.config) if url else None
+        if self.engine is not None:
+            app.after_request(self._after_request)
+        app.extensions['replica_router'] = self
+    
+    def reads_from_replica(self):
+        """Whether the current request may read from the replica (decided once per request)"""
+        if not has_request_context() or request.method not in READ_METHODS:
+            return False
+        
+        decision = request.environ.get('petcare.read_from_replica')
+        if decision is None:
+            decision = request.environ['petcare.read_from_replica'] = not self._in_write_window()
+        return decision
+    
+    def remember_write(self, user_id, at=None):
+        """Start the read-your-writes window of a user"""
+        at = at or time.time()
+        with self._lock:
+            self._last_writes[user_id] = at
+            if len(self._last_writes) > 10000:
+                cutoff = at - self._window
+                self._last_writes = {key: value for key, value in self._last_writes.items() if value > cutoff}
+    
+    def _in_write_window(self):
+        cutoff = time.time() - self._window
+        try:
+            if float(request.headers.get(LAST_WRITE_HEADER, 0)) > cutoff:
+                return True
+        except ValueError:
+            pass
+        
+        user_id = _current_user_id()
+        return user_id is not None and self._last_writes.get(user_id, 0) > cutoff
+    
+    def _after_request(self, response):
+        from app import db
+        
+        if db.session.info.pop('wrote', False):
+            at = time.time()
+            user_id = _current_user_id()
+            if user_id is not None:
+                self.remember_write(user_id, at)
+            response.headers[LAST_WRITE_HEADER] = f'{at:.3f}'
+        return response
+
+def _current_user_id():
+    """Identity of a JWT verified in this request, or None"""
+    from flask_jwt_extended import get_jwt_identity
+    
+    try:
+        return get_jwt_identity()
+    except RuntimeError:
+        return None
@@ -0,0 +1,270 @@
+"""
+Declarative validation schemas compiled into single-pass validators
+
+A schema maps field names to rules built with the helpers below. When the
+schema is defined, the source of every rule is inlined into one generated
+validate() function, so checking a record costs no call per field. Error
+messages are the ones the services returned before the schemas existed.
+"""
+import re
+import textwrap
+from datetime import datetime, time
+
+class Rule:
+    """
+    Check of one field as a source template
+    The code reads and may replace `value` and sets `error` to a message on
+    failure; {name} placeholders refer to the constants passed as keywords.
+    setup runs once per call, before the first record, and its {name}
+    placeholders may also name locals of its own.
+    """
+    
+    def __init__(self, source, setup='', **constants):
+        self.source = textwrap.dedent(source).strip('\n')
+        self.setup = textwrap.dedent(setup).strip('\n')
+        self.constants = constants
+
+def string(label, min_length=None, max_length=None, pattern=None, pattern_error=None):
+    """Length-limited string, optionally matching a regex; None passes"""
+    source = """
+        if value is not None:
+            length = len(value) if value.__class__ is str else len(str(value))
+            if length < {min_length}:
+                error = {too_short}
+            elif {max_length} is not None and length > {max_length}:
+                error = {too_long}
+    """
+    if pattern:
+        source += """
+            elif not (value.__class__ is str and {match}(value)):
+                error = {pattern_error}
+        """
+    return Rule(
+        source,
+        min_length=min_length or 0,
+        max_length=max_length,
+        too_short=f"{label} must be at least {min_length} characters",
+        too_long=f"{label} must be at most {max_length} characters",
+        match=re.compile(pattern).match if pattern else None,
+        pattern_error=pattern_error
+    )
+
+def number(label, cast=int, maximum=None, maximum_text=None, positive=False):
+    """
+    Non-negative (or strictly positive) number with an upper bound
+    None and '' (blank form fields) pass and are cleaned to None; 0 is
+    checked like any other number, so positive=True rejects it
+    """
+    return Rule(
+        """
+        if value is None or value == '':
+            value = None
+        else:
+            try:
+                value = {cast}(value)
+            except (ValueError, TypeError):
+                error = {not_number}
+            else:
+                if value < 0 or ({positive} and value == 0):
+                    error = {too_low}
+                elif {maximum} is not None and value > {maximum}:
+                    error = {too_high}
+        """,
+        cast=cast,
+        positive=positive,
+        maximum=maximum,
+        not_number=f"{label} must be a number",
+        too_low=f"{label} must be positive" if positive else f"{label} cannot be negative",
+        too_high=f"{label} seems unrealistic (max {maximum_text or maximum})"
+    )
+
+def past_datetime(label):
+    """
+    ISO date/datetime string that is not in the future; cleaned to a datetime
+    The current time is read once per call, so one "now" covers a whole array
+    """
+    return Rule(
+        """
+        if not value:
+            error = {required}
+        else:
+            try:
+                value = {parse}(value.replace('Z', '+00:00'))
+            except (ValueError, AttributeError):
+                error = {invalid}
+            else:
+                if value > ({today} if value.tzinfo is None else {now}(value.tzinfo)):
+                    error = {in_future}
+        """,
+        setup="""
+        {today} = {now}()
+        """,
+        today=None,
+        parse=datetime.fromisoformat,
+        now=datetime.now,
+        required=f"{label} is required",
+        invalid=f"Invalid {label} format. Use ISO format (YYYY-MM-DDTHH:MM:SS)",
+        in_future=f"{label} cannot be in the future"
+    )
+
+def clock_time():
+    """HH:MM string; cleaned to a datetime.time"""
+    return Rule(
+        """
+        if not value:
+            error = {required}
+        else:
+            try:
+                hour, minute = map(int, value.split(':'))
+            except (ValueError, AttributeError):
+                error = {invalid}
+            else:
+                if hour < 0 or hour > 23:
+                    error = {bad_hour}
+                elif minute < 0 or minute > 59:
+                    error = {bad_minute}
+                else:
+                    value = {time}(hour, minute)
+        """,
+        time=time,
+        required="Time is required",
+        invalid="Invalid time format. Use HH:MM",
+        bad_hour="Hour must be between 0 and 23",
+        bad_minute="Minute must be between 0 and 59"
+    )
+
+def password(min_length=8, max_length=100):
+    """Password strength: length plus one character of each class, from a single pass over the text"""
+    return Rule(
+        """
+        if not value:
+            error = {required}
+        elif len(value) < {min_length}:
+            error = {too_short}
+        elif len(value) > {max_length}:
+            error = {too_long}
+        else:
+            chars = frozenset(value)
+            if chars.isdisjoint({upper}):
+                error = {no_upper}
+            elif chars.isdisjoint({lower}):
+                error = {no_lower}
+            elif chars.isdisjoint({digits}):
+                error = {no_digit}
+            elif chars.isdisjoint({special}):
+                error = {no_special}
+        """,
+        min_length=min_length,
+        max_length=max_length,
+        upper=frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZ'),
+        lower=frozenset('abcdefghijklmnopqrstuvwxyz'),
+        digits=frozenset('0123456789'),
+        special=frozenset('!@#$%^&*(),.?":{}|<>_-+=[]\\/~`'),
+        required="Password is required",
+        too_short=f"Password must be at least {min_length} characters",
+        too_long=f"Password is too long (max {max_length} characters)",
+        no_upper="Password must contain at least one uppercase letter",
+        no_lower="Password must contain at least one lowercase letter",
+        no_digit="Password must contain at least one number",
+        no_special="Password must contain at least one special character (!@#$%^&*...)"
+    )
+
+def validator(func):
+    """Rule from a function returning (is_valid, value, error), e.g. utils.validators.validate_tags"""
+    return Rule(
+        """
+        is_valid, value, error = {func}(value)
+        """,
+        func=func
+    )
+
+class Schema:
+    """
+    Compiled validator for one kind of record
+    
+    fields maps names to rules; a rule only runs when its field is present.
+    Required fields must be present and non-empty unless validating a partial
+    update; a missing one is reported once with required_error. The
+    generated source is kept in .source for debugging.
+    """
+    
+    def __init__(self, fields, required=(), required_error=None):
+        self.fields = fields
+        self.required = tuple(required)
+        self.required_error = required_error or f"Missing required fields: {', '.join(self.required)}"
+        self.source, functions = self._compile()
+        self.validate = functions['validate']
+        self.validate_many = functions['validate_many']
+    
+    def _compile(self):
+        """
+        Generate, with every rule inlined:
+        validate(data, partial=False) -> (values, errors) for one record, where
+        values are the cleaned values of the valid present fields; and
+        validate_many(items, object_error) -> (valid, errors) for an array, where
+        valid lists (index, values) and errors {'index', 'error'} with a record's
+        messages joined by '; '
+        """
+        namespace = {'required_error': self.required_error}
+        setup = []
+        checks = []
+        for index, (name, rule) in enumerate(self.fields.items()):
+            names = {constant: f'_{index}_{constant}' for constant in rule.constants}
+            namespace.update({names[constant]: value for constant, value in rule.constants.items()})
+            if rule.setup:
+                setup.append(rule.setup.format(**names))
+            required = name in self.required
+            indent = ' ' * (8 if required else 4)
+            
+            checks.append(f'if {name!r} in data:')
+            checks.append(f'    value = data[{name!r}]')
+            if required:
+                checks.append('    if not value and not partial:')
+                checks.append('        missing = True')
+                checks.append('    else:')
+            checks.append(f'{indent}error = None')
+            checks.append(textwrap.indent(rule.source.format(**names), indent))
+            checks.append(f'{indent}if error is None:')
+            checks.append(f'{indent}    values[{name!r}] = value')
+            checks.append(f'{indent}else:')
+            checks.append(f'{indent}    errors.append(error)')
+            if required:
+                checks.append('elif not partial:')
+                checks.append('    missing = True')
+        checks.append('if missing:')
+        checks.append('    errors.insert(0, required_error)')
+        checks = '\n'.join(checks)
+        setup = '\n'.join(setup) or 'pass'
+        
+        source = f"""
+def validate(data, partial=False):
+    if not isinstance(data, dict):
+        return {{}}, [required_error]
+{textwrap.indent(setup, ' ' * 4)}
+    values = {{}}
+    errors = []
+    missing = False
+{textwrap.indent(checks, ' ' * 4)}
+    return values, errors
+
+def validate_many(items, object_error):
+    valid = []
+    failed = []
+    partial = False
+{textwrap.indent(setup, ' ' * 4)}
+    for index, data in enumerate(items):
+        if not isinstance(data, dict):
+            failed.append({{'index': index, 'error': object_error}})
+            continue
+        values = {{}}
+        errors = []
+        missing = False
+{textwrap.indent(checks, ' ' * 8)}
+        if errors:
+            failed.append({{'index': index, 'error': '; '.join(errors)}})
+        else:
+            valid.append((index, values))
+    return valid, failed
+"""
+        exec(compile(source, f'<schema {", ".join(self.fields)}>', 'exec'), namespace)
+        return source, namespace
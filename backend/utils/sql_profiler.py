@@ -0,0 +1,105 @@
+"""
+Opt-in per-request SQL profiling: Server-Timing, slow request and N+1 logs
+"""
+import re
+import time
+from collections import Counter
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+# Expanded IN lists and other runs of placeholders collapse to one, so
+# "IN (?, ?, ?)" and "IN (?, ?)" count as the same query shape
+PLACEHOLDER_LIST = re.compile(r'\((?:\?|%\(\w+\)s|%s|\$\d+)(?:,\s*(?:\?|%\(\w+\)s|%s|\$\d+))*\)')
+WHITESPACE = re.compile(r'\s+')
+
+# Statements listed in a slow request log entry
+SLOW_LOG_STATEMENTS = 20
+
+def statement_shape(statement):
+    """Statement text with whitespace and placeholder lists normalized"""
+    return PLACEHOLDER_LIST.sub('(?)', WHITESPACE.sub(' ', statement).strip())
+
+class SQLProfiler:
+    """
+    Counts and times every SQL statement of a request
+    
+    Enabled with SQL_PROFILING; when off, init_app installs nothing, so
+    requests and statements pay no cost at all. When on, every response
+    gets a Server-Timing header (db and app time, statement count),
+    requests slower than SLOW_REQUEST_MS are logged with their statements,
+    and a statement shape repeated N_PLUS_ONE_THRESHOLD times or more in
+    one request is logged as a suspected N+1.
+    """
+    
+    def __init__(self, app=None):
+        self._slow_ms = 0
+        self._n_plus_one = 0
+        self._engines = []
+        if app is not None:
+            self.init_app(app)
+    
+    def init_app(self, app, engines=()):
+        """Profile the given engines; call once they exist"""
+        self._remove_listeners()
+        app.extensions['sql_profiler'] = self
+        if not app.config.get('SQL_PROFILING'):
+            return
+        
+        self._slow_ms = app.config.get('SLOW_REQUEST_MS', 500)
+        self._n_plus_one = app.config.get('N_PLUS_ONE_THRESHOLD', 5)
+        for engine in engines:
+            event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+            self._engines.append(engine)
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+    
+    def _remove_listeners(self):
+        for engine in self._engines:
+            event.remove(engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.remove(engine, 'after_cursor_execute', self._after_cursor_execute)
+        self._engines = []
+    
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('sql_profiler_started', []).append(time.perf_counter())
+    
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info['sql_profiler_started'].pop()
+        if has_request_context():
+            queries = g.get('_sql_queries')
+            if queries is not None:
+                queries.append((statement, duration))
+    
+    def _before_request(self):
+        g._sql_queries = []
+        g._sql_profiler_started = time.perf_counter()
+    
+    def _after_request(self, response):
+        queries = g.pop('_sql_queries', None)
+        if queries is None:
+            return response
+        
+        total_ms = (time.perf_counter() - g.pop('_sql_profiler_started')) * 1000
+        db_ms = sum(duration for _, duration in queries) * 1000
+        response.headers['Server-Timing'] = (
+            f'db;dur={db_ms:.1f};desc="{len(queries)} queries", app;dur={max(total_ms - db_ms, 0):.1f}'
+        )
+        
+        logger = current_app.logger
+        label = f'{request.method} {request.full_path.rstrip("?")}'
+        
+        if total_ms >= self._slow_ms:
+            slowest = sorted(queries, key=lambda query: query[1], reverse=True)[:SLOW_LOG_STATEMENTS]
+            logger.warning(
+                'Slow request %s: %.1f ms, %d queries (%.1f ms in SQL)\n%s',
+                label, total_ms, len(queries), db_ms,
+                '\n'.join(f'  {duration * 1000:8.2f} ms  {statement_shape(statement)}'
+                          for statement, duration in slowest)
+            )
+        
+        shapes = Counter(statement_shape(statement) for statement, _ in queries)
+        for shape, count in shapes.items():
+            if count >= self._n_plus_one:
+                logger.warning('Suspected N+1 in %s: %d x %s', label, count, shape)
+        
+        return response
@@ -0,0 +1,99 @@
+"""
+Startup helpers: flask CLI command detection, migrations head check and first-request setup
+"""
+import os
+import re
+import sys
+import threading
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+# revision / down_revision assignments of an alembic migration file
+REVISION = re.compile(r"^revision\b[^=\n]*=\s*['\"](\w+)['\"]", re.M)
+DOWN_REVISION = re.compile(r"^down_revision\b[^=\n]*=(.*)$", re.M)
+REVISION_ID = re.compile(r"['\"](\w+)['\"]")
+
+# Options of the flask command group that take a value (`--app app.py`, `-e .env`)
+FLASK_VALUE_OPTIONS = {'-A', '--app', '-e', '--env-file'}
+
+def flask_command(argv=None):
+    """
+    Name of the flask CLI command being run (`db`, `seed`, `run`, ...)
+    Flask sets FLASK_RUN_FROM_CLI for every command, `flask run` included,
+    so the command is read from the arguments after the group's options
+    Returns: the command name; '' for a bare `flask` or `flask --help`; None outside the flask CLI
+    """
+    if os.environ.get('FLASK_RUN_FROM_CLI') != 'true':
+        return None
+    args = iter((sys.argv if argv is None else argv)[1:])
+    for arg in args:
+        if arg in FLASK_VALUE_OPTIONS:
+            next(args, None)
+        elif not arg.startswith('-'):
+            return arg
+    return ''
+
+def migration_heads(versions_dir):
+    """
+    Revisions no other migration builds on
+    Read from the migration files as text, so alembic is never imported
+    """
+    revisions = set()
+    parents = set()
+    for name in os.listdir(versions_dir):
+        if not name.endswith('.py'):
+            continue
+        with open(os.path.join(versions_dir, name), encoding='utf-8') as migration:
+            source = migration.read()
+        revision = REVISION.search(source)
+        if revision is None:
+            continue
+        revisions.add(revision.group(1))
+        down_revision = DOWN_REVISION.search(source)
+        if down_revision:
+            parents.update(REVISION_ID.findall(down_revision.group(1)))
+    return revisions - parents
+
+def database_revisions(engine):
+    """Revisions stamped in alembic_version; empty when the table does not exist"""
+    try:
+        with engine.connect() as connection:
+            return {row[0] for row in connection.execute(text('SELECT version_num FROM alembic_version'))}
+    except DBAPIError:
+        return set()
+
+def check_schema(engine, migrations_dir):
+    """
+    Make sure the database is at the migrations head, with one query
+    Raises RuntimeError when it is behind, ahead or not migrated at all
+    """
+    heads = migration_heads(os.path.join(migrations_dir, 'versions'))
+    current = database_revisions(engine)
+    if current != heads:
+        raise RuntimeError(
+            f'Database schema is at {", ".join(sorted(current)) or "no revision"}, '
+            f'migrations head is {", ".join(sorted(heads))}; run `flask db upgrade`'
+        )
+
+class FirstRequestSetup:
+    """
+    WSGI wrapper running setup() once, just before the first request
+    
+    Flask only accepts blueprints until the first request is dispatched, and
+    URL matching happens before any before_request hook, so deferred
+    registration has to run here, in front of app.wsgi_app.
+    """
+    
+    def __init__(self, wsgi_app, setup):
+        self.wsgi_app = wsgi_app
+        self._setup = setup
+        self._lock = threading.Lock()
+        self._done = False
+    
+    def __call__(self, environ, start_response):
+        if not self._done:
+            with self._lock:
+                if not self._done:
+                    self._setup()
+                    self._done = True
+        return self.wsgi_app(environ, start_response)
@@ -9,6 +9,9 @@ const api = axios.create({
   }
 })
 
+// Time of our last write, echoed so reads stay on the primary database until replicas catch up
+let lastWrite = null
+
 // Add token to requests if available
 api.interceptors.request.use(
   (config) => {
@@ -16,6 +19,9 @@ api.interceptors.request.use(
     if (token) {
       config.headers.Authorization = `Bearer ${token}`
     }
+    if (lastWrite) {
+      config.headers['X-Last-Write'] = lastWrite
+    }
     return config
   },
   (error) => {
@@ -23,6 +29,19 @@ api.interceptors.request.use(
   }
 )
 
+// Remember when the server last saved our changes
+api.interceptors.response.use(
+  (response) => {
+    if (response.headers['x-last-write']) {
+      lastWrite = response.headers['x-last-write']
+    }
+    return response
+  },
+  (error) => {
+    return Promise.reject(error)
+  }
+)
+
 export const authService = {
   async register(username, email, password) {
     const response = await api.post('/auth/register', {
@@ -24,7 +24,10 @@ export const useVisitStore = defineStore('visit', {
       this.loading = true
       this.error = null
       try {
-        const response = await api.get(`/pets/${petId}/visits`)
+        // Medications are not shown in the history, so they are not loaded
+        const response = await api.get(`/pets/${petId}/visits`, {
+          params: { fields: 'id,pet_id,visit_date,vet_name,clinic_name,reason,diagnosis,treatment,notes,created_at' }
+        })
         this.visits = response.data.visits
       } catch (error) {
         this.error = error.response?.data?.error || 'Failed to fetch visits'